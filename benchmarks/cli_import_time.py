@@ -0,0 +1,39 @@
+"""
+Cold import time of the CLI entry point, measured with python -X importtime in fresh interpreters.
+
+The command modules only import their heavy dependencies (openai, numpy, requests) when their command runs,
+the chat session module stands for the cost every invocation paid when they were imported eagerly.
+
+Usage: python -m benchmarks.cli_import_time [num_runs]
+"""
+import subprocess  # noqa: S404
+import sys
+from statistics import median
+
+_MODULES = ('coach.cli.app', 'coach.scripts.chat_session')
+_HEAVY_DEPENDENCIES = ('openai', 'numpy', 'requests')
+
+
+def import_times_microseconds(module: str) -> dict[str, int]:
+    """Cumulative import time of every module loaded by importing module in a fresh interpreter."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, check=True)  # noqa: S603
+    times: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for module in _MODULES:
+        runs = [import_times_microseconds(module) for _ in range(num_runs)]
+        loaded_heavy_dependencies = [name for name in _HEAVY_DEPENDENCIES if name in runs[-1]]
+        print(f'{module:<28} {median(run[module] for run in runs) / 1_000:>8.1f} ms  heavy dependencies loaded: {", ".join(loaded_heavy_dependencies) or "none"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Weekly volumes per sport over a multi-year history: Activity objects and Python loops versus ActivityColumns and np.add.reduceat.
+
+Usage: python -m benchmarks.columnar_volumes [num_activities]
+"""
+import sys
+import time
+from dataclasses import replace
+from datetime import timedelta
+
+from coach.builders.columnar import get_weekly_volumes_from_columns
+from coach.builders.utils import get_categorized_volume
+from coach.builders.utils import group_activities_by_week_start
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.tests.utils_for_tests import SAMPLE_RIDE
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def main() -> None:
+    num_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    activities = [
+        replace(template, activity_id=i, source_activity_id=i, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(hours=5 * i))
+        for i, template in enumerate([SAMPLE_RUN, SAMPLE_RIDE] * (num_activities // 2))
+    ]
+    repository = SQLiteActivityRepository(Database(':memory:'))
+    repository.save_many(activities)
+
+    start = time.perf_counter()
+    object_volumes = {week_start: get_categorized_volume(week) for week_start, week in group_activities_by_week_start(repository.list_all()).items()}
+    object_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar_volumes = get_weekly_volumes_from_columns(repository.list_activity_columns())
+    columnar_seconds = time.perf_counter() - start
+
+    if columnar_volumes != object_volumes:
+        raise RuntimeError('Columnar weekly volumes differ from the object-based ones')
+    print(f'{len(activities)} activities over {len(object_volumes)} weeks, loaded from SQLite and aggregated')
+    print(f'Activity objects: {object_seconds * 1_000:>8.1f} ms')
+    print(f'ActivityColumns:  {columnar_seconds * 1_000:>8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
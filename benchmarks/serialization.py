@@ -0,0 +1,113 @@
+"""
+Rows per second of the dict-based activity serialization versus the direct row encoder/decoder, for save_many and list_all on an in-memory database.
+
+Usage: python -m benchmarks.serialization [num_activities]
+"""
+import json
+import sqlite3
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from dataclasses import replace
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from enum import Enum
+from typing import Any
+
+from coach.domain.activity import Activity
+from coach.domain.activity import ActivitySource
+from coach.domain.activity import BestEffort
+from coach.domain.activity import SportType
+from coach.persistence.serialization import ACTIVITY_COLUMNS
+from coach.persistence.serialization import activity_to_row
+from coach.persistence.serialization import row_to_activity
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def _legacy_serialize_activity(activity: Activity) -> dict[str, Any]:
+    # The previous implementation: asdict followed by four full dict copies
+    serialized = asdict(activity)
+    serialized = {key: int(value) if isinstance(value, bool) else value for key, value in serialized.items()}
+    serialized = {key: value.isoformat() if isinstance(value, date) else value for key, value in serialized.items()}
+    serialized = {key: value.value if isinstance(value, Enum) else value for key, value in serialized.items()}
+    return {key: json.dumps(value) if isinstance(value, list) else value for key, value in serialized.items()}
+
+
+def _legacy_activity_to_row(activity: Activity) -> tuple[Any, ...]:
+    serialized = _legacy_serialize_activity(activity)
+    return tuple(serialized[column] for column in ACTIVITY_COLUMNS)
+
+
+def _legacy_row_to_activity(row: sqlite3.Row) -> Activity:
+    serialized = dict(row)
+    return Activity(
+        activity_id=serialized['activity_id'],
+        source=ActivitySource(serialized['source']),
+        source_activity_id=serialized['source_activity_id'],
+        sport_type=SportType(serialized['sport_type']),
+        name=serialized['name'],
+        description=serialized['description'],
+        notes=serialized['notes'],
+        start_time_utc=datetime.fromisoformat(serialized['start_time_utc']),
+        elapsed_time_seconds=serialized['elapsed_time_seconds'],
+        moving_time_seconds=serialized['moving_time_seconds'],
+        distance_meters=serialized['distance_meters'],
+        elevation_gain_meters=serialized['elevation_gain_meters'],
+        average_heart_rate=serialized['average_heart_rate'],
+        max_heart_rate=serialized['max_heart_rate'],
+        average_power_watts=serialized['average_power_watts'],
+        is_manual=bool(serialized['is_manual']),
+        is_race=bool(serialized['is_race']),
+        pbs=[BestEffort(name=pb['name'], moving_time_seconds=pb['moving_time_seconds']) for pb in json.loads(serialized['pbs'])],
+    )
+
+
+def _build_activities(num_activities: int) -> list[Activity]:
+    return [
+        replace(SAMPLE_RUN, activity_id=i, source_activity_id=i, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(hours=i), pbs=list(SAMPLE_RUN.pbs) if i % 10 == 0 else [])
+        for i in range(num_activities)
+    ]
+
+
+def _rows_per_second(run: Callable[[], object], num_rows: int) -> float:
+    start = time.perf_counter()
+    run()
+    return num_rows / (time.perf_counter() - start)
+
+
+def _measure(activities: list[Activity], encode: Callable[[Activity], tuple[Any, ...]], decode: Callable[[Any], Activity], row_factory: Any) -> tuple[float, float]:
+    repository = SQLiteActivityRepository(Database(':memory:'))
+    conn = repository._conn  # noqa: SLF001 - the benchmark swaps the encoder around the repository's own table
+    query = f'INSERT INTO activities ({", ".join(ACTIVITY_COLUMNS)}) VALUES ({", ".join("?" for _ in ACTIVITY_COLUMNS)})'  # noqa: S608 - only column names are interpolated
+
+    def save_many() -> None:
+        conn.executemany(query, [encode(activity) for activity in activities])
+        conn.commit()
+
+    def list_all() -> list[Activity]:
+        cursor = conn.cursor()
+        cursor.row_factory = row_factory
+        rows = cursor.execute(f'SELECT {", ".join(ACTIVITY_COLUMNS)} FROM activities ORDER BY start_time_utc').fetchall()  # noqa: S608 - only column names are interpolated
+        return [decode(row) for row in rows]
+
+    return _rows_per_second(save_many, len(activities)), _rows_per_second(list_all, len(activities))
+
+
+def main() -> None:
+    num_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    activities = _build_activities(num_activities)
+
+    legacy_save, legacy_list = _measure(activities, _legacy_activity_to_row, _legacy_row_to_activity, sqlite3.Row)
+    fast_save, fast_list = _measure(activities, activity_to_row, row_to_activity, None)
+
+    print(f'{num_activities} activities per variant')
+    print(f'save_many  dict-based: {legacy_save:>10,.0f} rows/s   row encoder: {fast_save:>10,.0f} rows/s   speedup: {fast_save / legacy_save:.2f}x')
+    print(f'list_all   dict-based: {legacy_list:>10,.0f} rows/s   row decoder: {fast_list:>10,.0f} rows/s   speedup: {fast_list / legacy_list:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
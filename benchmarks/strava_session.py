@@ -0,0 +1,40 @@
+"""
+Per-request latency of fresh connections versus the pooled keep-alive StravaSession against a local Strava stub.
+
+Usage: python -m benchmarks.strava_session [num_requests]
+"""
+import sys
+import time
+from collections.abc import Callable
+
+import requests
+
+from coach.ingestion.strava.session import StravaSession
+from coach.ingestion.strava.tests.fake_strava_server import FakeStravaState
+from coach.ingestion.strava.tests.fake_strava_server import run_fake_strava_server
+
+
+def _mean_latency_ms(get: Callable[[str], requests.Response], url: str, num_requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        get(url).raise_for_status()
+    return (time.perf_counter() - start) / num_requests * 1_000
+
+
+def main() -> None:
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with run_fake_strava_server(FakeStravaState(num_activities=0, fifteen_min_limit=10 * num_requests)) as base_url:
+        url = f'{base_url}/athlete'
+        fresh_connection_ms = _mean_latency_ms(lambda u: requests.get(u, timeout=10), url, num_requests)
+        session = StravaSession()
+        pooled_session_ms = _mean_latency_ms(session.get, url, num_requests)
+
+    print(f'{num_requests} requests per variant')
+    print(f'new connection per request: {fresh_connection_ms:.3f} ms/request')
+    print(f'pooled keep-alive session:  {pooled_session_ms:.3f} ms/request')
+    print(f'speedup: {fresh_connection_ms / pooled_session_ms:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
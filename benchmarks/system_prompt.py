@@ -0,0 +1,41 @@
+"""
+Startup cost of the user system prompt: parsing the goals of coach.md on every start versus loading them from the on-disk cache.
+
+Usage: python -m benchmarks.system_prompt [num_loads]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from coach.reasoning.cache import load_parsed_system_prompt
+
+
+def main() -> None:
+    num_loads = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path, cache_path = Path(directory) / 'coach.md', Path(directory) / 'system_prompt.json'
+        path.write_text(Path('coach/config/coach.md.example').read_text(encoding='utf-8'), encoding='utf-8')
+
+        start = time.perf_counter()
+        for _ in range(num_loads):
+            parsed = load_parsed_system_prompt(path)
+        parse_seconds = time.perf_counter() - start
+
+        load_parsed_system_prompt(path, cache_path=cache_path)
+        start = time.perf_counter()
+        for _ in range(num_loads):
+            cached = load_parsed_system_prompt(path, cache_path=cache_path)
+        cached_seconds = time.perf_counter() - start
+
+    if cached != parsed:
+        raise RuntimeError('Cached system prompt differs from the parsed one')
+    print(f'{num_loads} loads of coach.md.example')
+    print(f'parsed:  {parse_seconds / num_loads * 1_000_000:>8.1f} us per load')
+    print(f'cached:  {cached_seconds / num_loads * 1_000_000:>8.1f} us per load')
+    print(f'speedup: {parse_seconds / cached_seconds:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
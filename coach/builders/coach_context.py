@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+
+from coach.builders.personal_bests import build_running_personal_bests_summary_from_best_efforts
+from coach.builders.recent_training_history import build_recent_training_history
+from coach.builders.recent_training_history import get_history_window_start
+from coach.builders.training_load import TRAINING_LOAD_LOOKBACK_DAYS
+from coach.builders.training_load import build_training_load_summary
+from coach.builders.training_load import compute_training_load
+from coach.domain.activity import SportType
+from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.domain.training_load import TrainingLoadSummary
+from coach.domain.training_summaries import RecentTrainingHistory
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CoachContext:
+    """Everything the coach prompt is built from, derived from the stored activities at generated_at."""
+
+    generated_at: datetime
+    recent_training_history: RecentTrainingHistory
+    training_load: TrainingLoadSummary
+    running_pbs: RunningPersonalBestsSummary
+
+
+def load_coach_context(activity_repo: SQLiteActivityRepository, *, num_history_weeks: int, generated_at: datetime) -> CoachContext:
+    history_window_start = get_history_window_start(generated_at, num_history_weeks=num_history_weeks)
+    recent_training_history = build_recent_training_history(
+        activities=activity_repo.list_all(start_date=history_window_start.isoformat()),
+        generated_at=generated_at,
+        num_history_weeks=num_history_weeks,
+        weekly_volumes=activity_repo.list_weekly_volumes(start_date=history_window_start.isoformat()),
+    )
+    training_load_start = generated_at.date() - timedelta(days=TRAINING_LOAD_LOOKBACK_DAYS)
+    training_load_series = compute_training_load(activity_repo.list_activity_columns(start_date=training_load_start.isoformat()), end_date=generated_at.date())
+
+    return CoachContext(
+        generated_at=generated_at,
+        recent_training_history=recent_training_history,
+        training_load=build_training_load_summary(training_load_series),
+        running_pbs=build_running_personal_bests_summary_from_best_efforts(activity_repo.list_best_efforts_per_distance(sport_type=SportType.RUN.value)),
+    )
@@ -0,0 +1,56 @@
+"""
+Volume aggregations over ActivityColumns, for ad-hoc analyses of the whole history and the benchmarks.
+
+The coach prompt does not use them: its weekly volumes are read from the pre-aggregated weekly_volumes table instead.
+"""
+from datetime import date
+
+import numpy as np
+from numpy.typing import NDArray
+
+from coach.domain.activity import SportType
+from coach.domain.activity_columns import SPORT_TYPES
+from coach.domain.activity_columns import ActivityColumns
+from coach.domain.activity_columns import date_from_day_number
+from coach.domain.training_summaries import ActivityVolume
+
+
+def _sum_volumes_by_key(keys: NDArray[np.int64], columns: ActivityColumns) -> dict[int, ActivityVolume]:
+    """Sum the volume of activities sharing a key: one sort plus one np.add.reduceat per metric instead of a Python loop per group."""
+    if len(columns) == 0:
+        return {}
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    group_starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1))
+
+    distances = np.add.reduceat(np.nan_to_num(columns.distance_meters[order]), group_starts)
+    durations = np.add.reduceat(columns.duration_seconds[order], group_starts)
+    counts = np.diff(np.append(group_starts, len(sorted_keys)))
+
+    return {
+        int(key): ActivityVolume(
+            distance_meters=float(distance) if distance > 0 else None,
+            duration_seconds=int(duration),
+            num_activities=int(count),
+        )
+        for key, distance, duration, count in zip(sorted_keys[group_starts], distances, durations, counts, strict=True)
+    }
+
+
+def get_categorized_volume_from_columns(columns: ActivityColumns) -> dict[SportType, ActivityVolume]:
+    """Columnar equivalent of get_categorized_volume."""
+    volumes_by_code = _sum_volumes_by_key(columns.sport_codes.astype(np.int64), columns)
+    return {SPORT_TYPES[code]: volume for code, volume in volumes_by_code.items()}
+
+
+def get_weekly_volumes_from_columns(columns: ActivityColumns) -> dict[date, dict[SportType, ActivityVolume]]:
+    """Volume per sport for every week with activities, keyed by week start (Monday), in a single vectorized pass over the whole history."""
+    num_sport_types = len(SPORT_TYPES)
+    keys = columns.week_start_days * num_sport_types + columns.sport_codes
+
+    weekly_volumes: dict[date, dict[SportType, ActivityVolume]] = {}
+    for key, volume in _sum_volumes_by_key(keys, columns).items():
+        week_start_day, sport_code = divmod(key, num_sport_types)
+        weekly_volumes.setdefault(date_from_day_number(week_start_day), {})[SPORT_TYPES[sport_code]] = volume
+    return weekly_volumes
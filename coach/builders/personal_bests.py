@@ -1,12 +1,26 @@
 from collections.abc import Iterable
+from collections.abc import Mapping
+from datetime import date
 
 from coach.domain.activity import Activity
+from coach.domain.activity import BestEffort
 from coach.domain.activity import SportType
 from coach.domain.personal_bests import RUNNING_PBS_METERS_MAPPING
 from coach.domain.personal_bests import RunningPersonalBest
 from coach.domain.personal_bests import RunningPersonalBestsSummary
 
 
+def _build_running_personal_bests_summary(pbs_per_distance: Mapping[str, RunningPersonalBest]) -> RunningPersonalBestsSummary:
+    return RunningPersonalBestsSummary(
+        PB_1K=pbs_per_distance.get('1K'),
+        PB_5K=pbs_per_distance.get('5K'),
+        PB_10K=pbs_per_distance.get('10K'),
+        PB_15K=pbs_per_distance.get('15K'),
+        PB_HALF_MARATHON=pbs_per_distance.get('Half-Marathon'),
+        PB_MARATHON=pbs_per_distance.get('Marathon'),
+    )
+
+
 def build_running_personal_bests_summary(activities: Iterable[Activity]) -> RunningPersonalBestsSummary:
     pbs_per_distance: dict[str, RunningPersonalBest] = {}
 
@@ -14,14 +28,17 @@ def build_running_personal_bests_summary(activities: Iterable[Activity]) -> Runn
         if activity.sport_type == SportType.RUN:
             for pb in activity.pbs:
                 if pb.name in RUNNING_PBS_METERS_MAPPING:
-                    # Activities are sorted chronologically during loading, hence the last PB per distance is always the actual best one
+                    # Repositories return activities ordered by start time, hence the last PB per distance is always the actual best one
                     pbs_per_distance[pb.name] = RunningPersonalBest.from_running_best_effort(pb, activity_date=activity.start_time_utc.date())
 
-    return RunningPersonalBestsSummary(
-        PB_1K=pbs_per_distance.get('1K'),
-        PB_5K=pbs_per_distance.get('5K'),
-        PB_10K=pbs_per_distance.get('10K'),
-        PB_15K=pbs_per_distance.get('15K'),
-        PB_HALF_MARATHON=pbs_per_distance.get('Half-Marathon'),
-        PB_MARATHON=pbs_per_distance.get('Marathon'),
-    )
+    return _build_running_personal_bests_summary(pbs_per_distance)
+
+
+def build_running_personal_bests_summary_from_best_efforts(best_efforts: Iterable[tuple[BestEffort, date]]) -> RunningPersonalBestsSummary:
+    """Build the summary from already aggregated (best effort, activity date) pairs, one per distance."""
+    pbs_per_distance = {
+        best_effort.name: RunningPersonalBest.from_running_best_effort(best_effort, activity_date=activity_date)
+        for best_effort, activity_date in best_efforts
+        if best_effort.name in RUNNING_PBS_METERS_MAPPING
+    }
+    return _build_running_personal_bests_summary(pbs_per_distance)
@@ -1,20 +1,53 @@
 from collections.abc import Iterable
+from collections.abc import Mapping
+from datetime import date
 from datetime import datetime
 from datetime import timedelta
+from typing import Optional
 
-from coach.builders.weekly_summary import build_weekly_summary
+from coach.builders.utils import get_week_start_week_end
+from coach.builders.utils import group_activities_by_week_start
+from coach.builders.weekly_summary import build_weekly_summary_from_week_activities
 from coach.domain.activity import Activity
+from coach.domain.activity import SportType
+from coach.domain.training_summaries import ActivityVolume
 from coach.domain.training_summaries import RecentTrainingHistory
 from coach.domain.training_summaries import WeeklySummary
 
 
-def build_recent_training_history(activities: Iterable[Activity], *, generated_at: datetime, num_history_weeks: int) -> RecentTrainingHistory:
-    current_week_summary = build_weekly_summary(activities, generated_at)
+def _build_summary_for_week(
+    activities_by_week_start: Mapping[date, list[Activity]],
+    center_date: datetime,
+    weekly_volumes: Optional[Mapping[date, Mapping[SportType, ActivityVolume]]],
+) -> WeeklySummary:
+    week_start, week_end = get_week_start_week_end(center_date)
+    volume_by_sport = None if weekly_volumes is None else weekly_volumes.get(week_start, {})
+    return build_weekly_summary_from_week_activities(activities_by_week_start.get(week_start, []), week_start=week_start, week_end=week_end, volume_by_sport=volume_by_sport)
+
+
+def get_history_window_start(generated_at: datetime, *, num_history_weeks: int) -> date:
+    """Return the first day (Monday) of the oldest week covered by a recent training history."""
+    week_start, _ = get_week_start_week_end(generated_at - timedelta(weeks=num_history_weeks))
+    return week_start
+
+
+def build_recent_training_history(
+    activities: Iterable[Activity],
+    *,
+    generated_at: datetime,
+    num_history_weeks: int,
+    weekly_volumes: Optional[Mapping[date, Mapping[SportType, ActivityVolume]]] = None,
+) -> RecentTrainingHistory:
+    """Build the current week and history summaries. When weekly_volumes (keyed by week start) are given, volumes are read from them instead of being recomputed."""
+    # Activities are grouped by week once, so each week below is a dict lookup instead of a rescan of the whole history
+    activities_by_week_start = group_activities_by_week_start(activities)
+
+    current_week_summary = _build_summary_for_week(activities_by_week_start, generated_at, weekly_volumes)
 
     history_weekly_summaries: list[WeeklySummary] = []
     for week_number in range(1, num_history_weeks + 1):
         center_date = generated_at - timedelta(weeks=week_number)
-        history_weekly_summaries.append(build_weekly_summary(activities, center_date))
+        history_weekly_summaries.append(_build_summary_for_week(activities_by_week_start, center_date, weekly_volumes))
 
     return RecentTrainingHistory(
         generated_at=generated_at,
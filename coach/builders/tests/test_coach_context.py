@@ -0,0 +1,42 @@
+from dataclasses import replace
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from coach.builders.coach_context import load_coach_context
+from coach.builders.training_load import TRAINING_LOAD_LOOKBACK_DAYS
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def test_load_coach_context(tmp_path: Path) -> None:
+    activity_repo = SQLiteActivityRepository(Database(tmp_path / 'coach.db'))
+    activity_repo.save_many([SAMPLE_RUN])
+    generated_at = datetime(2025, 1, 2, 12, tzinfo=UTC)
+
+    context = load_coach_context(activity_repo, num_history_weeks=1, generated_at=generated_at)
+
+    assert context.generated_at == generated_at
+    assert context.recent_training_history.current_week_summary.volume_by_sport[SAMPLE_RUN.sport_type].num_activities == 1
+    assert context.training_load.current.day == generated_at.date()
+
+
+def test_training_load_covers_only_the_lookback_window(tmp_path: Path) -> None:
+    activity_repo = SQLiteActivityRepository(Database(tmp_path / 'coach.db'))
+    old_run = replace(SAMPLE_RUN, activity_id=2, source_activity_id=2, start_time_utc=SAMPLE_RUN.start_time_utc - timedelta(days=TRAINING_LOAD_LOOKBACK_DAYS + 1))
+    activity_repo.save_many([SAMPLE_RUN, old_run])
+
+    training_load = load_coach_context(activity_repo, num_history_weeks=1, generated_at=datetime(2025, 1, 2, 12, tzinfo=UTC)).training_load
+
+    assert all(point.day >= SAMPLE_RUN.start_time_utc.date() for point in training_load.previous_points)
+
+
+def test_activities_after_generated_at_give_zero_training_load(tmp_path: Path) -> None:
+    activity_repo = SQLiteActivityRepository(Database(tmp_path / 'coach.db'))
+    activity_repo.save_many([SAMPLE_RUN])
+
+    training_load = load_coach_context(activity_repo, num_history_weeks=1, generated_at=datetime(2024, 12, 31, 12, tzinfo=UTC)).training_load
+
+    assert training_load.current.chronic_load == 0.0
@@ -0,0 +1,40 @@
+from dataclasses import replace
+from datetime import timedelta
+
+from coach.builders.columnar import get_categorized_volume_from_columns
+from coach.builders.columnar import get_weekly_volumes_from_columns
+from coach.builders.utils import get_categorized_volume
+from coach.builders.utils import group_activities_by_week_start
+from coach.domain.activity import Activity
+from coach.domain.activity_columns import ActivityColumns
+from coach.tests.utils_for_tests import SAMPLE_RIDE
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def _create_history() -> list[Activity]:
+    return [
+        replace(
+            template,
+            activity_id=i,
+            source_activity_id=i,
+            start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(days=i, hours=i % 23),
+            distance_meters=None if i % 7 == 0 else float(1_000 * i),
+            moving_time_seconds=None if i % 5 == 0 else 3_000 + i,
+        )
+        for i, template in enumerate([SAMPLE_RUN, SAMPLE_RIDE, SAMPLE_RUN] * 40)
+    ]
+
+
+def test_get_categorized_volume_from_columns() -> None:
+    activities = _create_history()
+
+    assert get_categorized_volume_from_columns(ActivityColumns.from_activities(activities)) == get_categorized_volume(activities)
+    assert get_categorized_volume_from_columns(ActivityColumns.from_activities([])) == {}
+
+
+def test_get_weekly_volumes_from_columns() -> None:
+    activities = _create_history()
+
+    assert get_weekly_volumes_from_columns(ActivityColumns.from_activities(activities)) == {
+        week_start: get_categorized_volume(week_activities) for week_start, week_activities in group_activities_by_week_start(activities).items()
+    }
@@ -0,0 +1,41 @@
+from datetime import date
+
+from coach.builders.personal_bests import build_running_personal_bests_summary
+from coach.builders.personal_bests import build_running_personal_bests_summary_from_best_efforts
+from coach.domain.activity import BestEffort
+from coach.domain.personal_bests import RunningPersonalBest
+from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.tests.utils_for_tests import SAMPLE_RIDE
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def test_build_running_personal_bests_summary() -> None:
+    summary = build_running_personal_bests_summary([SAMPLE_RUN, SAMPLE_RIDE])
+
+    assert summary == RunningPersonalBestsSummary(
+        PB_1K=RunningPersonalBest(DATE=date(2025, 1, 1), PACE_STR='2:00/km'),
+        PB_5K=None,
+        PB_10K=None,
+        PB_15K=None,
+        PB_HALF_MARATHON=None,
+        PB_MARATHON=None,
+    )
+
+
+def test_build_running_personal_bests_summary_from_best_efforts() -> None:
+    best_efforts = [
+        (BestEffort(name='1K', moving_time_seconds=120), date(2025, 1, 1)),
+        (BestEffort(name='5K', moving_time_seconds=1_200), date(2025, 2, 1)),
+        (BestEffort(name='400m', moving_time_seconds=60), date(2025, 3, 1)),
+    ]
+
+    summary = build_running_personal_bests_summary_from_best_efforts(best_efforts)
+
+    assert summary == RunningPersonalBestsSummary(
+        PB_1K=RunningPersonalBest(DATE=date(2025, 1, 1), PACE_STR='2:00/km'),
+        PB_5K=RunningPersonalBest(DATE=date(2025, 2, 1), PACE_STR='4:00/km'),
+        PB_10K=None,
+        PB_15K=None,
+        PB_HALF_MARATHON=None,
+        PB_MARATHON=None,
+    )
@@ -1,8 +1,12 @@
+from dataclasses import replace
 from datetime import UTC
 from datetime import date
 from datetime import datetime
+from datetime import timedelta
 
 from coach.builders.recent_training_history import build_recent_training_history
+from coach.builders.recent_training_history import get_history_window_start
+from coach.builders.weekly_summary import build_weekly_summary
 from coach.domain.activity import SportType
 from coach.domain.training_summaries import ActivitySummary
 from coach.domain.training_summaries import ActivityVolume
@@ -11,6 +15,13 @@ from coach.tests.utils_for_tests import SAMPLE_RIDE
 from coach.tests.utils_for_tests import SAMPLE_RUN
 
 
+def test_get_history_window_start() -> None:
+    generated_at = datetime(2025, 1, 15, tzinfo=UTC)
+
+    assert get_history_window_start(generated_at, num_history_weeks=0) == date(2025, 1, 13)
+    assert get_history_window_start(generated_at, num_history_weeks=2) == date(2024, 12, 30)
+
+
 class TestBuildRecentTrainingHistory:
     def setup_method(self) -> None:
         self._activities = [SAMPLE_RUN, SAMPLE_RIDE, SAMPLE_RUN]
@@ -84,3 +95,28 @@ class TestBuildRecentTrainingHistory:
             self._create_empty_weekly_summary(previous_week_start, previous_week_end),
             self._create_inclusive_weekly_summary(),
         )
+
+    def test_matches_per_week_weekly_summaries(self) -> None:
+        generated_at = datetime(2025, 3, 5, 18, tzinfo=UTC)
+        activities = [
+            replace(template, activity_id=i, source_activity_id=i, start_time_utc=generated_at - timedelta(days=i, hours=i % 5))
+            for i, template in enumerate([SAMPLE_RUN, SAMPLE_RIDE] * 40)
+        ]
+        num_history_weeks = 8
+
+        history = build_recent_training_history(activities, generated_at=generated_at, num_history_weeks=num_history_weeks)
+
+        assert history.current_week_summary == build_weekly_summary(activities, generated_at)
+        assert history.history_weekly_summaries == tuple(
+            build_weekly_summary(activities, generated_at - timedelta(weeks=week_number)) for week_number in range(1, num_history_weeks + 1)
+        )
+
+    def test_uses_given_weekly_volumes(self) -> None:
+        generated_at = datetime(2025, 1, 8, tzinfo=UTC)
+        stored_volume = {SportType.SWIM: ActivityVolume(distance_meters=1_500.0, duration_seconds=1_800, num_activities=1)}
+
+        history = build_recent_training_history(self._activities, generated_at=generated_at, num_history_weeks=1, weekly_volumes={date(2024, 12, 30): stored_volume})
+
+        assert history.current_week_summary.volume_by_sport == {}
+        assert history.history_weekly_summaries[0].volume_by_sport == stored_volume
+        assert history.history_weekly_summaries[0].activity_summaries == self._create_inclusive_weekly_summary().activity_summaries
@@ -0,0 +1,103 @@
+import math
+from dataclasses import replace
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from coach.builders.training_load import TrainingLoadSettings
+from coach.builders.training_load import build_training_load_summary
+from coach.builders.training_load import compute_activity_loads
+from coach.builders.training_load import compute_training_load
+from coach.domain.activity import Activity
+from coach.domain.activity_columns import ActivityColumns
+from coach.tests.utils_for_tests import SAMPLE_RIDE
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def _create_history(num_days: int) -> list[Activity]:
+    return [
+        replace(SAMPLE_RUN, activity_id=i, source_activity_id=i, start_time_utc=datetime(2023, 1, 1, 7, tzinfo=UTC) + timedelta(days=i), moving_time_seconds=1_800 + 60 * (i % 30))
+        for i in range(0, num_days, 2)
+    ]
+
+
+def _naive_exponentially_weighted_loads(daily_loads: list[float], time_constant_days: float) -> list[float]:
+    decay = math.exp(-1 / time_constant_days)
+    loads: list[float] = []
+    load = 0.0
+    for daily_load in daily_loads:
+        load = decay * load + (1 - decay) * daily_load
+        loads.append(load)
+    return loads
+
+
+def test_compute_activity_loads() -> None:
+    settings = TrainingLoadSettings(threshold_heart_rate=170.0, threshold_run_pace_seconds_per_km=300.0, default_intensity_factor=0.5)
+    heart_rate_run = replace(SAMPLE_RUN, average_heart_rate=170.0)  # 3_500 s at threshold heart rate
+    pace_run = replace(SAMPLE_RUN, activity_id=3, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(days=1), moving_time_seconds=3_000)  # 5:00/km = threshold pace
+    ride = replace(SAMPLE_RIDE, moving_time_seconds=3_600)
+
+    loads = compute_activity_loads(ActivityColumns.from_activities([heart_rate_run, ride, pace_run]), settings)
+
+    np.testing.assert_allclose(loads, [3_500 / 3_600 * 100, 100 * 0.5**2, 3_000 / 3_600 * 100])
+
+
+class TestComputeTrainingLoad:
+    def setup_method(self) -> None:
+        self._columns = ActivityColumns.from_activities(_create_history(600))
+        self._end_date = date(2024, 12, 31)
+
+    def test_matches_day_by_day_recursion(self) -> None:
+        series = compute_training_load(self._columns, end_date=self._end_date)
+
+        assert series.start_date == date(2023, 1, 1)
+        assert series.end_date == self._end_date
+        np.testing.assert_allclose(series.acute_loads, _naive_exponentially_weighted_loads(series.daily_loads.tolist(), 7.0))
+        np.testing.assert_allclose(series.chronic_loads, _naive_exponentially_weighted_loads(series.daily_loads.tolist(), 42.0))
+        np.testing.assert_allclose(series.training_stress_balances, series.chronic_loads - series.acute_loads)
+        assert series.daily_loads.sum() == pytest.approx(compute_activity_loads(self._columns).sum())
+
+    def test_incremental_update_matches_full_computation(self) -> None:
+        full_series = compute_training_load(self._columns, end_date=self._end_date)
+        state = compute_training_load(self._columns, end_date=date(2023, 9, 30)).final_state()
+
+        updated_series = compute_training_load(self._columns, end_date=self._end_date, initial_state=state)
+
+        assert updated_series.start_date == date(2023, 10, 1)
+        np.testing.assert_allclose(updated_series.acute_loads, full_series.acute_loads[-len(updated_series.acute_loads):])
+        np.testing.assert_allclose(updated_series.chronic_loads, full_series.chronic_loads[-len(updated_series.chronic_loads):])
+
+    def test_without_activities(self) -> None:
+        series = compute_training_load(ActivityColumns.empty(), end_date=self._end_date)
+        point = series.point(self._end_date)
+
+        assert point.acute_load == 0.0
+        assert point.chronic_load == 0.0
+        assert point.acute_chronic_workload_ratio is None
+
+    def test_end_date_before_first_activity_gives_zero_load(self) -> None:
+        series = compute_training_load(self._columns, end_date=date(2022, 12, 31))
+
+        assert series.start_date == series.end_date == date(2022, 12, 31)
+        assert series.point(date(2022, 12, 31)).chronic_load == 0.0
+
+    def test_end_date_before_initial_state_is_rejected(self) -> None:
+        state = compute_training_load(self._columns, end_date=date(2023, 9, 30)).final_state()
+
+        with pytest.raises(ValueError, match='must be after the day of initial_state'):
+            compute_training_load(self._columns, end_date=date(2023, 9, 1), initial_state=state)
+
+
+def test_build_training_load_summary() -> None:
+    series = compute_training_load(ActivityColumns.from_activities(_create_history(20)), end_date=date(2023, 1, 20))
+
+    summary = build_training_load_summary(series, lookback_days=(28, 7))
+
+    assert summary.current == series.point(date(2023, 1, 20))
+    assert summary.previous_points == (series.point(date(2023, 1, 13)),)
+    assert summary.current.acute_chronic_workload_ratio == pytest.approx(summary.current.acute_load / summary.current.chronic_load)
+    assert summary.current.acute_load > summary.current.chronic_load
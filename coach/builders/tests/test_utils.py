@@ -10,6 +10,7 @@ from coach.builders.utils import compute_distance_duration_pace
 from coach.builders.utils import get_activities_between_dates
 from coach.builders.utils import get_categorized_volume
 from coach.builders.utils import get_week_start_week_end
+from coach.builders.utils import group_activities_by_week_start
 from coach.builders.utils import parse_date
 from coach.builders.utils import parse_distance_into_meters
 from coach.builders.utils import parse_duration
@@ -40,6 +41,12 @@ def test_get_activities_between_dates() -> None:
     assert get_activities_between_dates(activities, window_start=window_start, window_end=window_end) == [SAMPLE_RIDE]
 
 
+def test_group_activities_by_week_start() -> None:
+    activities = [SAMPLE_RUN, SAMPLE_RIDE, SAMPLE_RUN]
+
+    assert group_activities_by_week_start(activities) == {date(2024, 12, 30): [SAMPLE_RUN, SAMPLE_RIDE, SAMPLE_RUN]}
+
+
 def test_bucket_activities_by_weekday() -> None:
     activities = [SAMPLE_RUN, SAMPLE_RIDE, SAMPLE_RUN]
 
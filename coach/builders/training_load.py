@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from datetime import timedelta
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from coach.domain.activity import SportType
+from coach.domain.activity_columns import SPORT_TYPES
+from coach.domain.activity_columns import ActivityColumns
+from coach.domain.activity_columns import date_from_day_number
+from coach.domain.activity_columns import day_number
+from coach.domain.training_load import TrainingLoadPoint
+from coach.domain.training_load import TrainingLoadState
+from coach.domain.training_load import TrainingLoadSummary
+
+_PACE_SPORT_CODES = np.array([SPORT_TYPES.index(SportType.RUN), SPORT_TYPES.index(SportType.WALK)], dtype=np.int8)
+_MAX_INTENSITY_FACTOR = 1.5
+# The closed-form exponential average rescales by decay^-n, blocks keep that factor far from float64 overflow
+_EWMA_BLOCK_DAYS = 256
+# Activities older than six chronic time constants weigh less than 0.25% in today's CTL (e^-6), so the series is computed over this window only
+TRAINING_LOAD_LOOKBACK_DAYS = 6 * 42
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TrainingLoadSettings:
+    threshold_heart_rate: float = 170.0
+    threshold_run_pace_seconds_per_km: float = 270.0
+    default_intensity_factor: float = 0.7  # Used for activities without heart rate or pace
+    acute_time_constant_days: float = 7.0
+    chronic_time_constant_days: float = 42.0
+
+
+DEFAULT_TRAINING_LOAD_SETTINGS = TrainingLoadSettings()
+
+
+@dataclass(frozen=True, kw_only=True, slots=True, eq=False)
+class TrainingLoadSeries:
+    """Daily load and its exponentially weighted acute (ATL) and chronic (CTL) averages, one array element per day from start_date on."""
+
+    start_date: date
+    daily_loads: NDArray[np.float64]
+    acute_loads: NDArray[np.float64]
+    chronic_loads: NDArray[np.float64]
+
+    @property
+    def end_date(self) -> date:
+        return self.start_date + timedelta(days=len(self.daily_loads) - 1)
+
+    @property
+    def training_stress_balances(self) -> NDArray[np.float64]:
+        return self.chronic_loads - self.acute_loads
+
+    @property
+    def acute_chronic_workload_ratios(self) -> NDArray[np.float64]:
+        """ATL / CTL, NaN on days without any chronic load."""
+        return np.divide(self.acute_loads, self.chronic_loads, out=np.full_like(self.acute_loads, np.nan), where=self.chronic_loads > 0)
+
+    def point(self, day: date) -> TrainingLoadPoint:
+        index = (day - self.start_date).days
+        if not 0 <= index < len(self.daily_loads):
+            raise ValueError(f'{day} is outside of the series ({self.start_date} to {self.end_date})')
+
+        ratio = self.acute_chronic_workload_ratios[index]
+        return TrainingLoadPoint(
+            day=day,
+            daily_load=float(self.daily_loads[index]),
+            acute_load=float(self.acute_loads[index]),
+            chronic_load=float(self.chronic_loads[index]),
+            training_stress_balance=float(self.training_stress_balances[index]),
+            acute_chronic_workload_ratio=None if np.isnan(ratio) else float(ratio),
+        )
+
+    def final_state(self) -> TrainingLoadState:
+        return TrainingLoadState(day=self.end_date, acute_load=float(self.acute_loads[-1]), chronic_load=float(self.chronic_loads[-1]))
+
+
+def compute_activity_loads(columns: ActivityColumns, settings: TrainingLoadSettings = DEFAULT_TRAINING_LOAD_SETTINGS) -> NDArray[np.float64]:
+    """
+    Training stress of every activity: duration in hours * intensity factor^2 * 100, like hrTSS / rTSS.
+
+    The intensity factor comes from average heart rate relative to the threshold heart rate, then for runs and walks from pace relative to
+    the threshold pace, and otherwise falls back to the default intensity factor.
+    """
+    duration_hours = columns.duration_seconds / 3_600
+    heart_rate_intensity = columns.average_heart_rate / settings.threshold_heart_rate
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Missing or zero distances and durations end up as NaN or 0 here and are excluded below
+        seconds_per_km = columns.duration_seconds / (columns.distance_meters / 1_000)
+        pace_intensity = np.where(np.isin(columns.sport_codes, _PACE_SPORT_CODES), settings.threshold_run_pace_seconds_per_km / seconds_per_km, np.nan)
+
+    intensity_factors = np.where(
+        np.isfinite(heart_rate_intensity),
+        heart_rate_intensity,
+        np.where(np.isfinite(pace_intensity) & (pace_intensity > 0), pace_intensity, settings.default_intensity_factor),
+    )
+    intensity_factors = np.clip(intensity_factors, 0.0, _MAX_INTENSITY_FACTOR)
+    return duration_hours * intensity_factors**2 * 100
+
+
+def _exponentially_weighted_loads(daily_loads: NDArray[np.float64], *, time_constant_days: float, initial_load: float) -> NDArray[np.float64]:
+    """
+    load[t] = decay * load[t - 1] + (1 - decay) * daily_loads[t] for every day, without a Python loop per day.
+
+    Unrolled, load[t] = decay^(t + 1) * (initial_load + (1 - decay) * cumsum(daily_loads[k] / decay^(k + 1))[t]).
+    """
+    decay = math.exp(-1 / time_constant_days)
+    loads = np.empty_like(daily_loads)
+    previous_load = initial_load
+
+    for block_start in range(0, len(daily_loads), _EWMA_BLOCK_DAYS):
+        block = daily_loads[block_start:block_start + _EWMA_BLOCK_DAYS]
+        decay_powers = decay ** np.arange(1, len(block) + 1)
+        block_loads = decay_powers * (previous_load + (1 - decay) * np.cumsum(block / decay_powers))
+        loads[block_start:block_start + len(block)] = block_loads
+        previous_load = float(block_loads[-1])
+
+    return loads
+
+
+def compute_training_load(
+    columns: ActivityColumns,
+    *,
+    end_date: date,
+    settings: TrainingLoadSettings = DEFAULT_TRAINING_LOAD_SETTINGS,
+    initial_state: Optional[TrainingLoadState] = None,
+) -> TrainingLoadSeries:
+    """
+    Compute daily ATL and CTL up to end_date (inclusive).
+
+    Without initial_state the series starts on the day of the first activity, or on end_date with zero load if there is none before it. With it, the computation continues from the day after the state,
+    so new activities can be added incrementally: activities on or before the state's day are assumed to be counted in it already.
+    """
+    if initial_state is not None:
+        start_day = day_number(initial_state.day) + 1
+        initial_acute_load, initial_chronic_load = initial_state.acute_load, initial_state.chronic_load
+    else:
+        start_day = min(int(columns.days.min()), day_number(end_date)) if len(columns) else day_number(end_date)
+        initial_acute_load, initial_chronic_load = 0.0, 0.0
+
+    num_days = day_number(end_date) - start_day + 1
+    if num_days <= 0:
+        raise ValueError(f'end_date {end_date} must be after the day of initial_state ({initial_state.day if initial_state else None})')
+
+    days = columns.days
+    within_series = (days >= start_day) & (days < start_day + num_days)
+    activity_loads = compute_activity_loads(columns, settings)[within_series]
+    daily_loads = np.bincount(days[within_series] - start_day, weights=activity_loads, minlength=num_days).astype(np.float64)
+
+    return TrainingLoadSeries(
+        start_date=date_from_day_number(start_day),
+        daily_loads=daily_loads,
+        acute_loads=_exponentially_weighted_loads(daily_loads, time_constant_days=settings.acute_time_constant_days, initial_load=initial_acute_load),
+        chronic_loads=_exponentially_weighted_loads(daily_loads, time_constant_days=settings.chronic_time_constant_days, initial_load=initial_chronic_load),
+    )
+
+
+def build_training_load_summary(series: TrainingLoadSeries, *, lookback_days: tuple[int, ...] = (7, 28)) -> TrainingLoadSummary:
+    """Summarize the last day of the series, together with the days lookback_days before it that the series covers."""
+    previous_days = [series.end_date - timedelta(days=num_days) for num_days in sorted(lookback_days)]
+    return TrainingLoadSummary(
+        current=series.point(series.end_date),
+        previous_points=tuple(series.point(day) for day in previous_days if day >= series.start_date),
+    )
@@ -14,6 +14,32 @@ from coach.domain.training_summaries import ActivitySummary
 from coach.domain.training_summaries import ActivityVolume
 from coach.domain.training_summaries import WeeklyActivities
 
+# Compiled once at import, the goal parsers below run them for every line of coach.md
+_DISTANCE_PATTERNS = [
+    (re.compile(r'(\d+\.?\d*)\s*km'), 1000),
+    (re.compile(r'(\d+\.?\d*)\s*mi(?:les?)?'), 1609.34),
+    (re.compile(r'(\d+\.?\d*)\s*m(?:eters?)?(?!\s*i)'), 1),
+]
+_CLOCK_DURATION_PATTERN = re.compile(r'(\d+):(\d+)(?::(\d+))?')
+_DESCRIPTIVE_DURATION_PATTERNS = [
+    (re.compile(r'(\d+\.?\d*)\s*h(?:ours?)?'), 3600),
+    (re.compile(r'(\d+\.?\d*)\s*min(?:utes?)?'), 60),
+    (re.compile(r'(\d+\.?\d*)\s*s(?:ec(?:onds?)?)?'), 1),
+]
+_AT_PACE_PATTERN = re.compile(r'@(\d+:\d+)')
+_PACE_PATTERN = re.compile(r'(\d+:\d+)\s*(?:/|per)\s*(km|mi)')
+_MINUTES_PER_KM_PATTERN = re.compile(r'(\d+):(\d+)/km')
+_DATE_PATTERNS = [
+    (re.compile(r'\d{4}-\d{2}-\d{2}', re.IGNORECASE), '%Y-%m-%d'),  # 2025-03-15
+    (re.compile(r'\d{4}/\d{2}/\d{2}', re.IGNORECASE), '%Y/%m/%d'),  # 2025/03/15
+    (re.compile(r'\d{2}/\d{2}/\d{4}', re.IGNORECASE), '%d/%m/%Y'),  # 15/03/2025
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{4}', re.IGNORECASE), '%d/%m/%Y'),  # 15/3/2025
+    (re.compile(r'\d{1,2}.\d{1,2}.\d{4}', re.IGNORECASE), '%d.%m.%Y'),  # 15.3.2025
+    (re.compile(r'\d{1,2}. \d{1,2}. \d{4}', re.IGNORECASE), '%d. %m. %Y'),  # 15. 3. 2025
+    (re.compile(r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}', re.IGNORECASE), '%d %B %Y'),  # 15 March 2025
+    (re.compile(r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}', re.IGNORECASE), '%B %d, %Y'),  # March 15, 2025
+]
+
 
 def get_week_start_week_end(center_date: date | datetime) -> tuple[date, date]:
     center_date = center_date.date() if isinstance(center_date, datetime) else center_date
@@ -32,6 +58,15 @@ def get_activities_between_dates(
     return [activity for activity in activities if window_start <= activity.start_time_utc.date() <= window_end]
 
 
+def group_activities_by_week_start(activities: Iterable[Activity]) -> dict[date, list[Activity]]:
+    """Group activities by the Monday of their week in a single pass, preserving the input order within each week."""
+    activities_by_week_start: dict[date, list[Activity]] = defaultdict(list)
+    for activity in activities:
+        week_start, _ = get_week_start_week_end(activity.start_time_utc)
+        activities_by_week_start[week_start].append(activity)
+    return activities_by_week_start
+
+
 def create_empty_weekly_activities() -> WeeklyActivities:
     return {
         "Monday": [],
@@ -96,15 +131,9 @@ def parse_sport_type(text: str) -> SportType:
 
 def parse_distance_into_meters(text: str) -> Optional[float]:
     """Parse distance from text, supporting km, mi, m formats."""
-    patterns = [
-        (r'(\d+\.?\d*)\s*km', 1000),
-        (r'(\d+\.?\d*)\s*mi(?:les?)?', 1609.34),
-        (r'(\d+\.?\d*)\s*m(?:eters?)?(?!\s*i)', 1),
-    ]
-
     text_lower = text.lower()
-    for pattern, multiplier in patterns:
-        match = re.search(pattern, text_lower)
+    for pattern, multiplier in _DISTANCE_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             return float(match.group(1)) * multiplier
 
@@ -113,23 +142,17 @@ def parse_distance_into_meters(text: str) -> Optional[float]:
 
 def parse_duration(text: str) -> Optional[int]:
     """Parse duration from text, supporting HH:MM:SS, MM:SS, or descriptive formats."""
-    time_match = re.search(r'(\d+):(\d+)(?::(\d+))?', text)
+    time_match = _CLOCK_DURATION_PATTERN.search(text)
     if time_match:
         hours = int(time_match.group(1)) if time_match.group(3) else 0
         minutes = int(time_match.group(2)) if time_match.group(3) else int(time_match.group(1))
         seconds = int(time_match.group(3)) if time_match.group(3) else int(time_match.group(2))
         return hours * 3600 + minutes * 60 + seconds
 
-    descriptive_patterns = [
-        (r'(\d+\.?\d*)\s*h(?:ours?)?', 3600),
-        (r'(\d+\.?\d*)\s*min(?:utes?)?', 60),
-        (r'(\d+\.?\d*)\s*s(?:ec(?:onds?)?)?', 1),
-    ]
-
     text_lower = text.lower()
     total_seconds = 0.0
-    for pattern, multiplier in descriptive_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern, multiplier in _DESCRIPTIVE_DURATION_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             total_seconds += float(match.group(1)) * multiplier
 
@@ -138,11 +161,11 @@ def parse_duration(text: str) -> Optional[int]:
 
 def parse_pace_into_minutes_per_km(text: str) -> str:
     """Parse pace from text, supporting min/km, min/mi formats and @pace per km notation."""
-    at_pace_match = re.search(r'@(\d+:\d+)', text)
+    at_pace_match = _AT_PACE_PATTERN.search(text)
     if at_pace_match:
         return f'{at_pace_match.group(1)}/km'
 
-    pace_match = re.search(r'(\d+:\d+)\s*(?:/|per)\s*(km|mi)', text.lower())
+    pace_match = _PACE_PATTERN.search(text.lower())
     if pace_match:
         pace_value = pace_match.group(1)
         unit = pace_match.group(2)
@@ -168,19 +191,9 @@ def parse_date(text: str) -> str | date:
         - date object if a valid date is found and parsed
         - original text string if no date pattern matches
     """
-    date_patterns = [
-        (r'\d{4}-\d{2}-\d{2}', '%Y-%m-%d'),  # 2025-03-15
-        (r'\d{4}/\d{2}/\d{2}', '%Y/%m/%d'),  # 2025/03/15
-        (r'\d{2}/\d{2}/\d{4}', '%d/%m/%Y'),  # 15/03/2025
-        (r'\d{1,2}/\d{1,2}/\d{4}', '%d/%m/%Y'),  # 15/3/2025
-        (r'\d{1,2}.\d{1,2}.\d{4}', '%d.%m.%Y'),  # 15.3.2025
-        (r'\d{1,2}. \d{1,2}. \d{4}', '%d. %m. %Y'),  # 15. 3. 2025
-        (r'\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}', '%d %B %Y'),  # 15 March 2025
-        (r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}', '%B %d, %Y'),  # March 15, 2025
-    ]
-
-    for pattern, date_format in date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+
+    for pattern, date_format in _DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             date_str = match.group(0)
             try:
@@ -193,7 +206,7 @@ def parse_date(text: str) -> str | date:
 
 
 def _seconds_per_meter_from_minutes_per_km(pace_str: str) -> float:
-    match = re.match(r'(\d+):(\d+)/km', pace_str)
+    match = _MINUTES_PER_KM_PATTERN.match(pace_str)
     if not match:
         raise ValueError(f'Invalid pace format: {pace_str}')
 
@@ -1,21 +1,41 @@
 from collections.abc import Iterable
+from collections.abc import Mapping
 from datetime import date
 from datetime import datetime
+from typing import Optional
 
 from coach.builders.utils import bucket_activities_by_weekday
 from coach.builders.utils import get_activities_between_dates
 from coach.builders.utils import get_categorized_volume
 from coach.builders.utils import get_week_start_week_end
 from coach.domain.activity import Activity
+from coach.domain.activity import SportType
+from coach.domain.training_summaries import ActivityVolume
 from coach.domain.training_summaries import WeeklySummary
 
 
-def build_weekly_summary(activities: Iterable[Activity], generated_at: date | datetime) -> WeeklySummary:
+def build_weekly_summary(
+    activities: Iterable[Activity],
+    generated_at: date | datetime,
+    *,
+    volume_by_sport: Optional[Mapping[SportType, ActivityVolume]] = None,
+) -> WeeklySummary:
+    """Build the summary of the week containing generated_at. Pre-aggregated volumes (e.g. from the weekly volumes table) are used as is when given."""
     week_start, week_end = get_week_start_week_end(generated_at)
     activities_within_week = get_activities_between_dates(activities, window_start=week_start, window_end=week_end)
+    return build_weekly_summary_from_week_activities(activities_within_week, week_start=week_start, week_end=week_end, volume_by_sport=volume_by_sport)
+
+
+def build_weekly_summary_from_week_activities(
+    activities_within_week: list[Activity],
+    *,
+    week_start: date,
+    week_end: date,
+    volume_by_sport: Optional[Mapping[SportType, ActivityVolume]] = None,
+) -> WeeklySummary:
     return WeeklySummary(
         week_start=week_start,
         week_end=week_end,
-        volume_by_sport=get_categorized_volume(activities_within_week),
+        volume_by_sport=get_categorized_volume(activities_within_week) if volume_by_sport is None else volume_by_sport,
         activity_summaries=bucket_activities_by_weekday(activities_within_week),
     )
@@ -2,6 +2,7 @@ import typer
 
 from coach.scripts.coach import coach_app
 from coach.scripts.info import info_app
+from coach.scripts.serve import serve_app
 from coach.scripts.sync import sync_app
 
 app = typer.Typer(help='AI-powered training coach')
@@ -9,6 +10,7 @@ app = typer.Typer(help='AI-powered training coach')
 app.add_typer(sync_app, name='sync')
 app.add_typer(info_app, name='info')
 app.add_typer(coach_app, name='chat')
+app.add_typer(serve_app, name='serve')
 
 
 def main() -> None:
@@ -0,0 +1,20 @@
+import subprocess  # noqa: S404
+import sys
+
+
+def _run_python(code: str) -> str:
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout  # noqa: S603
+
+
+def test_cli_import_does_not_load_heavy_dependencies() -> None:
+    loaded_modules = _run_python("import sys, coach.cli.app; print(' '.join(sys.modules))").split()
+
+    assert 'coach.cli.app' in loaded_modules
+    assert [name for name in ('openai', 'numpy', 'requests', 'coach.reasoning.clients') if name in loaded_modules] == []
+
+
+def test_all_commands_are_registered() -> None:
+    help_text = _run_python("import sys; sys.argv = ['coach', '--help']; from coach.cli.app import main; main()")
+
+    for command in ('sync', 'info', 'chat', 'serve'):
+        assert command in help_text
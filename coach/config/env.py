@@ -10,3 +10,7 @@ def get_env_var(name: str) -> str:
     if not value:
         raise RuntimeError(f'Missing required environment variable: {name}')
     return value
+
+
+def get_optional_env_var(name: str, default: str) -> str:
+    return os.getenv(name) or default
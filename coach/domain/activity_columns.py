@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from coach.domain.activity import Activity
+from coach.domain.activity import SportType
+
+SECONDS_PER_DAY = 86_400
+# 1970-01-01 was a Thursday, shifting day numbers by 3 makes weeks start on Mondays like get_week_start_week_end
+_EPOCH_WEEKDAY_OFFSET = 3
+
+# Sport codes index into this tuple
+SPORT_TYPES: tuple[SportType, ...] = tuple(SportType)
+_SPORT_CODES_BY_VALUE = {sport_type.value: code for code, sport_type in enumerate(SPORT_TYPES)}
+
+
+def day_number(day: date) -> int:
+    """Number of days since 1970-01-01, the unit of the day and week arrays."""
+    return (day - date(1970, 1, 1)).days
+
+
+def date_from_day_number(day: int) -> date:
+    return date.fromordinal(date(1970, 1, 1).toordinal() + int(day))
+
+
+@dataclass(frozen=True, kw_only=True, slots=True, eq=False)
+class ActivityColumns:
+    """
+    Columnar view of activities, one typed array per metric, all sorted by start time.
+
+    Missing values are NaN in the float arrays. duration_seconds follows ActivityVolume: the moving time, or the elapsed time when
+    there is none. It is meant for vectorized aggregations; rendering keeps using Activity objects.
+    """
+
+    activity_ids: NDArray[np.int64]
+    start_timestamps: NDArray[np.int64]
+    sport_codes: NDArray[np.int8]
+    duration_seconds: NDArray[np.int64]
+    distance_meters: NDArray[np.float64]
+    elevation_gain_meters: NDArray[np.float64]
+    average_heart_rate: NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return len(self.activity_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> ActivityColumns:
+        """
+        Build columns from rows of (activity_id, sport_type, start_timestamp, duration_seconds, distance_meters, elevation_gain_meters, average_heart_rate).
+
+        Rows must already be sorted by start time, NULLs become NaN.
+        """
+        if not rows:
+            return cls.empty()
+
+        activity_ids, sport_types, start_timestamps, duration_seconds, distance_meters, elevation_gain_meters, average_heart_rate = zip(*rows, strict=True)
+        return cls(
+            activity_ids=np.array(activity_ids, dtype=np.int64),
+            start_timestamps=np.array(start_timestamps, dtype=np.int64),
+            sport_codes=np.array([_SPORT_CODES_BY_VALUE[sport_type] for sport_type in sport_types], dtype=np.int8),
+            duration_seconds=np.array(duration_seconds, dtype=np.int64),
+            distance_meters=np.array(distance_meters, dtype=np.float64),
+            elevation_gain_meters=np.array(elevation_gain_meters, dtype=np.float64),
+            average_heart_rate=np.array(average_heart_rate, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_activities(cls, activities: Iterable[Activity]) -> ActivityColumns:
+        rows = [
+            (
+                activity.activity_id,
+                activity.sport_type.value,
+                int(activity.start_time_utc.timestamp()),
+                activity.moving_time_seconds or activity.elapsed_time_seconds,
+                activity.distance_meters,
+                activity.elevation_gain_meters,
+                activity.average_heart_rate,
+            )
+            for activity in sorted(activities, key=lambda activity: activity.start_time_utc)
+        ]
+        return cls.from_rows(rows)
+
+    @classmethod
+    def empty(cls) -> ActivityColumns:
+        return cls(
+            activity_ids=np.empty(0, dtype=np.int64),
+            start_timestamps=np.empty(0, dtype=np.int64),
+            sport_codes=np.empty(0, dtype=np.int8),
+            duration_seconds=np.empty(0, dtype=np.int64),
+            distance_meters=np.empty(0, dtype=np.float64),
+            elevation_gain_meters=np.empty(0, dtype=np.float64),
+            average_heart_rate=np.empty(0, dtype=np.float64),
+        )
+
+    @property
+    def days(self) -> NDArray[np.int64]:
+        """UTC day number of every activity start."""
+        return self.start_timestamps // SECONDS_PER_DAY
+
+    @property
+    def week_start_days(self) -> NDArray[np.int64]:
+        """Day number of the Monday of every activity's week."""
+        days = self.days
+        return days - (days + _EPOCH_WEEKDAY_OFFSET) % 7
+
+    def select(self, mask: NDArray[np.bool_]) -> ActivityColumns:
+        return ActivityColumns(
+            activity_ids=self.activity_ids[mask],
+            start_timestamps=self.start_timestamps[mask],
+            sport_codes=self.sport_codes[mask],
+            duration_seconds=self.duration_seconds[mask],
+            distance_meters=self.distance_meters[mask],
+            elevation_gain_meters=self.elevation_gain_meters[mask],
+            average_heart_rate=self.average_heart_rate[mask],
+        )
+
+    def between_dates(self, *, window_start: date, window_end: date) -> ActivityColumns:
+        """Activities that started within [window_start, window_end], both inclusive, like get_activities_between_dates."""
+        days = self.days
+        return self.select((days >= day_number(window_start)) & (days <= day_number(window_end)))
+
+    def sport_types(self) -> list[SportType]:
+        return [SPORT_TYPES[code] for code in self.sport_codes]
+
+    def start_times_utc(self) -> list[datetime]:
+        return [datetime.fromtimestamp(int(timestamp), tz=UTC) for timestamp in self.start_timestamps]
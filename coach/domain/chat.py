@@ -1,33 +1,122 @@
 from __future__ import annotations
 
+import math
+import re
 from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Literal
 
 Role = Literal['user', 'coach']
 
+_CHARS_PER_TOKEN = 4
+_SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_SUMMARY_HEADER = 'Earlier in the conversation (summarized):'
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of English text (about 4 characters per token), close enough for budgeting without a model-specific tokenizer."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
 
 @dataclass(frozen=True, kw_only=True, slots=True)
 class ChatTurn:
     role: Role
     content: str
 
+    def render(self) -> str:
+        return f'{self.role.capitalize()}: {self.content}'
+
+
+def summarize_turn(turn: ChatTurn, *, max_tokens: int = 40) -> ChatTurn:
+    """Condense a turn to its first sentence, cut to about max_tokens."""
+    content = _WHITESPACE_PATTERN.sub(' ', turn.content).strip()
+    first_sentence = _SENTENCE_END_PATTERN.split(content, maxsplit=1)[0]
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(first_sentence) > max_chars:
+        first_sentence = first_sentence[:max_chars - 3].rstrip() + '...'
+    elif first_sentence != content:
+        first_sentence += ' ...'
+    return ChatTurn(role=turn.role, content=first_sentence)
+
 
 class ChatHistory:
-    def __init__(self, *, max_turns: int = 6) -> None:
-        self._turns: deque[ChatTurn] = deque(maxlen=max_turns)
+    """
+    Most recent chat turns in full, kept within max_turns and a budget of max_tokens for the whole rendered history.
+
+    Turns falling out of the window are folded into a running summary of one short line per turn, itself capped at max_summary_tokens,
+    so the prompt size stays bounded while earlier topics remain visible. The latest turn is always kept in full.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_turns: int = 6,
+        max_tokens: int = 1_500,
+        max_summary_tokens: int = 300,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        if max_summary_tokens >= max_tokens:
+            raise ValueError(f'max_summary_tokens ({max_summary_tokens}) must be smaller than max_tokens ({max_tokens})')
+
+        self._max_turns = max_turns
+        self._max_tokens = max_tokens
+        self._max_summary_tokens = max_summary_tokens
+        self._count_tokens = count_tokens
+
+        # Each line is counted with its trailing newline, so the sum bounds the tokens of the rendered history
+        self._turns: deque[tuple[ChatTurn, int]] = deque()
+        self._summary: deque[tuple[ChatTurn, int]] = deque()
+        self._num_turn_tokens = 0
+        self._num_summary_tokens = 0
 
     def add(self, turn: ChatTurn) -> None:
-        self._turns.append(turn)
+        num_tokens = self._count_tokens(turn.render() + '\n')
+        self._turns.append((turn, num_tokens))
+        self._num_turn_tokens += num_tokens
+
+        while len(self._turns) > 1 and (len(self._turns) > self._max_turns or self.num_tokens > self._max_tokens):
+            self._fold_oldest_turn()
+
+    def discard(self, turn: ChatTurn) -> None:
+        """Remove a turn added earlier, e.g. a question whose answer failed. A turn already folded into the summary stays there."""
+        for index, (kept_turn, num_tokens) in enumerate(self._turns):
+            if kept_turn is turn:
+                del self._turns[index]
+                self._num_turn_tokens -= num_tokens
+                return
+
+    def _fold_oldest_turn(self) -> None:
+        turn, num_tokens = self._turns.popleft()
+        self._num_turn_tokens -= num_tokens
+
+        summary_turn = summarize_turn(turn)
+        num_summary_tokens = self._count_tokens(f'- {summary_turn.render()}\n')
+        self._summary.append((summary_turn, num_summary_tokens))
+        self._num_summary_tokens += num_summary_tokens
+
+        while self._summary and self._num_summary_tokens + self._count_tokens(_SUMMARY_HEADER + '\n') > self._max_summary_tokens:
+            _, num_dropped_tokens = self._summary.popleft()
+            self._num_summary_tokens -= num_dropped_tokens
+
+    @property
+    def num_tokens(self) -> int:
+        """Upper bound of the tokens of render()."""
+        num_header_tokens = self._count_tokens(_SUMMARY_HEADER + '\n') if self._summary else 0
+        return num_header_tokens + self._num_summary_tokens + self._num_turn_tokens
 
     def render(self) -> str:
         lines: list[str] = []
 
-        for turn in self._turns:
-            prefix = turn.role.capitalize()
-            lines.append(f'{prefix}: {turn.content}')
+        if self._summary:
+            lines.append(_SUMMARY_HEADER)
+            lines.extend(f'- {turn.render()}' for turn, _ in self._summary)
+
+        for turn, _ in self._turns:
+            lines.append(turn.render())
 
         return '\n'.join(lines)
 
     def has_no_coach_response(self) -> bool:
-        return all(turn.role == 'user' for turn in self._turns)
+        return all(turn.role == 'user' for turn, _ in (*self._summary, *self._turns))
@@ -18,3 +18,11 @@ class DistanceActivityTrainingGoal(TrainingGoal):
     goal_distance_meters: float
     goal_duration_seconds: int
     goal_pace: str
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class ParsedSystemPrompt:
+    """User system prompt (coach.md) split into the free-form instructions and the parsed goals below its '### Goals:' heading."""
+
+    instructions: str
+    goals: tuple[TrainingGoal, ...]
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from coach.domain.activity import ActivitySource
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SyncState:
+    source: ActivitySource
+
+    # Activities are listed page by page after this timestamp, keeping the cursor fixed makes pages stable across restarts
+    after: int
+    last_completed_page: int = 0
+    pending_activity_ids: tuple[int, ...] = ()
+
+    is_completed: bool = False
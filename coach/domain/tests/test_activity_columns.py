@@ -0,0 +1,44 @@
+from dataclasses import replace
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+
+import numpy as np
+
+from coach.domain.activity import SportType
+from coach.domain.activity_columns import ActivityColumns
+from coach.domain.activity_columns import date_from_day_number
+from coach.domain.activity_columns import day_number
+from coach.tests.utils_for_tests import SAMPLE_RIDE
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def test_day_number_round_trip() -> None:
+    assert day_number(date(1970, 1, 2)) == 1
+    assert date_from_day_number(day_number(date(2025, 1, 1))) == date(2025, 1, 1)
+
+
+class TestActivityColumns:
+    def setup_method(self) -> None:
+        untimed_run = replace(SAMPLE_RUN, activity_id=3, source_activity_id=3, start_time_utc=datetime(2025, 1, 6, 7, tzinfo=UTC), moving_time_seconds=None, distance_meters=None)
+        self._columns = ActivityColumns.from_activities([untimed_run, SAMPLE_RIDE, SAMPLE_RUN])
+
+    def test_from_activities_is_sorted_by_start_time(self) -> None:
+        assert self._columns.activity_ids.tolist() == [1, 2, 3]
+        assert self._columns.sport_types() == [SportType.RUN, SportType.RIDE, SportType.RUN]
+        assert self._columns.start_times_utc() == [SAMPLE_RUN.start_time_utc, SAMPLE_RIDE.start_time_utc, datetime(2025, 1, 6, 7, tzinfo=UTC)]
+
+    def test_duration_falls_back_to_elapsed_time_and_missing_values_are_nan(self) -> None:
+        assert self._columns.duration_seconds.tolist() == [3_500, 3_500, 3_600]
+        assert np.isnan(self._columns.distance_meters[2])
+        assert np.isnan(self._columns.average_heart_rate).all()
+
+    def test_week_start_days(self) -> None:
+        assert [date_from_day_number(day) for day in self._columns.week_start_days] == [date(2024, 12, 30), date(2024, 12, 30), date(2025, 1, 6)]
+
+    def test_between_dates_is_inclusive(self) -> None:
+        assert self._columns.between_dates(window_start=date(2025, 1, 2), window_end=date(2025, 1, 6)).activity_ids.tolist() == [2, 3]
+        assert len(self._columns.between_dates(window_start=date(2026, 1, 1), window_end=date(2026, 1, 7))) == 0
+
+    def test_empty(self) -> None:
+        assert len(ActivityColumns.from_activities([])) == 0
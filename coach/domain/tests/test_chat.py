@@ -1,5 +1,9 @@
+import pytest
+
 from coach.domain.chat import ChatHistory
 from coach.domain.chat import ChatTurn
+from coach.domain.chat import estimate_tokens
+from coach.domain.chat import summarize_turn
 
 
 class TestChatHistory:
@@ -24,4 +28,56 @@ class TestChatHistory:
         self._history.add(ChatTurn(role='coach', content='Hello back'))
         self._history.add(ChatTurn(role='user', content='How are you?'))
 
-        assert self._history.render() == 'Coach: Hello back\nUser: How are you?'
+        assert self._history.render() == 'Earlier in the conversation (summarized):\n- User: Hello\nCoach: Hello back\nUser: How are you?'
+
+    def test_discard(self) -> None:
+        self._history.add(ChatTurn(role='user', content='Hello'))
+        unanswered_turn = ChatTurn(role='user', content='How are you?')
+        self._history.add(unanswered_turn)
+        num_tokens = self._history.num_tokens
+
+        self._history.discard(unanswered_turn)
+        self._history.discard(unanswered_turn)
+
+        assert self._history.render() == 'User: Hello'
+        assert self._history.num_tokens == num_tokens - estimate_tokens('User: How are you?\n')
+
+    def test_folded_coach_turn_still_counts_as_response(self) -> None:
+        self._history.add(ChatTurn(role='coach', content='Hello'))
+        self._history.add(ChatTurn(role='user', content='Hi'))
+        self._history.add(ChatTurn(role='user', content='How are you?'))
+
+        assert not self._history.has_no_coach_response()
+
+
+class TestTokenBudget:
+    def test_rendered_history_stays_within_budget(self) -> None:
+        history = ChatHistory(max_turns=100, max_tokens=200, max_summary_tokens=60)
+        for index in range(50):
+            history.add(ChatTurn(role='user', content=f'Question {index}: how should I pace my long run this weekend?'))
+            history.add(ChatTurn(role='coach', content=f'Answer {index}. ' + ' '.join(['Run it at an easy conversational pace.'] * 10)))
+
+            assert estimate_tokens(history.render()) <= history.num_tokens <= 200
+
+        rendered = history.render()
+        assert rendered.startswith('Earlier in the conversation (summarized):\n- ')
+        assert rendered.endswith('Coach: Answer 49. ' + 'Run it at an easy conversational pace. ' * 9 + 'Run it at an easy conversational pace.')
+        assert '- Coach: Answer 48. ...' in rendered
+
+    def test_latest_turn_is_kept_even_over_budget(self) -> None:
+        history = ChatHistory(max_tokens=20, max_summary_tokens=10)
+        history.add(ChatTurn(role='user', content='Hello'))
+        history.add(ChatTurn(role='coach', content=' '.join(['word'] * 100)))
+
+        assert history.render().endswith('word ' * 99 + 'word')
+        assert 'User: Hello' not in history.render()
+
+    def test_summary_budget_must_fit_in_history_budget(self) -> None:
+        with pytest.raises(ValueError, match='must be smaller than max_tokens'):
+            ChatHistory(max_tokens=100, max_summary_tokens=100)
+
+
+def test_summarize_turn() -> None:
+    assert summarize_turn(ChatTurn(role='coach', content='Rest tomorrow.  Then run\neasy.')) == ChatTurn(role='coach', content='Rest tomorrow. ...')
+    assert summarize_turn(ChatTurn(role='user', content='a' * 20), max_tokens=2) == ChatTurn(role='user', content='aaaaa...')
+    assert summarize_turn(ChatTurn(role='user', content='Short one')) == ChatTurn(role='user', content='Short one')
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TrainingLoadState:
+    """Exponentially weighted loads at the end of a day, enough to continue the computation with later activities."""
+
+    day: date
+    acute_load: float
+    chronic_load: float
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TrainingLoadPoint:
+    day: date
+    daily_load: float
+    acute_load: float  # ATL, fatigue
+    chronic_load: float  # CTL, fitness
+    training_stress_balance: float  # TSB = CTL - ATL, form
+    acute_chronic_workload_ratio: Optional[float]  # ACWR = ATL / CTL, None without any chronic load
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TrainingLoadSummary:
+    current: TrainingLoadPoint
+    previous_points: tuple[TrainingLoadPoint, ...]  # Chronologically sorted - most recent is first
@@ -0,0 +1,20 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+from more_itertools import chunked
+
+from coach.domain.activity import Activity
+from coach.persistence.repository_interface import Repository
+
+DEFAULT_BATCH_SIZE = 50
+
+
+def save_in_batches(activities: Iterable[Activity], repository: Repository[Activity], *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[Activity]]:
+    """
+    Lazily pull activities from a stream and persist them in bounded batches, yielding each batch once it is committed.
+
+    Only one batch is held in memory at a time and a failure while producing the stream loses at most the batch in progress.
+    """
+    for batch in chunked(activities, batch_size):
+        repository.save_many(batch)
+        yield batch
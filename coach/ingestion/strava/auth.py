@@ -1,3 +1,4 @@
+import threading
 from dataclasses import dataclass
 from datetime import UTC
 from datetime import datetime
@@ -6,6 +7,7 @@ from typing import Optional
 import requests
 
 from coach.config.settings import load_strava_settings
+from coach.ingestion.strava.session import StravaSession
 
 
 @dataclass(slots=True)
@@ -15,22 +17,26 @@ class StravaAccessToken:
 
 
 class StravaAuth:
-    def __init__(self) -> None:
+    def __init__(self, *, session: Optional[requests.Session] = None) -> None:
         self._settings = load_strava_settings()
+        self._session = session or StravaSession()
         self._access_token: Optional[StravaAccessToken] = None
+        self._lock = threading.Lock()
 
     def get_access_token(self) -> str:
-        if self._access_token is not None and not self._is_expired():
-            return self._access_token.token
+        # Concurrent detail fetches share one auth object, only one of them should refresh an expired token
+        with self._lock:
+            if self._access_token is not None and not self._is_expired():
+                return self._access_token.token
 
-        self._refresh_access_token()
-        return self._access_token.token  # type: ignore[union-attr]
+            self._refresh_access_token()
+            return self._access_token.token  # type: ignore[union-attr]
 
     def _is_expired(self) -> bool:
         return datetime.now(UTC) >= self._access_token.expires_at  # type: ignore[union-attr]
 
     def _refresh_access_token(self) -> None:
-        response = requests.post(
+        response = self._session.post(
             'https://www.strava.com/oauth/token',
             data={
                 'client_id': self._settings.client_id,
@@ -38,7 +44,6 @@ class StravaAuth:
                 'refresh_token': self._settings.refresh_token,
                 'grant_type': 'refresh_token',
             },
-            timeout=10,
         )
         response.raise_for_status()
 
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CachedResponse:
+    url: str
+    payload: Any
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age_seconds(self, now: float) -> float:
+        return now - self.stored_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpResponseCache:
+    """
+    On-disk cache of JSON GET responses, one file per request.
+
+    Entries keep the ETag/Last-Modified validators of the response so they can be revalidated with a conditional request,
+    and are evicted once they are older than `ttl_seconds`.
+    """
+
+    def __init__(self, directory: Path, *, ttl_seconds: int = 30 * 24 * 60 * 60) -> None:
+        self._directory = directory
+        self._ttl_seconds = ttl_seconds
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self.evict_expired()
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        canonical = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f'{key}.json'
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path = self._path(key)
+        try:
+            cached = CachedResponse(**json.loads(path.read_text(encoding='utf-8')))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError):
+            logger.warning('Dropping unreadable cache entry %s.', path)
+            path.unlink(missing_ok=True)
+            return None
+
+        if cached.age_seconds(time.time()) > self._ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        return cached
+
+    def put(self, key: str, *, url: str, payload: Any, etag: Optional[str] = None, last_modified: Optional[str] = None) -> CachedResponse:
+        cached = CachedResponse(url=url, payload=payload, stored_at=time.time(), etag=etag, last_modified=last_modified)
+        path = self._path(key)
+        # Unique temp file per writer, concurrent workers may store the same key
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        tmp_path.write_text(json.dumps(asdict(cached)), encoding='utf-8')
+        # The modification time mirrors stored_at, so eviction can tell the age of an entry without parsing it
+        os.utime(tmp_path, (cached.stored_at, cached.stored_at))
+        tmp_path.replace(path)
+        return cached
+
+    def evict_expired(self) -> int:
+        now = time.time()
+        num_evicted = 0
+        for path in self._directory.glob('*.json'):
+            try:
+                stored_at = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - stored_at > self._ttl_seconds:
+                path.unlink(missing_ok=True)
+                num_evicted += 1
+        return num_evicted
@@ -1,94 +1,142 @@
 import logging
 import time
+from collections.abc import Iterable
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from typing import Optional
 
 import requests
 
 from coach.config.env import get_env_var
 from coach.ingestion.strava.auth import StravaAuth
+from coach.ingestion.strava.cache import HttpResponseCache
+from coach.ingestion.strava.rate_limit import StravaRateLimiter
+from coach.ingestion.strava.rate_limit import StravaRateLimitError
+from coach.ingestion.strava.session import HttpSessionSettings
+from coach.ingestion.strava.session import StravaSession
 
 logger = logging.getLogger(__name__)
 
 
-class StravaRateLimitError(Exception):
-    pass
-
-
 class StravaClient:
     # Strava enforces a 15-minute and daily rate limit.
-    # We back off and retry when we hit the 15-minute limit.
+    # All requests, including concurrent detail fetches, are paced by one rate limiter fed by the X-RateLimit-* headers of every response.
+    # A 429 should therefore not happen, if it does (e.g. budget used by another app) the limiter waits for the next window and the request is retried.
     _RATE_LIMIT_STATUS = 429
+    _NOT_MODIFIED_STATUS = 304
+    # Activities and stats can change at any time and are always revalidated, the athlete profile rarely changes
+    _ATHLETE_MAX_AGE_SECONDS = 24 * 60 * 60
     _MAX_RETRIES = 3
-    _FIFTEEN_MINUTES = 15 * 60
-
-    def __init__(self) -> None:
-        self._auth = StravaAuth()
-        self._base_url = get_env_var('STRAVA_API_BASE_URL')
+    _DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        *,
+        auth: Optional[StravaAuth] = None,
+        base_url: Optional[str] = None,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[StravaRateLimiter] = None,
+        cache: Optional[HttpResponseCache] = None,
+    ) -> None:
+        # One pooled keep-alive session serves both the API and token refresh calls, sized for the worker pool
+        self._session = session or StravaSession(HttpSessionSettings(pool_maxsize=max_workers))
+        self._auth = auth or StravaAuth(session=self._session)
+        self._base_url = base_url or get_env_var('STRAVA_API_BASE_URL')
+        self._max_workers = max_workers
+        self._rate_limiter = rate_limiter or StravaRateLimiter()
+        self._cache = cache
+        self._athlete_id: Optional[int] = None
 
     def _headers(self) -> dict[str, str]:
         return {
             'Authorization': f'Bearer {self._auth.get_access_token()}',
         }
 
-    def _seconds_until_next_window(self) -> int:
-        now = time.time()
-        return self._FIFTEEN_MINUTES - (int(now) % self._FIFTEEN_MINUTES)
-
-    def _get(self, url: str, **kwargs: Any) -> Any:
+    def _request(self, url: str, *, headers: dict[str, str], params: Optional[dict[str, Any]] = None) -> requests.Response:
         for attempt in range(self._MAX_RETRIES):
-            response = requests.get(url, headers=self._headers(), timeout=10, **kwargs)
+            self._rate_limiter.acquire()
+            response = self._session.get(url, headers=self._headers() | headers, params=params)
+            self._rate_limiter.update(response.headers)
 
             if response.status_code != self._RATE_LIMIT_STATUS:
                 response.raise_for_status()
-                return response.json()
-
-            usage = response.headers.get('X-RateLimit-Usage', '')
-            limits = response.headers.get('X-RateLimit-Limit', '')
-            fifteen_min_used, daily_used = (int(x) for x in usage.split(','))
-            fifteen_min_limit, daily_limit = (int(x) for x in limits.split(','))
-
-            if daily_used >= daily_limit:
-                raise StravaRateLimitError(f'Daily rate limit reached ({daily_used}/{daily_limit}).')
+                return response
 
             if attempt == self._MAX_RETRIES - 1:
-                raise StravaRateLimitError(f'15-minute rate limit still exceeded after {self._MAX_RETRIES} attempts.')
+                raise StravaRateLimitError(f'Rate limit still exceeded after {self._MAX_RETRIES} attempts.')
 
-            wait = self._seconds_until_next_window()
-            logger.warning('15-minute rate limit hit. Waiting %ds until next window (attempt %d/%d).', wait, attempt + 1, self._MAX_RETRIES - 1)
-            time.sleep(wait)
+            self._rate_limiter.on_rate_limited()
+            logger.warning('Rate limit hit (attempt %d/%d).', attempt + 1, self._MAX_RETRIES - 1)
 
         raise StravaRateLimitError('Maximum number of retries exceeded.')
 
+    def _get(self, url: str, *, params: Optional[dict[str, Any]] = None, max_age_seconds: Optional[int] = None) -> Any:
+        """
+        GET a JSON payload, optionally through the response cache.
+
+        With `max_age_seconds` set and a cache configured, cached payloads younger than that are returned without any request
+        and older ones are revalidated with a conditional request, which costs no payload download when nothing changed.
+        """
+        if self._cache is None or max_age_seconds is None:
+            return self._request(url, headers={}, params=params).json()
+
+        cache = self._cache
+        cache_key = cache.key(url, params)
+        cached = cache.get(cache_key)
+        if cached is not None and cached.age_seconds(time.time()) <= max_age_seconds:
+            return cached.payload
+
+        response = self._request(url, headers=cached.conditional_headers() if cached is not None else {}, params=params)
+        if response.status_code == self._NOT_MODIFIED_STATUS and cached is not None:
+            return cache.put(cache_key, url=url, payload=cached.payload, etag=cached.etag, last_modified=cached.last_modified).payload
+
+        payload = response.json()
+        cache.put(cache_key, url=url, payload=payload, etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+        return payload
+
     def list_activities(self, *, detailed: bool = True, per_page: int = 50, after: int = 0) -> Iterator[dict[str, Any]]:
         page = 1
 
         while True:
-            activities = self._get(
-                url=f'{self._base_url}/athlete/activities',
-                params={'after': after, 'page': page, 'per_page': per_page},
-            )
+            activities = self.list_activity_summaries(page=page, per_page=per_page, after=after)
 
             if not activities:
                 break
 
-            for activity in activities:
-                if detailed:
-                    yield self.get_detailed_activity(activity['id'])
-                else:
-                    yield activity
+            if detailed:
+                yield from self.get_detailed_activities([activity['id'] for activity in activities])
+            else:
+                yield from activities
 
             page += 1
 
+    def list_activity_summaries(self, *, page: int, per_page: int = 50, after: int = 0) -> list[dict[str, Any]]:
+        return self._get(
+            url=f'{self._base_url}/athlete/activities',
+            params={'after': after, 'page': page, 'per_page': per_page},
+        )
+
+    def get_detailed_activities(self, activity_ids: Iterable[int]) -> Iterator[dict[str, Any]]:
+        # Details are fetched concurrently, map() still yields them in the order of the given IDs
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            yield from executor.map(self.get_detailed_activity, activity_ids)
+
     def get_detailed_activity(self, activity_id: int) -> dict[str, Any]:
-        return self._get(f'{self._base_url}/activities/{activity_id}')
+        return self._get(f'{self._base_url}/activities/{activity_id}', max_age_seconds=0)
 
     def get_athlete(self) -> dict[str, Any]:
-        return self._get(f'{self._base_url}/athlete')
+        athlete = self._get(f'{self._base_url}/athlete', max_age_seconds=self._ATHLETE_MAX_AGE_SECONDS)
+        self._athlete_id = athlete['id']
+        return athlete
 
     def get_athlete_id(self) -> int:
-        return self.get_athlete()['id']
+        # The ID never changes for the authenticated athlete, so it is fetched at most once per client
+        if self._athlete_id is None:
+            self._athlete_id = self.get_athlete()['id']
+        return self._athlete_id
 
     def get_athlete_stats(self) -> dict[str, Any]:
         athlete_id = self.get_athlete_id()
-        return self._get(f'{self._base_url}/athletes/{athlete_id}/stats')
+        return self._get(f'{self._base_url}/athletes/{athlete_id}/stats', max_age_seconds=0)
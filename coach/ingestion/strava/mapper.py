@@ -1,4 +1,5 @@
 from collections.abc import Iterable
+from collections.abc import Iterator
 from datetime import date
 from typing import Any, Optional
 
@@ -17,7 +18,11 @@ from coach.utils import parse_utc_datetime
 
 class StravaMapper:
     def map_activities(self, payloads: Iterable[dict[str, Any]]) -> list[Activity]:
-        return [self.map_strava_activity(payload) for payload in payloads]
+        return list(self.iter_activities(payloads))
+
+    def iter_activities(self, payloads: Iterable[dict[str, Any]]) -> Iterator[Activity]:
+        for payload in payloads:
+            yield self.map_strava_activity(payload)
 
     def map_strava_activity(self, payload: dict[str, Any]) -> Activity:
         start_time = parse_utc_datetime(payload['start_date'])
@@ -0,0 +1,195 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StravaRateLimitError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class RateLimitState:
+    window: int
+    day: int
+    fifteen_min_used: int = 0
+    fifteen_min_limit: Optional[int] = None
+    daily_used: int = 0
+    daily_limit: Optional[int] = None
+    tokens: Optional[float] = None
+    last_refill: float = 0.0
+    rate_limited_window: Optional[int] = None  # Window in which Strava answered 429, no request is sent until it ends
+
+
+class StravaRateLimiter:
+    """
+    Thread-safe token-bucket scheduler for Strava's 15-minute and daily request limits.
+
+    The bucket holds at most one 15-minute budget and refills at the rate that budget allows (limit / 15 minutes),
+    so short syncs run at full speed while long backfills settle at the maximum sustained rate.
+    On top of that, the usage reported in the X-RateLimit-* headers of every response caps the fixed Strava windows:
+    no request is sent once the current 15-minute window is used up (or Strava answered 429 in it), and when the daily
+    budget runs out the scheduler raises StravaRateLimitError, or with wait_for_daily_reset waits for the UTC day to roll over.
+
+    The state is optionally persisted to a JSON file, so a restarted sync keeps spending the same budget. It is written at most
+    every few seconds, and right away once a budget is used up. The first response after a restart corrects any lag in the counts.
+    """
+
+    _FIFTEEN_MINUTES = 15 * 60
+    _ONE_DAY = 24 * 60 * 60
+    # Refilling for exactly the computed wait can land a rounding error short of a whole token
+    _TOKEN_TOLERANCE = 1e-6
+    _SAVE_INTERVAL_SECONDS = 5.0
+
+    def __init__(self, *, state_path: Optional[Path] = None, wait_for_daily_reset: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._state_path = state_path
+        self._wait_for_daily_reset = wait_for_daily_reset
+        self._state = self._load_state()
+        self._last_saved = 0.0
+
+    def _load_state(self) -> RateLimitState:
+        now = time.time()
+        state = RateLimitState(window=self._window_of(now), day=self._day_of(now), last_refill=now)
+        if self._state_path is not None and self._state_path.exists():
+            try:
+                state = RateLimitState(**json.loads(self._state_path.read_text(encoding='utf-8')))
+            except (ValueError, TypeError):
+                logger.warning('Ignoring unreadable rate limit state in %s.', self._state_path)
+        return state
+
+    def _save_state(self, now: float) -> None:
+        if self._state_path is None:
+            return
+        if now - self._last_saved < self._SAVE_INTERVAL_SECONDS and not self._is_budget_used_up():
+            return
+        self._last_saved = now
+        tmp_path = self._state_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(asdict(self._state)), encoding='utf-8')
+        tmp_path.replace(self._state_path)
+
+    def _window_of(self, now: float) -> int:
+        return int(now) // self._FIFTEEN_MINUTES
+
+    def _day_of(self, now: float) -> int:
+        return int(now) // self._ONE_DAY
+
+    def _roll_windows(self, now: float) -> None:
+        if self._window_of(now) != self._state.window:
+            self._state.window = self._window_of(now)
+            self._state.fifteen_min_used = 0
+        if self._day_of(now) != self._state.day:
+            self._state.day = self._day_of(now)
+            self._state.daily_used = 0
+
+    def _refill(self, now: float) -> None:
+        state = self._state
+        if state.fifteen_min_limit is None:
+            return
+
+        capacity = float(state.fifteen_min_limit)
+        rate = capacity / self._FIFTEEN_MINUTES
+        tokens = capacity if state.tokens is None else state.tokens
+        state.tokens = min(capacity, tokens + max(0.0, now - state.last_refill) * rate)
+        state.last_refill = now
+
+    def _is_budget_used_up(self) -> bool:
+        state = self._state
+        return (
+            state.rate_limited_window == state.window
+            or (state.fifteen_min_limit is not None and state.fifteen_min_used >= state.fifteen_min_limit)
+            or (state.daily_limit is not None and state.daily_used >= state.daily_limit)
+        )
+
+    def _seconds_until_window_end(self, now: float) -> float:
+        return self._FIFTEEN_MINUTES - (now % self._FIFTEEN_MINUTES)
+
+    def _seconds_until_allowed(self, now: float) -> float:
+        state = self._state
+
+        if state.daily_limit is not None and state.daily_used >= state.daily_limit:
+            if not self._wait_for_daily_reset:
+                raise StravaRateLimitError(f'Daily rate limit reached ({state.daily_used}/{state.daily_limit}).')
+            wait = self._ONE_DAY - (now % self._ONE_DAY)
+            logger.warning('Daily rate limit reached (%d/%d). Waiting %ds until the next UTC day.', state.daily_used, state.daily_limit, wait)
+            return wait
+
+        if state.rate_limited_window == state.window:
+            wait = self._seconds_until_window_end(now)
+            logger.warning('Strava answered 429 in this window. Waiting %ds until next window.', wait)
+            return wait
+
+        if state.fifteen_min_limit is None:
+            return 0.0
+
+        if state.fifteen_min_used >= state.fifteen_min_limit:
+            wait = self._seconds_until_window_end(now)
+            logger.warning('15-minute rate limit reached (%d/%d). Waiting %ds until next window.', state.fifteen_min_used, state.fifteen_min_limit, wait)
+            return wait
+
+        if state.tokens is not None and state.tokens < 1 - self._TOKEN_TOLERANCE:
+            return (1 - state.tokens) * self._FIFTEEN_MINUTES / state.fifteen_min_limit
+
+        return 0.0
+
+    def is_daily_limit_reached(self) -> bool:
+        with self._lock:
+            return self._state.daily_limit is not None and self._state.daily_used >= self._state.daily_limit
+
+    def acquire(self) -> None:
+        # The lock is held while sleeping on purpose - no other worker may send a request before this one is scheduled
+        with self._lock:
+            while True:
+                now = time.time()
+                self._roll_windows(now)
+                self._refill(now)
+                wait = self._seconds_until_allowed(now)
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+
+            if self._state.tokens is not None:
+                self._state.tokens -= 1
+            self._state.fifteen_min_used += 1
+            self._state.daily_used += 1
+            self._save_state(now)
+
+    def on_rate_limited(self) -> None:
+        """
+        Record a 429 response: no further request is sent in the current 15-minute window.
+
+        Strava can answer 429 while the reported usage shows budget left, e.g. for its separate read limit or when another
+        application spent the budget in between, so the reported usage alone would retry right away.
+        """
+        with self._lock:
+            now = time.time()
+            self._roll_windows(now)
+            self._state.rate_limited_window = self._state.window
+            self._save_state(now)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        usage = headers.get('X-RateLimit-Usage')
+        limits = headers.get('X-RateLimit-Limit')
+        if not usage or not limits:
+            return
+
+        fifteen_min_used, daily_used = (int(x) for x in usage.split(','))
+        fifteen_min_limit, daily_limit = (int(x) for x in limits.split(','))
+
+        with self._lock:
+            now = time.time()
+            self._roll_windows(now)
+            # Responses of concurrent requests arrive out of order, so never let an older report lower the local count
+            self._state.fifteen_min_used = max(self._state.fifteen_min_used, fifteen_min_used)
+            self._state.daily_used = max(self._state.daily_used, daily_used)
+            self._state.fifteen_min_limit = fifteen_min_limit
+            self._state.daily_limit = daily_limit
+            self._refill(now)
+            self._save_state(now)
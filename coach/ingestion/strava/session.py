@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Any
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass(frozen=True, slots=True)
+class HttpSessionSettings:
+    # The pool must hold at least as many connections as there are concurrent detail-fetching workers
+    pool_connections: int = 2
+    pool_maxsize: int = 8
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    timeout_seconds: float = 10.0
+
+
+class StravaSession(requests.Session):
+    """
+    Shared keep-alive session for all Strava API and OAuth requests.
+
+    Connection pooling, transport-level retries of transient server errors and the default timeout are all configured here.
+    Rate limiting (HTTP 429) is deliberately not retried at this level - it is handled by the client's rate limiter.
+    """
+
+    def __init__(self, settings: Optional[HttpSessionSettings] = None) -> None:
+        super().__init__()
+        settings = settings or HttpSessionSettings()
+        self._timeout_seconds = settings.timeout_seconds
+
+        retry = Retry(
+            total=settings.max_retries,
+            backoff_factor=settings.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=settings.pool_connections, pool_maxsize=settings.pool_maxsize, max_retries=retry)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method: str | bytes, url: str | bytes, *args: Any, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault('timeout', self._timeout_seconds)
+        return super().request(method, url, *args, **kwargs)
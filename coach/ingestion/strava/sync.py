@@ -0,0 +1,117 @@
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from typing import Optional
+
+from more_itertools import chunked
+
+from coach.domain.activity import Activity
+from coach.domain.activity import ActivitySource
+from coach.domain.sync import SyncState
+from coach.ingestion.pipeline import DEFAULT_BATCH_SIZE
+from coach.ingestion.pipeline import save_in_batches
+from coach.ingestion.strava.client import StravaClient
+from coach.ingestion.strava.mapper import StravaMapper
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.persistence.sqlite.repositories import SQLiteSyncStateRepository
+from coach.persistence.sqlite.repositories import UpsertResult
+
+
+class StravaSync:
+    """
+    Checkpointed Strava sync.
+
+    Progress is recorded in the sync state table after every page and every saved batch: the `after` cursor the run uses,
+    the last fully saved page and the detail IDs of the current page that are still pending. A resumed run finishes the
+    pending IDs and continues with the next page. Detail payloads are only downloaded for activities not stored yet.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: StravaClient,
+        mapper: StravaMapper,
+        activity_repo: SQLiteActivityRepository,
+        sync_state_repo: SQLiteSyncStateRepository,
+        per_page: int = 50,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self._client = client
+        self._mapper = mapper
+        self._activity_repo = activity_repo
+        self._sync_state_repo = sync_state_repo
+        self._per_page = per_page
+        self._batch_size = batch_size
+        self._state = SyncState(source=ActivitySource.STRAVA, after=0)
+
+    def unfinished_state(self) -> Optional[SyncState]:
+        previous_state = self._sync_state_repo.get(ActivitySource.STRAVA)
+        return previous_state if previous_state is not None and not previous_state.is_completed else None
+
+    def initial_state(self, *, resume: bool = False) -> SyncState:
+        unfinished_state = self.unfinished_state()
+
+        if unfinished_state is not None and resume:
+            return unfinished_state
+        if unfinished_state is not None:
+            # The cursor of an interrupted run is a safe starting point, the latest stored activity may lie past skipped ones
+            return SyncState(source=ActivitySource.STRAVA, after=unfinished_state.after)
+        return SyncState(source=ActivitySource.STRAVA, after=self._activity_repo.last_activity_timestamp() or 0)
+
+    def run(self, *, resume: bool = False) -> Iterator[list[Activity]]:
+        """Sync new activities and yield each batch once it is saved."""
+        self._set_state(self.initial_state(resume=resume))
+
+        if self._state.pending_activity_ids:
+            # Pending IDs of a resumed run belong to the page after the last completed one
+            yield from self._sync_activity_ids(self._state.pending_activity_ids)
+            self._set_state(replace(self._state, last_completed_page=self._state.last_completed_page + 1))
+
+        page = self._state.last_completed_page + 1
+        while True:
+            summaries = self._client.list_activity_summaries(page=page, per_page=self._per_page, after=self._state.after)
+            if not summaries:
+                break
+
+            self._set_state(replace(self._state, pending_activity_ids=tuple(summary['id'] for summary in summaries)))
+            yield from self._sync_activity_ids(self._state.pending_activity_ids)
+            self._set_state(replace(self._state, last_completed_page=page))
+            page += 1
+
+        self._set_state(replace(self._state, is_completed=True))
+
+    def refresh(self, *, window: timedelta, now: Optional[datetime] = None) -> Iterator[UpsertResult]:
+        """
+        Re-fetch the detailed payloads of all activities that started within the window and rewrite the ones that changed.
+
+        Edits made on Strava after upload (notes, race flags, ...) are invisible to the `after` cursor of a regular sync.
+        Details go through the same client, so they share its concurrency, rate limiter and ETag revalidation.
+        The sync state is left untouched: a refresh is idempotent and can simply be rerun.
+        """
+        after = int(((now or datetime.now(tz=UTC)) - window).timestamp())
+
+        page = 1
+        while summaries := self._client.list_activity_summaries(page=page, per_page=self._per_page, after=after):
+            payloads = self._client.get_detailed_activities(summary['id'] for summary in summaries)
+            for batch in chunked(self._mapper.iter_activities(payloads), self._batch_size):
+                yield self._activity_repo.upsert_many(batch)
+            page += 1
+
+    def _sync_activity_ids(self, activity_ids: Sequence[int]) -> Iterator[list[Activity]]:
+        missing_activity_ids = self._activity_repo.missing_source_activity_ids(ActivitySource.STRAVA.value, activity_ids)
+        payloads = self._client.get_detailed_activities(missing_activity_ids)
+
+        for batch in save_in_batches(self._mapper.iter_activities(payloads), self._activity_repo, batch_size=self._batch_size):
+            saved_activity_ids = {activity.source_activity_id for activity in batch}
+            pending_activity_ids = tuple(activity_id for activity_id in self._state.pending_activity_ids if activity_id not in saved_activity_ids)
+            self._set_state(replace(self._state, pending_activity_ids=pending_activity_ids))
+            yield batch
+
+        self._set_state(replace(self._state, pending_activity_ids=()))
+
+    def _set_state(self, state: SyncState) -> None:
+        self._state = state
+        self._sync_state_repo.save(state)
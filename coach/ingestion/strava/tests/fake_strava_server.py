@@ -0,0 +1,156 @@
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Optional
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from coach.ingestion.strava.auth import StravaAuth
+
+
+class FakeStravaAuth(StravaAuth):
+    def __init__(self) -> None:
+        # No settings or token refresh needed, the fake server accepts any token
+        pass
+
+    def get_access_token(self) -> str:
+        return 'fake-token'
+
+
+class FakeStravaState:
+    def __init__(self, *, num_activities: int, detail_delay_seconds: float = 0.0, fifteen_min_limit: int = 100, daily_limit: int = 1_000) -> None:
+        self.num_activities = num_activities
+        self.detail_delay_seconds = detail_delay_seconds
+        self.fifteen_min_limit = fifteen_min_limit
+        self.daily_limit = daily_limit
+
+        self.lock = threading.Lock()
+        self.num_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.client_addresses: set[tuple[str, int]] = set()
+        self.paths: list[str] = []
+        self.statuses: list[int] = []
+        self.detail_overrides: dict[int, dict[str, Any]] = {}
+
+    def summaries(self, *, page: int, per_page: int, after: int = 0) -> list[dict[str, Any]]:
+        activity_ids = [activity_id for activity_id in range(1, self.num_activities + 1) if self.start_timestamp(activity_id) > after]
+        return [{'id': activity_id} for activity_id in activity_ids[(page - 1) * per_page:page * per_page]]
+
+    def start_timestamp(self, activity_id: int) -> int:
+        return int(datetime.fromisoformat(self.detail(activity_id)['start_date']).timestamp())
+
+    def detail(self, activity_id: int) -> dict[str, Any]:
+        return {
+            'id': activity_id,
+            'name': f'Activity {activity_id}',
+            'sport_type': 'Run',
+            'start_date': f'2025-01-01T{activity_id % 24:02d}:00:00Z',
+            'elapsed_time': 3_600,
+            'moving_time': 3_500,
+            'distance': 10_000.0,
+        } | self.detail_overrides.get(activity_id, {})
+
+    def edit(self, activity_id: int, **changes: Any) -> None:
+        self.detail_overrides[activity_id] = self.detail_overrides.get(activity_id, {}) | changes
+
+    def requested_detail_ids(self) -> list[int]:
+        return [int(path.rsplit('/', 1)[1]) for path in self.paths if path.startswith('/activities/')]
+
+    def requested_summary_pages(self) -> list[int]:
+        return [int(parse_qs(urlparse(path).query)['page'][0]) for path in self.paths if path.startswith('/athlete/activities')]
+
+
+class _FakeStravaHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests, like the real API
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, Nagle's algorithm would delay the body on a kept-alive connection
+    disable_nagle_algorithm = True
+    server: '_FakeStravaServer'
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature defined by BaseHTTPRequestHandler
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802 - name defined by BaseHTTPRequestHandler
+        state = self.server.state
+        with state.lock:
+            state.num_requests += 1
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            state.client_addresses.add(self.client_address)
+            state.paths.append(self.path)
+            num_requests = state.num_requests
+
+        try:
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+
+            if num_requests > state.fifteen_min_limit:
+                self._respond(429, {'message': 'Rate Limit Exceeded'}, num_requests)
+            elif url.path == '/athlete/activities':
+                self._respond(200, state.summaries(page=int(query['page'][0]), per_page=int(query['per_page'][0]), after=int(query.get('after', ['0'])[0])), num_requests)
+            elif url.path.startswith('/activities/'):
+                activity_id = int(url.path.rsplit('/', 1)[1])
+                # Later activities answer faster, so completion order differs from request order
+                time.sleep(state.detail_delay_seconds / activity_id)
+                self._respond_with_etag(state.detail(activity_id), num_requests)
+            elif url.path == '/athlete':
+                self._respond_with_etag({'id': 42}, num_requests)
+            elif url.path == '/athletes/42/stats':
+                self._respond_with_etag({'all_run_totals': {'count': state.num_activities}}, num_requests)
+            else:
+                self._respond(404, {'message': 'Not Found'}, num_requests)
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+    def _respond_with_etag(self, payload: Any, num_requests: int) -> None:
+        etag = f'"{hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._respond(304, None, num_requests, etag=etag)
+        else:
+            self._respond(200, payload, num_requests, etag=etag)
+
+    def _respond(self, status: int, payload: Any, num_requests: int, *, etag: Optional[str] = None) -> None:
+        body = b'' if status == 304 else json.dumps(payload).encode()
+        state = self.server.state
+        with state.lock:
+            state.statuses.append(status)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-RateLimit-Usage', f'{num_requests},{num_requests}')
+        self.send_header('X-RateLimit-Limit', f'{state.fifteen_min_limit},{state.daily_limit}')
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _FakeStravaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, state: FakeStravaState) -> None:
+        super().__init__(('127.0.0.1', 0), _FakeStravaHandler)
+        self.state = state
+
+
+@contextmanager
+def run_fake_strava_server(state: FakeStravaState) -> Generator[str]:
+    """Serve a minimal Strava API on localhost and yield its base URL."""
+    server = _FakeStravaServer(state)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
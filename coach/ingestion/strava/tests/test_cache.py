@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from coach.ingestion.strava.cache import HttpResponseCache
+
+
+class TestHttpResponseCache:
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        cache = HttpResponseCache(tmp_path)
+        key = cache.key('https://strava/athlete', {'page': 1})
+        cache.put(key, url='https://strava/athlete', payload={'id': 42}, etag='"abc"')
+
+        cached = cache.get(key)
+
+        assert cached is not None
+        assert cached.payload == {'id': 42}
+        assert cached.conditional_headers() == {'If-None-Match': '"abc"'}
+
+    def test_key_depends_on_params(self) -> None:
+        assert HttpResponseCache.key('https://strava/a', {'page': 1, 'per_page': 2}) == HttpResponseCache.key('https://strava/a', {'per_page': 2, 'page': 1})
+        assert HttpResponseCache.key('https://strava/a', {'page': 1}) != HttpResponseCache.key('https://strava/a', {'page': 2})
+
+    def test_expired_entries_are_evicted(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 1_000_000.0
+        monkeypatch.setattr('coach.ingestion.strava.cache.time.time', lambda: now)
+        cache = HttpResponseCache(tmp_path, ttl_seconds=60)
+        cache.put('fresh', url='https://strava/fresh', payload=1)
+        now += 30
+        cache.put('newer', url='https://strava/newer', payload=2)
+        now += 45
+
+        assert cache.get('fresh') is None
+        assert cache.get('newer') is not None
+
+        now += 60
+        assert cache.evict_expired() == 1
+        assert list(tmp_path.iterdir()) == []
+
+    def test_eviction_uses_file_age_without_parsing_entries(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 1_000_000.0
+        monkeypatch.setattr('coach.ingestion.strava.cache.time.time', lambda: now)
+        (tmp_path / 'unreadable.json').write_text('not json', encoding='utf-8')
+        os.utime(tmp_path / 'unreadable.json', (now - 120, now - 120))
+        cache = HttpResponseCache(tmp_path, ttl_seconds=60)
+        cache.put('stale', url='https://strava/stale', payload=0)
+        now += 61
+        cache.put('fresh', url='https://strava/fresh', payload=1)
+
+        assert (tmp_path / 'fresh.json').stat().st_mtime == now
+        assert cache.evict_expired() == 1
+        assert [path.name for path in tmp_path.iterdir()] == ['fresh.json']
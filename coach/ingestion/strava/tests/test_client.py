@@ -0,0 +1,254 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from coach.ingestion.strava.cache import HttpResponseCache
+from coach.ingestion.strava.client import StravaClient
+from coach.ingestion.strava.rate_limit import StravaRateLimiter
+from coach.ingestion.strava.rate_limit import StravaRateLimitError
+from coach.ingestion.strava.session import HttpSessionSettings
+from coach.ingestion.strava.session import StravaSession
+from coach.ingestion.strava.tests.fake_strava_server import FakeStravaAuth
+from coach.ingestion.strava.tests.fake_strava_server import FakeStravaState
+from coach.ingestion.strava.tests.fake_strava_server import run_fake_strava_server
+
+
+def _response(status_code: int, payload: Any, *, usage: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update({'X-RateLimit-Usage': usage, 'X-RateLimit-Limit': '100,1000'})
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+class _ScriptedSession(requests.Session):
+    def __init__(self, responses: list[requests.Response]) -> None:
+        super().__init__()
+        self._responses = responses
+        self.num_requests = 0
+
+    def get(self, url: str | bytes, **kwargs: Any) -> requests.Response:
+        self.num_requests += 1
+        return self._responses.pop(0)
+
+
+class TestStravaClient:
+    def test_list_activities_summaries(self) -> None:
+        state = FakeStravaState(num_activities=5)
+        with run_fake_strava_server(state) as base_url:
+            client = StravaClient(auth=FakeStravaAuth(), base_url=base_url)
+            activities = list(client.list_activities(detailed=False, per_page=2))
+
+        assert [activity['id'] for activity in activities] == [1, 2, 3, 4, 5]
+
+    def test_list_activities_detailed_is_concurrent_and_ordered(self) -> None:
+        state = FakeStravaState(num_activities=12, detail_delay_seconds=0.2)
+        with run_fake_strava_server(state) as base_url:
+            client = StravaClient(auth=FakeStravaAuth(), base_url=base_url, max_workers=4)
+            activities = list(client.list_activities(detailed=True, per_page=6))
+
+        assert [activity['id'] for activity in activities] == list(range(1, 13))
+        assert activities[0]['name'] == 'Activity 1'
+        assert 1 < state.max_in_flight <= 4
+
+    def test_daily_limit_stops_sync(self) -> None:
+        state = FakeStravaState(num_activities=10, fifteen_min_limit=1_000, daily_limit=3)
+        with run_fake_strava_server(state) as base_url:
+            client = StravaClient(auth=FakeStravaAuth(), base_url=base_url, max_workers=2, rate_limiter=StravaRateLimiter())
+            with pytest.raises(StravaRateLimitError, match='Daily rate limit reached'):
+                list(client.list_activities(detailed=True, per_page=10))
+
+        assert state.num_requests == 3
+
+    def test_rate_limited_response_with_budget_left_is_retried_in_next_window(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 1_000 * 15 * 60 + 10.0
+        sleeps: list[float] = []
+
+        def fake_sleep(seconds: float) -> None:
+            nonlocal now
+            sleeps.append(seconds)
+            now += seconds
+
+        monkeypatch.setattr('coach.ingestion.strava.rate_limit.time.time', lambda: now)
+        monkeypatch.setattr('coach.ingestion.strava.rate_limit.time.sleep', fake_sleep)
+        # The 429 reports budget left, e.g. a read limit or another application, the usage headers alone would retry immediately
+        session = _ScriptedSession([_response(429, {'message': 'Rate Limit Exceeded'}, usage='1,1'), _response(200, {'id': 42}, usage='2,2')])
+        client = StravaClient(auth=FakeStravaAuth(), base_url='http://strava.test', session=session, rate_limiter=StravaRateLimiter())
+
+        assert client.get_athlete() == {'id': 42}
+        assert sleeps == [15 * 60 - 10]
+        assert session.num_requests == 2
+
+
+class TestStravaRateLimiter:
+    def setup_method(self) -> None:
+        self._now = 1_000 * 15 * 60 + 10.0
+        self._sleeps: list[float] = []
+
+    @pytest.fixture(autouse=True)
+    def _fake_clock(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def fake_sleep(seconds: float) -> None:
+            self._sleeps.append(seconds)
+            self._now += seconds
+
+        monkeypatch.setattr('coach.ingestion.strava.rate_limit.time.time', lambda: self._now)
+        monkeypatch.setattr('coach.ingestion.strava.rate_limit.time.sleep', fake_sleep)
+
+    def test_no_pacing_before_limits_are_known(self) -> None:
+        rate_limiter = StravaRateLimiter()
+        for _ in range(10):
+            rate_limiter.acquire()
+
+        assert self._sleeps == []
+
+    def test_bursts_up_to_window_budget_then_paces(self) -> None:
+        rate_limiter = StravaRateLimiter()
+        rate_limiter.update({'X-RateLimit-Usage': '0,0', 'X-RateLimit-Limit': '100,1000'})
+        for _ in range(100):
+            rate_limiter.acquire()
+
+        assert self._sleeps == []
+
+        # The fixed window is used up, the next window starts with the tokens refilled over the wait, not with a full bucket
+        for _ in range(98):
+            rate_limiter.acquire()
+
+        assert self._sleeps == [15 * 60 - 10]
+
+        rate_limiter.acquire()
+
+        assert self._sleeps[1] == pytest.approx(1.0)
+
+    def test_waits_for_next_window_when_server_reports_budget_used(self) -> None:
+        rate_limiter = StravaRateLimiter()
+        rate_limiter.update({'X-RateLimit-Usage': '100,100', 'X-RateLimit-Limit': '100,1000'})
+        rate_limiter.acquire()
+
+        assert self._sleeps == [15 * 60 - 10]
+
+    def test_daily_limit_waits_for_next_day_or_raises(self) -> None:
+        headers = {'X-RateLimit-Usage': '10,1000', 'X-RateLimit-Limit': '100,1000'}
+
+        failing_rate_limiter = StravaRateLimiter()
+        failing_rate_limiter.update(headers)
+        with pytest.raises(StravaRateLimitError, match='Daily rate limit reached'):
+            failing_rate_limiter.acquire()
+
+        waiting_rate_limiter = StravaRateLimiter(wait_for_daily_reset=True)
+        waiting_rate_limiter.update(headers)
+        seconds_until_next_day = 24 * 60 * 60 - self._now % (24 * 60 * 60)
+        waiting_rate_limiter.acquire()
+
+        assert self._sleeps == [seconds_until_next_day]
+        assert not waiting_rate_limiter.is_daily_limit_reached()
+
+    def test_older_usage_reports_do_not_lower_count(self) -> None:
+        rate_limiter = StravaRateLimiter()
+        rate_limiter.update({'X-RateLimit-Usage': '10,10', 'X-RateLimit-Limit': '10,1000'})
+        rate_limiter.update({'X-RateLimit-Usage': '5,5', 'X-RateLimit-Limit': '10,1000'})
+        rate_limiter.acquire()
+
+        assert self._sleeps == [15 * 60 - 10]
+
+    def test_rate_limited_response_waits_for_next_window_despite_reported_budget(self) -> None:
+        rate_limiter = StravaRateLimiter()
+        rate_limiter.update({'X-RateLimit-Usage': '1,1', 'X-RateLimit-Limit': '100,1000'})
+        rate_limiter.on_rate_limited()
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+
+        assert self._sleeps == [15 * 60 - 10]
+
+    def test_state_is_saved_periodically_and_when_budget_is_used_up(self, tmp_path: Path) -> None:
+        state_path = tmp_path / 'rate_limit.json'
+        rate_limiter = StravaRateLimiter(state_path=state_path)
+        rate_limiter.acquire()
+        state_path.unlink()
+
+        rate_limiter.acquire()
+        assert not state_path.exists()
+
+        self._now += 5
+        rate_limiter.acquire()
+        assert state_path.exists()
+
+        state_path.unlink()
+        rate_limiter.on_rate_limited()
+        assert state_path.exists()
+
+    def test_state_is_persisted(self, tmp_path: Path) -> None:
+        state_path = tmp_path / 'rate_limit.json'
+        rate_limiter = StravaRateLimiter(state_path=state_path)
+        rate_limiter.update({'X-RateLimit-Usage': '99,500', 'X-RateLimit-Limit': '100,1000'})
+        rate_limiter.acquire()
+
+        restarted_rate_limiter = StravaRateLimiter(state_path=state_path)
+        restarted_rate_limiter.acquire()
+
+        assert self._sleeps == [15 * 60 - 10]
+
+
+class TestStravaSession:
+    def test_connections_are_reused(self) -> None:
+        state = FakeStravaState(num_activities=0)
+        with run_fake_strava_server(state) as base_url:
+            session = StravaSession()
+            for _ in range(5):
+                session.get(f'{base_url}/athlete').raise_for_status()
+
+        assert state.num_requests == 5
+        assert len(state.client_addresses) == 1
+
+    def test_default_timeout_is_applied(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        session = StravaSession(HttpSessionSettings(timeout_seconds=2.5))
+        sent_kwargs: dict[str, Any] = {}
+
+        def fake_send(request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+            sent_kwargs.update(kwargs)
+            response = requests.Response()
+            response.status_code = 200
+            return response
+
+        monkeypatch.setattr(session, 'send', fake_send)
+        session.get('http://127.0.0.1/athlete')
+
+        assert sent_kwargs['timeout'] == 2.5
+
+
+class TestStravaClientCache:
+    def test_unchanged_activity_is_revalidated_not_downloaded(self, tmp_path: Path) -> None:
+        state = FakeStravaState(num_activities=1)
+        with run_fake_strava_server(state) as base_url:
+            client = StravaClient(auth=FakeStravaAuth(), base_url=base_url, cache=HttpResponseCache(tmp_path))
+            first = client.get_detailed_activity(1)
+            second = client.get_detailed_activity(1)
+            state.edit(1, private_note='$Easy run$')
+            edited = client.get_detailed_activity(1)
+
+        assert first == second
+        assert edited['private_note'] == '$Easy run$'
+        assert state.statuses == [200, 304, 200]
+
+    def test_athlete_is_cached_and_id_memoized(self, tmp_path: Path) -> None:
+        state = FakeStravaState(num_activities=3)
+        with run_fake_strava_server(state) as base_url:
+            client = StravaClient(auth=FakeStravaAuth(), base_url=base_url, cache=HttpResponseCache(tmp_path))
+            client.get_athlete_stats()
+            client.get_athlete_stats()
+            restarted_client = StravaClient(auth=FakeStravaAuth(), base_url=base_url, cache=HttpResponseCache(tmp_path))
+            assert restarted_client.get_athlete_id() == 42
+
+        assert state.paths == ['/athlete', '/athletes/42/stats', '/athletes/42/stats']
+        assert state.statuses == [200, 200, 304]
+
+    def test_no_cache_without_cache_directory(self) -> None:
+        state = FakeStravaState(num_activities=1)
+        with run_fake_strava_server(state) as base_url:
+            client = StravaClient(auth=FakeStravaAuth(), base_url=base_url)
+            client.get_detailed_activity(1)
+            client.get_detailed_activity(1)
+
+        assert state.statuses == [200, 200]
@@ -1,5 +1,7 @@
+from collections.abc import Iterator
 from datetime import UTC
 from datetime import datetime
+from typing import Any
 
 from coach.domain.activity import SportType
 from coach.ingestion.strava.mapper import StravaMapper
@@ -29,3 +31,12 @@ class TestStravaMapper:
         assert activity.start_time_utc == datetime(2024, 1, 1, 7, 0, 0, tzinfo=UTC)
         assert activity.distance_meters == 10_000.0
         assert activity.is_race is False
+
+    def test_iter_activities_is_lazy(self) -> None:
+        def payloads() -> Iterator[dict[str, Any]]:
+            yield {'id': 1, 'sport_type': 'Run', 'start_date': '2024-01-01T07:00:00Z', 'elapsed_time': 60}
+            raise AssertionError('Only the first payload should be consumed')
+
+        activities = self._mapper.iter_activities(payloads())
+
+        assert next(activities).source_activity_id == 1
@@ -0,0 +1,100 @@
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from coach.domain.activity import ActivitySource
+from coach.ingestion.strava.client import StravaClient
+from coach.ingestion.strava.mapper import StravaMapper
+from coach.ingestion.strava.sync import StravaSync
+from coach.ingestion.strava.tests.fake_strava_server import FakeStravaAuth
+from coach.ingestion.strava.tests.fake_strava_server import FakeStravaState
+from coach.ingestion.strava.tests.fake_strava_server import run_fake_strava_server
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.persistence.sqlite.repositories import SQLiteSyncStateRepository
+
+
+class TestStravaSync:
+    def setup_method(self) -> None:
+        db = Database(':memory:')
+        self._activity_repo = SQLiteActivityRepository(db)
+        self._sync_state_repo = SQLiteSyncStateRepository(db)
+
+    def _create_sync(self, base_url: str) -> StravaSync:
+        return StravaSync(
+            client=StravaClient(auth=FakeStravaAuth(), base_url=base_url, max_workers=2),
+            mapper=StravaMapper(),
+            activity_repo=self._activity_repo,
+            sync_state_repo=self._sync_state_repo,
+            per_page=4,
+            batch_size=2,
+        )
+
+    def _interrupt_after_first_batch(self, state: FakeStravaState) -> None:
+        with run_fake_strava_server(state) as base_url:
+            for _ in self._create_sync(base_url).run():
+                break
+
+    def test_full_sync(self) -> None:
+        state = FakeStravaState(num_activities=10)
+        with run_fake_strava_server(state) as base_url:
+            batches = list(self._create_sync(base_url).run())
+
+        assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+        assert self._activity_repo.count() == 10
+        sync_state = self._sync_state_repo.get(ActivitySource.STRAVA)
+        assert sync_state is not None
+        assert sync_state.is_completed
+        assert sync_state.last_completed_page == 3
+        assert sync_state.pending_activity_ids == ()
+
+    def test_interrupted_sync_records_checkpoint(self) -> None:
+        self._interrupt_after_first_batch(FakeStravaState(num_activities=10))
+
+        sync_state = self._sync_state_repo.get(ActivitySource.STRAVA)
+        assert sync_state is not None
+        assert not sync_state.is_completed
+        assert sync_state.last_completed_page == 0
+        assert sync_state.pending_activity_ids == (3, 4)
+
+    def test_resume_continues_where_interrupted_run_stopped(self) -> None:
+        self._interrupt_after_first_batch(FakeStravaState(num_activities=10))
+
+        resumed_state = FakeStravaState(num_activities=10)
+        with run_fake_strava_server(resumed_state) as base_url:
+            list(self._create_sync(base_url).run(resume=True))
+
+        assert self._activity_repo.count() == 10
+        assert resumed_state.requested_summary_pages() == [2, 3, 4]
+        assert sorted(resumed_state.requested_detail_ids()) == [3, 4, 5, 6, 7, 8, 9, 10]
+
+    def test_regular_sync_after_interruption_skips_stored_activities(self) -> None:
+        self._interrupt_after_first_batch(FakeStravaState(num_activities=10))
+
+        restarted_state = FakeStravaState(num_activities=10)
+        with run_fake_strava_server(restarted_state) as base_url:
+            list(self._create_sync(base_url).run())
+
+        assert self._activity_repo.count() == 10
+        assert restarted_state.requested_summary_pages() == [1, 2, 3, 4]
+        assert sorted(restarted_state.requested_detail_ids()) == [3, 4, 5, 6, 7, 8, 9, 10]
+
+    def test_refresh_updates_only_edited_activities_within_window(self) -> None:
+        state = FakeStravaState(num_activities=10)
+        with run_fake_strava_server(state) as base_url:
+            list(self._create_sync(base_url).run())
+
+        state.edit(9, name='Race day', private_note='$Felt strong$', workout_type=1)
+        state.edit(3, name='Outside the window')
+        now = datetime(2025, 1, 1, 12, tzinfo=UTC)
+        with run_fake_strava_server(state) as base_url:
+            state.paths.clear()
+            results = list(self._create_sync(base_url).refresh(window=timedelta(hours=7), now=now))
+
+        assert sum(result.num_updated for result in results) == 1
+        assert sum(result.num_unchanged for result in results) == 4
+        assert sorted(state.requested_detail_ids()) == [6, 7, 8, 9, 10]
+        activities_by_id = {activity.activity_id: activity for activity in self._activity_repo.list_all()}
+        assert activities_by_id[9].name == 'Race day'
+        assert activities_by_id[9].notes == '$Felt strong$'
+        assert activities_by_id[3].name == 'Activity 3'
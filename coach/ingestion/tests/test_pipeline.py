@@ -0,0 +1,37 @@
+from collections.abc import Iterator
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from coach.domain.activity import Activity
+from coach.ingestion.pipeline import save_in_batches
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+def _stream_activities(num_activities: int, *, fail_after: int | None = None) -> Iterator[Activity]:
+    for i in range(1, num_activities + 1):
+        if i == fail_after:
+            raise ConnectionError('Stream interrupted')
+        yield replace(SAMPLE_RUN, activity_id=i, source_activity_id=i, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(days=i))
+
+
+class TestSaveInBatches:
+    def setup_method(self) -> None:
+        self._repo = SQLiteActivityRepository(Database(':memory:'))
+
+    def test_saves_all_activities_in_bounded_batches(self) -> None:
+        batch_sizes = [len(batch) for batch in save_in_batches(_stream_activities(7), self._repo, batch_size=3)]
+
+        assert batch_sizes == [3, 3, 1]
+        assert self._repo.count() == 7
+
+    def test_committed_batches_survive_interruption(self) -> None:
+        with pytest.raises(ConnectionError):
+            for _ in save_in_batches(_stream_activities(10, fail_after=6), self._repo, batch_size=2):
+                pass
+
+        assert self._repo.count() == 4
+        assert [activity.activity_id for activity in self._repo.list_all()] == [1, 2, 3, 4]
@@ -1,89 +1,149 @@
+import hashlib
 import json
-from dataclasses import asdict
-from datetime import date
+from collections.abc import Sequence
 from datetime import datetime
-from enum import Enum
 from typing import Any
+from typing import Optional
 
 from coach.domain.activity import Activity
 from coach.domain.activity import ActivitySource
 from coach.domain.activity import BestEffort
 from coach.domain.activity import SportType
 
+# Column order of the activities table, shared by the row encoder and decoder
+ACTIVITY_COLUMNS: tuple[str, ...] = (
+    'activity_id',
+    'source',
+    'source_activity_id',
 
-def _bools_to_ints(values: dict[str, Any]) -> dict[str, Any]:
-    values_copy = values.copy()
-    for key, value in values_copy.items():
-        if isinstance(value, bool):
-            values_copy[key] = int(value)
-    return values_copy
+    'sport_type',
+    'name',
+    'description',
+    'notes',
 
+    'start_time_utc',
+    'elapsed_time_seconds',
+    'moving_time_seconds',
 
-def _dates_to_isostrings(values: dict[str, Any]) -> dict[str, Any]:
-    values_copy = values.copy()
-    for key, value in values_copy.items():
-        if isinstance(value, date):
-            values_copy[key] = value.isoformat()
-    return values_copy
+    'distance_meters',
+    'elevation_gain_meters',
 
+    'average_heart_rate',
+    'max_heart_rate',
+    'average_power_watts',
 
-def _enums_to_values(values: dict[str, Any]) -> dict[str, Any]:
-    values_copy = values.copy()
-    for key, value in values_copy.items():
-        if isinstance(value, Enum):
-            values_copy[key] = value.value
-    return values_copy
+    'is_manual',
+    'is_race',
 
+    'pbs',
+)
 
-def _lists_to_json(values: dict[str, Any]) -> dict[str, Any]:
-    values_copy = values.copy()
-    for key, value in values_copy.items():
-        if isinstance(value, list):
-            values_copy[key] = json.dumps(value)
-    return values_copy
+BEST_EFFORT_COLUMNS: tuple[str, ...] = ('activity_id', 'name', 'moving_time_seconds')
 
+type ActivityRow = tuple[
+    int, str, int,
+    str, Optional[str], Optional[str], Optional[str],
+    str, int, Optional[int],
+    Optional[float], Optional[float],
+    Optional[float], Optional[float], Optional[float],
+    int, int,
+    str,
+]
 
-def serialize_activity(activity: Activity) -> dict[str, Any]:
-    serialized = asdict(activity)
-    serialized = _bools_to_ints(serialized)
-    serialized = _dates_to_isostrings(serialized)
-    serialized = _enums_to_values(serialized)
-    serialized = _lists_to_json(serialized)
-    return serialized
+_EMPTY_PBS_JSON = '[]'
+_SOURCES_BY_VALUE = {source.value: source for source in ActivitySource}
+_SPORT_TYPES_BY_VALUE = {sport_type.value: sport_type for sport_type in SportType}
 
 
-def deserialize_activity(serialized: dict[str, Any]) -> Activity:
-    pbs: list[BestEffort] = []
-    for pb_json in json.loads(serialized['pbs']):
-        pb = BestEffort(
-            name=pb_json['name'],
-            moving_time_seconds=pb_json['moving_time_seconds'],
-        )
-        pbs.append(pb)
+def _pbs_to_json(pbs: list[BestEffort]) -> str:
+    if not pbs:
+        return _EMPTY_PBS_JSON
+    return json.dumps([{'name': pb.name, 'moving_time_seconds': pb.moving_time_seconds} for pb in pbs])
+
+
+def _pbs_from_json(pbs_json: str) -> list[BestEffort]:
+    if pbs_json == _EMPTY_PBS_JSON:
+        return []
+    return [BestEffort(name=pb['name'], moving_time_seconds=pb['moving_time_seconds']) for pb in json.loads(pbs_json)]
+
+
+def activity_to_row(activity: Activity) -> ActivityRow:
+    """Encode an activity straight into a row of the activities table (in ACTIVITY_COLUMNS order)."""
+    return (
+        activity.activity_id,
+        activity.source.value,
+        activity.source_activity_id,
+
+        activity.sport_type.value,
+        activity.name,
+        activity.description,
+        activity.notes,
+
+        activity.start_time_utc.isoformat(),
+        activity.elapsed_time_seconds,
+        activity.moving_time_seconds,
+
+        activity.distance_meters,
+        activity.elevation_gain_meters,
+
+        activity.average_heart_rate,
+        activity.max_heart_rate,
+        activity.average_power_watts,
+
+        int(activity.is_manual),
+        int(activity.is_race),
+
+        _pbs_to_json(activity.pbs),
+    )
 
+
+def activity_row_content_hash(row: ActivityRow) -> str:
+    """Fingerprint of an encoded activity, used to detect whether a stored activity changed without comparing every column."""
+    return hashlib.blake2b(repr(row).encode(), digest_size=16).hexdigest()
+
+
+def activity_to_best_effort_rows(activity: Activity) -> list[tuple[int, str, int]]:
+    """Encode the PBs of an activity into rows of the best_efforts table (in BEST_EFFORT_COLUMNS order)."""
+    return [(activity.activity_id, pb.name, pb.moving_time_seconds) for pb in activity.pbs]
+
+
+def row_to_activity(row: Sequence[Any]) -> Activity:
+    """Decode a row of the activities table (in ACTIVITY_COLUMNS order) straight into an activity."""
     return Activity(
-        activity_id=serialized['activity_id'],
-        source=ActivitySource(serialized['source']),
-        source_activity_id=serialized['source_activity_id'],
+        activity_id=row[0],
+        source=_SOURCES_BY_VALUE[row[1]],
+        source_activity_id=row[2],
 
-        sport_type=SportType(serialized['sport_type']),
-        name=serialized['name'],
-        description=serialized['description'],
-        notes=serialized['notes'],
+        sport_type=_SPORT_TYPES_BY_VALUE[row[3]],
+        name=row[4],
+        description=row[5],
+        notes=row[6],
 
-        start_time_utc=datetime.fromisoformat(serialized['start_time_utc']),
-        elapsed_time_seconds=serialized['elapsed_time_seconds'],
-        moving_time_seconds=serialized['moving_time_seconds'],
+        start_time_utc=datetime.fromisoformat(row[7]),
+        elapsed_time_seconds=row[8],
+        moving_time_seconds=row[9],
 
-        distance_meters=serialized['distance_meters'],
-        elevation_gain_meters=serialized['elevation_gain_meters'],
+        distance_meters=row[10],
+        elevation_gain_meters=row[11],
 
-        average_heart_rate=serialized['average_heart_rate'],
-        max_heart_rate=serialized['max_heart_rate'],
-        average_power_watts=serialized['average_power_watts'],
+        average_heart_rate=row[12],
+        max_heart_rate=row[13],
+        average_power_watts=row[14],
 
-        is_manual=bool(serialized['is_manual']),
-        is_race=bool(serialized['is_race']),
+        is_manual=bool(row[15]),
+        is_race=bool(row[16]),
 
-        pbs=pbs,
+        pbs=_pbs_from_json(row[17]),
     )
+
+
+def serialize_activity(activity: Activity) -> dict[str, Any]:
+    return dict(zip(ACTIVITY_COLUMNS, activity_to_row(activity), strict=True))
+
+
+def serialize_best_efforts(activity: Activity) -> list[dict[str, Any]]:
+    return [dict(zip(BEST_EFFORT_COLUMNS, row, strict=True)) for row in activity_to_best_effort_rows(activity)]
+
+
+def deserialize_activity(serialized: dict[str, Any]) -> Activity:
+    return row_to_activity([serialized[column] for column in ACTIVITY_COLUMNS])
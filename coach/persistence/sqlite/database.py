@@ -1,10 +1,90 @@
 import sqlite3
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
+from typing import Optional
+from typing import Self
+from typing import cast
+
+from coach.config.env import get_optional_env_var
+
+type JournalMode = Literal['WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF']
+type SynchronousMode = Literal['OFF', 'NORMAL', 'FULL', 'EXTRA']
+type TempStore = Literal['DEFAULT', 'FILE', 'MEMORY']
+
+JOURNAL_MODES: tuple[JournalMode, ...] = ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF')
+SYNCHRONOUS_MODES: tuple[SynchronousMode, ...] = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+TEMP_STORES: tuple[TempStore, ...] = ('DEFAULT', 'FILE', 'MEMORY')
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ConnectionProfile:
+    """
+    PRAGMA settings applied to every new connection.
+
+    The defaults use WAL journaling, so readers (e.g. `coach info`) are not blocked by a writer (e.g. `coach sync`).
+    With WAL, synchronous=NORMAL only fsyncs at checkpoints, which keeps every commit durable against application crashes (not power loss) at a fraction of the cost.
+    """
+
+    journal_mode: JournalMode = 'WAL'
+    synchronous: SynchronousMode = 'NORMAL'
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    cache_size_kib: int = 64 * 1024
+    temp_store: TempStore = 'MEMORY'
+    busy_timeout_ms: int = 5_000
+
+    def __post_init__(self) -> None:
+        # PRAGMA values cannot be bound as parameters, so they are validated before being formatted into the statements
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f'Invalid journal mode: {self.journal_mode}')
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f'Invalid synchronous mode: {self.synchronous}')
+        if self.temp_store not in TEMP_STORES:
+            raise ValueError(f'Invalid temp store: {self.temp_store}')
+        if min(self.mmap_size_bytes, self.cache_size_kib, self.busy_timeout_ms) < 0:
+            raise ValueError('mmap_size_bytes, cache_size_kib and busy_timeout_ms must be non-negative')
+
+    @classmethod
+    def from_env(cls) -> Self:
+        """Profile for the local database, with every PRAGMA overridable through the environment (COACH_SQLITE_*)."""
+        defaults = cls()
+        return cls(
+            journal_mode=cast('JournalMode', get_optional_env_var('COACH_SQLITE_JOURNAL_MODE', defaults.journal_mode).upper()),
+            synchronous=cast('SynchronousMode', get_optional_env_var('COACH_SQLITE_SYNCHRONOUS', defaults.synchronous).upper()),
+            mmap_size_bytes=int(get_optional_env_var('COACH_SQLITE_MMAP_SIZE_BYTES', str(defaults.mmap_size_bytes))),
+            cache_size_kib=int(get_optional_env_var('COACH_SQLITE_CACHE_SIZE_KIB', str(defaults.cache_size_kib))),
+            temp_store=cast('TempStore', get_optional_env_var('COACH_SQLITE_TEMP_STORE', defaults.temp_store).upper()),
+            busy_timeout_ms=int(get_optional_env_var('COACH_SQLITE_BUSY_TIMEOUT_MS', str(defaults.busy_timeout_ms))),
+        )
+
+    def pragmas(self) -> list[str]:
+        return [
+            f'PRAGMA journal_mode = {self.journal_mode}',
+            f'PRAGMA synchronous = {self.synchronous}',
+            f'PRAGMA mmap_size = {self.mmap_size_bytes}',
+            f'PRAGMA cache_size = -{self.cache_size_kib}',  # Negative values are in KiB rather than pages
+            f'PRAGMA temp_store = {self.temp_store}',
+            f'PRAGMA busy_timeout = {self.busy_timeout_ms}',
+        ]
 
 
 class Database:
-    def __init__(self, path: Path | str) -> None:
-        self._conn = sqlite3.connect(path)
+    def __init__(self, path: Path | str, *, profile: Optional[ConnectionProfile] = None, check_same_thread: bool = True) -> None:
+        # check_same_thread=False lets other threads use the connection, the caller must then serialize access to it
+        self._conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self._profile = profile or ConnectionProfile()
+        # SQLite leaves foreign keys off by default, without it the ON DELETE CASCADE of best efforts would not fire
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        for pragma in self._profile.pragmas():
+            self._conn.execute(pragma)
+
+    @property
+    def profile(self) -> ConnectionProfile:
+        return self._profile
 
     def connection(self) -> sqlite3.Connection:
         return self._conn
+
+    def data_version(self) -> int:
+        """Counter that changes whenever another connection (e.g. another process) commits to the database."""
+        return int(self._conn.execute('PRAGMA data_version').fetchone()[0])
@@ -1,15 +1,45 @@
+from __future__ import annotations
+
+import json
 import sqlite3
+from collections import defaultdict
 from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
 from datetime import datetime
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Optional
 
 from coach.domain.activity import Activity
+from coach.domain.activity import ActivitySource
+from coach.domain.activity import BestEffort
+from coach.domain.activity import SportType
+from coach.domain.sync import SyncState
+from coach.domain.training_summaries import ActivityVolume
 from coach.persistence.repository_interface import Repository
-from coach.persistence.serialization import deserialize_activity
-from coach.persistence.serialization import serialize_activity
+from coach.persistence.serialization import ACTIVITY_COLUMNS
+from coach.persistence.serialization import BEST_EFFORT_COLUMNS
+from coach.persistence.serialization import activity_row_content_hash
+from coach.persistence.serialization import activity_to_best_effort_rows
+from coach.persistence.serialization import activity_to_row
+from coach.persistence.serialization import row_to_activity
 from coach.persistence.sqlite.database import Database
 from coach.utils import build_sqlite_where_clause
 
+if TYPE_CHECKING:
+    from coach.domain.activity_columns import ActivityColumns
+
+# SQLite builds before 3.32 cap bound parameters at 999, so IN (...) lookups are chunked below that
+_MAX_QUERY_PARAMETERS = 900
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class UpsertResult:
+    num_inserted: int
+    num_updated: int
+    num_unchanged: int
+
 
 class SQLiteActivityRepository(Repository[Activity]):
     def __init__(self, db: Database) -> None:
@@ -39,79 +69,281 @@ class SQLiteActivityRepository(Repository[Activity]):
                 is_manual INTEGER NOT NULL,
                 is_race INTEGER NOT NULL,
                 pbs TEXT DEFAULT '[]',
+                content_hash TEXT,
                 UNIQUE (source, source_activity_id)
             )
             """,
         )
-        self._conn.commit()
+        activity_columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(activities)')}
+        if 'content_hash' not in activity_columns:
+            # Rows stored before change detection have no hash, so they count as changed on their next save
+            self._conn.execute('ALTER TABLE activities ADD COLUMN content_hash TEXT')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_activities_start_time_utc ON activities (start_time_utc)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_activities_sport_type_start_time_utc ON activities (sport_type, start_time_utc)')
 
-    def save(self, activity: Activity) -> None:
+        best_efforts_table_exists = self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'best_efforts'").fetchone() is not None
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS best_efforts (
+                activity_id INTEGER NOT NULL REFERENCES activities (activity_id) ON DELETE CASCADE,
+                name TEXT NOT NULL,
+                moving_time_seconds INTEGER NOT NULL,
+                PRIMARY KEY (activity_id, name)
+            )
+            """,
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_best_efforts_name_moving_time_seconds ON best_efforts (name, moving_time_seconds)')
+        if not best_efforts_table_exists:
+            self._backfill_best_efforts()
+
+        weekly_volumes_table_exists = self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'weekly_volumes'").fetchone() is not None
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS weekly_volumes (
+                week_start TEXT NOT NULL,
+                sport_type TEXT NOT NULL,
+                distance_meters REAL NOT NULL,
+                duration_seconds INTEGER NOT NULL,
+                num_activities INTEGER NOT NULL,
+                PRIMARY KEY (week_start, sport_type)
+            )
+            """,
+        )
+        # Weekly volumes are kept up to date by triggers, so they only ever count activities that were actually inserted or deleted
+        # (INSERT OR IGNORE of an already stored activity does not fire the insert trigger). Week starts are Mondays, like get_week_start_week_end.
+        self._conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_activities_insert_weekly_volumes AFTER INSERT ON activities BEGIN
+                INSERT INTO weekly_volumes (week_start, sport_type, distance_meters, duration_seconds, num_activities)
+                VALUES (
+                    date(NEW.start_time_utc, 'weekday 0', '-6 days'),
+                    NEW.sport_type,
+                    COALESCE(NEW.distance_meters, 0),
+                    COALESCE(NULLIF(NEW.moving_time_seconds, 0), NEW.elapsed_time_seconds),
+                    1
+                )
+                ON CONFLICT (week_start, sport_type) DO UPDATE SET
+                    distance_meters = distance_meters + excluded.distance_meters,
+                    duration_seconds = duration_seconds + excluded.duration_seconds,
+                    num_activities = num_activities + 1;
+            END
+            """,
+        )
         self._conn.execute(
-            self._insert_activity_query,
-            self._activity_values(activity),
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_activities_delete_weekly_volumes AFTER DELETE ON activities BEGIN
+                UPDATE weekly_volumes SET
+                    distance_meters = distance_meters - COALESCE(OLD.distance_meters, 0),
+                    duration_seconds = duration_seconds - COALESCE(NULLIF(OLD.moving_time_seconds, 0), OLD.elapsed_time_seconds),
+                    num_activities = num_activities - 1
+                WHERE week_start = date(OLD.start_time_utc, 'weekday 0', '-6 days') AND sport_type = OLD.sport_type;
+                DELETE FROM weekly_volumes WHERE num_activities <= 0;
+            END
+            """,
+        )
+        self._conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_activities_update_weekly_volumes
+            AFTER UPDATE OF start_time_utc, sport_type, distance_meters, moving_time_seconds, elapsed_time_seconds ON activities BEGIN
+                UPDATE weekly_volumes SET
+                    distance_meters = distance_meters - COALESCE(OLD.distance_meters, 0),
+                    duration_seconds = duration_seconds - COALESCE(NULLIF(OLD.moving_time_seconds, 0), OLD.elapsed_time_seconds),
+                    num_activities = num_activities - 1
+                WHERE week_start = date(OLD.start_time_utc, 'weekday 0', '-6 days') AND sport_type = OLD.sport_type;
+                DELETE FROM weekly_volumes WHERE num_activities <= 0;
+                INSERT INTO weekly_volumes (week_start, sport_type, distance_meters, duration_seconds, num_activities)
+                VALUES (
+                    date(NEW.start_time_utc, 'weekday 0', '-6 days'),
+                    NEW.sport_type,
+                    COALESCE(NEW.distance_meters, 0),
+                    COALESCE(NULLIF(NEW.moving_time_seconds, 0), NEW.elapsed_time_seconds),
+                    1
+                )
+                ON CONFLICT (week_start, sport_type) DO UPDATE SET
+                    distance_meters = distance_meters + excluded.distance_meters,
+                    duration_seconds = duration_seconds + excluded.duration_seconds,
+                    num_activities = num_activities + 1;
+            END
+            """,
         )
+        if not weekly_volumes_table_exists:
+            self._populate_weekly_volumes()
+
         self._conn.commit()
 
-    def save_many(self, activities: Iterable[Activity]) -> None:
-        self._conn.executemany(
-            self._insert_activity_query,
-            [self._activity_values(activity) for activity in activities],
+    def _backfill_best_efforts(self) -> None:
+        # Databases created before the best_efforts table existed only hold PBs in the JSON pbs column
+        self._conn.execute(
+            """
+            INSERT OR IGNORE INTO best_efforts (activity_id, name, moving_time_seconds)
+            SELECT activities.activity_id, json_extract(pb.value, '$.name'), json_extract(pb.value, '$.moving_time_seconds')
+            FROM activities, json_each(activities.pbs) AS pb
+            """,
         )
+
+    def _populate_weekly_volumes(self) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO weekly_volumes (week_start, sport_type, distance_meters, duration_seconds, num_activities)
+            SELECT
+                date(start_time_utc, 'weekday 0', '-6 days') AS week_start,
+                sport_type,
+                SUM(COALESCE(distance_meters, 0)),
+                SUM(COALESCE(NULLIF(moving_time_seconds, 0), elapsed_time_seconds)),
+                COUNT(*)
+            FROM activities
+            GROUP BY week_start, sport_type
+            """,
+        )
+
+    def rebuild_weekly_volumes(self) -> None:
+        """Recompute the weekly volumes table from scratch, e.g. after activities were edited outside of this repository."""
+        self._conn.execute('DELETE FROM weekly_volumes')
+        self._populate_weekly_volumes()
         self._conn.commit()
 
-    @property
-    def _insert_activity_query(self) -> str:
-        return """
-            INSERT OR IGNORE INTO activities VALUES (
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-            )
+    def save(self, activity: Activity) -> None:
+        self.save_many([activity])
+
+    def save_many(self, activities: Iterable[Activity]) -> None:
+        self.upsert_many(activities)
+
+    def upsert_many(self, activities: Iterable[Activity]) -> UpsertResult:
         """
+        Insert new activities and rewrite stored ones whose content changed, in a single transaction.
 
-    @staticmethod
-    def _activity_values(
-        activity: Activity,
-    ) -> tuple[
-        int, str, int,
-        str, Optional[str], Optional[str], Optional[str],
-        str, int, Optional[int],
-        Optional[float], Optional[float],
-        Optional[float], Optional[float], Optional[float],
-        int, int, str,
-    ]:
-        serialized = serialize_activity(activity)
-
-        return (
-            serialized['activity_id'],
-            serialized['source'],
-            serialized['source_activity_id'],
-
-            serialized['sport_type'],
-            serialized['name'],
-            serialized['description'],
-            serialized['notes'],
-
-            serialized['start_time_utc'],
-            serialized['elapsed_time_seconds'],
-            serialized['moving_time_seconds'],
-
-            serialized['distance_meters'],
-            serialized['elevation_gain_meters'],
-
-            serialized['average_heart_rate'],
-            serialized['max_heart_rate'],
-            serialized['average_power_watts'],
-
-            serialized['is_manual'],
-            serialized['is_race'],
-
-            serialized['pbs'],
+        Changes are detected by comparing content hashes, so unchanged activities cost one indexed lookup and no write.
+        The PBs of rewritten activities are replaced as well.
+        """
+        rows_by_activity_id = {activity.activity_id: (activity, activity_to_row(activity)) for activity in activities}
+        stored_hashes = self._stored_content_hashes(list(rows_by_activity_id))
+
+        changed_rows: list[tuple[Any, ...]] = []
+        changed_activities: list[Activity] = []
+        num_updated = 0
+        for activity_id, (activity, row) in rows_by_activity_id.items():
+            content_hash = activity_row_content_hash(row)
+            if activity_id in stored_hashes and stored_hashes[activity_id] == content_hash:
+                continue
+            num_updated += activity_id in stored_hashes
+            changed_rows.append((*row, content_hash))
+            changed_activities.append(activity)
+
+        self._conn.executemany(self._upsert_activity_query, changed_rows)
+        self._conn.executemany('DELETE FROM best_efforts WHERE activity_id = ?', [(activity.activity_id,) for activity in changed_activities])
+        self._conn.executemany(self._insert_best_effort_query, [row for activity in changed_activities for row in activity_to_best_effort_rows(activity)])
+        self._conn.commit()
+
+        return UpsertResult(
+            num_inserted=len(changed_activities) - num_updated,
+            num_updated=num_updated,
+            num_unchanged=len(rows_by_activity_id) - len(changed_activities),
         )
 
+    def _stored_content_hashes(self, activity_ids: list[int]) -> dict[int, Optional[str]]:
+        stored_hashes: dict[int, Optional[str]] = {}
+        for chunk_start in range(0, len(activity_ids), _MAX_QUERY_PARAMETERS):
+            chunk = activity_ids[chunk_start:chunk_start + _MAX_QUERY_PARAMETERS]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows = self._conn.execute(f'SELECT activity_id, content_hash FROM activities WHERE activity_id IN ({placeholders})', chunk).fetchall()  # noqa: S608 - only placeholders are interpolated
+            stored_hashes.update((row['activity_id'], row['content_hash']) for row in rows)
+        return stored_hashes
+
+    @property
+    def _upsert_activity_query(self) -> str:
+        columns = (*ACTIVITY_COLUMNS, 'content_hash')
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in columns if column != 'activity_id')
+        return f'INSERT INTO activities ({", ".join(columns)}) VALUES ({placeholders}) ON CONFLICT (activity_id) DO UPDATE SET {updates}'  # noqa: S608 - only column names are interpolated
+
+    @property
+    def _insert_best_effort_query(self) -> str:
+        columns = ', '.join(BEST_EFFORT_COLUMNS)
+        placeholders = ', '.join('?' for _ in BEST_EFFORT_COLUMNS)
+        return f'INSERT OR IGNORE INTO best_efforts ({columns}) VALUES ({placeholders})'  # noqa: S608 - only column names are interpolated
+
     def list_all(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> list[Activity]:
-        base_query = 'SELECT * FROM activities'
+        """List activities within the optional [start_date, end_date) window, always in chronological order."""
+        base_query = f'SELECT {", ".join(ACTIVITY_COLUMNS)} FROM activities'  # noqa: S608 - only column names are interpolated
         where_query, params = build_sqlite_where_clause(base_query, {'start_time_utc': [('>=', start_date), ('<', end_date)]})
-        rows = self._conn.execute(where_query, params).fetchall()
-        return [deserialize_activity(row) for row in rows]
+        # Plain tuples are decoded by position, building sqlite3.Row objects would only slow the decoding down
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(where_query + ' ORDER BY start_time_utc', params).fetchall()
+        return [row_to_activity(row) for row in rows]
+
+    def list_activity_columns(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> ActivityColumns:
+        """Columnar equivalent of list_all for vectorized aggregations, converted to numbers in SQL without building Activity objects."""
+        base_query = """
+            SELECT
+                activity_id,
+                sport_type,
+                CAST(strftime('%s', start_time_utc) AS INTEGER),
+                COALESCE(NULLIF(moving_time_seconds, 0), elapsed_time_seconds),
+                distance_meters,
+                elevation_gain_meters,
+                average_heart_rate
+            FROM activities
+        """
+        where_query, params = build_sqlite_where_clause(base_query, {'start_time_utc': [('>=', start_date), ('<', end_date)]})
+        # Imported here, so that commands not aggregating activities (e.g. coach info) do not load numpy
+        from coach.domain.activity_columns import ActivityColumns
+
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        return ActivityColumns.from_rows(cursor.execute(where_query + ' ORDER BY start_time_utc', params).fetchall())
+
+    def list_best_efforts_per_distance(self, sport_type: Optional[str] = None) -> list[tuple[BestEffort, date]]:
+        """
+        List the fastest best effort per distance name together with the date of the activity it was set in.
+
+        Ties go to the most recent activity, like the chronological scan of the activities this query replaced.
+        """
+        base_query = """
+            SELECT
+                best_efforts.name,
+                best_efforts.moving_time_seconds,
+                activities.start_time_utc,
+                ROW_NUMBER() OVER (
+                    PARTITION BY best_efforts.name
+                    ORDER BY best_efforts.moving_time_seconds, activities.start_time_utc DESC, activities.activity_id DESC
+                ) AS rank
+            FROM best_efforts JOIN activities ON activities.activity_id = best_efforts.activity_id
+        """
+        where_query, params = build_sqlite_where_clause(base_query, {'activities.sport_type': [('=', sport_type)]})
+        rows = self._conn.execute(f'SELECT name, moving_time_seconds, start_time_utc FROM ({where_query}) WHERE rank = 1 ORDER BY name', params).fetchall()  # noqa: S608 - only the filtered base query is interpolated
+        return [
+            (BestEffort(name=row['name'], moving_time_seconds=row['moving_time_seconds']), datetime.fromisoformat(row['start_time_utc']).date())
+            for row in rows
+        ]
+
+    def list_weekly_volumes(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> dict[date, dict[SportType, ActivityVolume]]:
+        """List pre-aggregated volumes per sport for weeks starting within the optional [start_date, end_date) window, keyed by week start (Monday)."""
+        where_query, params = build_sqlite_where_clause('SELECT * FROM weekly_volumes', {'week_start': [('>=', start_date), ('<', end_date)]})
+        weekly_volumes: dict[date, dict[SportType, ActivityVolume]] = defaultdict(dict)
+        for row in self._conn.execute(where_query + ' ORDER BY week_start', params):
+            weekly_volumes[date.fromisoformat(row['week_start'])][SportType(row['sport_type'])] = ActivityVolume(
+                distance_meters=row['distance_meters'] if row['distance_meters'] > 0 else None,
+                duration_seconds=row['duration_seconds'],
+                num_activities=row['num_activities'],
+            )
+        return dict(weekly_volumes)
+
+    def missing_source_activity_ids(self, source: str, source_activity_ids: Iterable[int]) -> list[int]:
+        """Return the given source activity IDs that are not stored yet, in the given order."""
+        source_activity_ids = list(source_activity_ids)
+        stored_ids: set[int] = set()
+        # One parameter is taken by the source
+        chunk_size = _MAX_QUERY_PARAMETERS - 1
+        for chunk_start in range(0, len(source_activity_ids), chunk_size):
+            chunk = source_activity_ids[chunk_start:chunk_start + chunk_size]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows = self._conn.execute(
+                f'SELECT source_activity_id FROM activities WHERE source = ? AND source_activity_id IN ({placeholders})',  # noqa: S608 - only placeholders are interpolated
+                [source, *chunk],
+            ).fetchall()
+            stored_ids.update(row['source_activity_id'] for row in rows)
+        return [source_activity_id for source_activity_id in source_activity_ids if source_activity_id not in stored_ids]
 
     def count(self) -> int:
         return self._conn.execute('SELECT COUNT(*) FROM activities').fetchone()[0]
@@ -121,5 +353,52 @@ class SQLiteActivityRepository(Repository[Activity]):
         return int(datetime.fromisoformat(row[0]).timestamp()) if (row and row[0]) else None
 
     def reset_table(self) -> None:
+        self._conn.execute('DROP TABLE IF EXISTS weekly_volumes')
+        self._conn.execute('DROP TABLE IF EXISTS best_efforts')
         self._conn.execute('DROP TABLE IF EXISTS activities')
         self._ensure_schema()
+
+
+class SQLiteSyncStateRepository:
+    def __init__(self, db: Database) -> None:
+        self._conn = db.connection()
+        self._conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                source TEXT PRIMARY KEY,
+                after INTEGER NOT NULL,
+                last_completed_page INTEGER NOT NULL,
+                pending_activity_ids TEXT NOT NULL DEFAULT '[]',
+                is_completed INTEGER NOT NULL
+            )
+            """,
+        )
+        self._conn.commit()
+
+    def get(self, source: ActivitySource) -> Optional[SyncState]:
+        row = self._conn.execute('SELECT * FROM sync_state WHERE source = ?', (source.value,)).fetchone()
+        if row is None:
+            return None
+
+        return SyncState(
+            source=ActivitySource(row['source']),
+            after=row['after'],
+            last_completed_page=row['last_completed_page'],
+            pending_activity_ids=tuple(json.loads(row['pending_activity_ids'])),
+            is_completed=bool(row['is_completed']),
+        )
+
+    def save(self, state: SyncState) -> None:
+        self._conn.execute(
+            'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)',
+            (state.source.value, state.after, state.last_completed_page, json.dumps(list(state.pending_activity_ids)), int(state.is_completed)),
+        )
+        self._conn.commit()
+
+    def reset_table(self) -> None:
+        self._conn.execute('DROP TABLE IF EXISTS sync_state')
+        self._ensure_schema()
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from coach.persistence.sqlite.database import ConnectionProfile
+from coach.persistence.sqlite.database import Database
+
+
+def test_default_profile_pragmas_are_applied(tmp_path: Path) -> None:
+    conn = Database(tmp_path / 'coach.db').connection()
+
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    assert conn.execute('PRAGMA cache_size').fetchone()[0] == -64 * 1024
+    assert conn.execute('PRAGMA temp_store').fetchone()[0] == 2  # MEMORY
+    assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5_000
+    assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+
+
+def test_custom_profile_pragmas_are_applied(tmp_path: Path) -> None:
+    profile = ConnectionProfile(journal_mode='DELETE', synchronous='FULL', mmap_size_bytes=0, cache_size_kib=2_000, temp_store='FILE')
+    conn = Database(tmp_path / 'coach.db', profile=profile).connection()
+
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 2  # FULL
+    assert conn.execute('PRAGMA mmap_size').fetchone()[0] == 0
+    assert conn.execute('PRAGMA cache_size').fetchone()[0] == -2_000
+    assert conn.execute('PRAGMA temp_store').fetchone()[0] == 1  # FILE
+
+
+def test_reader_is_not_blocked_by_uncommitted_write(tmp_path: Path) -> None:
+    writer = Database(tmp_path / 'coach.db').connection()
+    writer.execute('CREATE TABLE activities (activity_id INTEGER PRIMARY KEY)')
+    writer.execute('INSERT INTO activities VALUES (1)')
+    writer.commit()
+
+    writer.execute('INSERT INTO activities VALUES (2)')  # Opens a write transaction that stays uncommitted
+    reader = Database(tmp_path / 'coach.db', profile=ConnectionProfile(busy_timeout_ms=0)).connection()
+
+    assert reader.execute('SELECT COUNT(*) FROM activities').fetchone()[0] == 1
+
+
+def test_data_version_changes_on_commits_of_other_connections(tmp_path: Path) -> None:
+    reader = Database(tmp_path / 'coach.db')
+    writer = Database(tmp_path / 'coach.db').connection()
+    data_version = reader.data_version()
+
+    writer.execute('CREATE TABLE activities (activity_id INTEGER PRIMARY KEY)')
+    writer.commit()
+    assert reader.data_version() != data_version
+
+    data_version = reader.data_version()
+    assert reader.data_version() == data_version
+
+
+def test_invalid_profile_is_rejected() -> None:
+    with pytest.raises(ValueError, match='Invalid synchronous mode'):
+        ConnectionProfile(synchronous='SOMETIMES')  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match='non-negative'):
+        ConnectionProfile(cache_size_kib=-1)
+
+
+def test_profile_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('COACH_SQLITE_JOURNAL_MODE', 'delete')
+    monkeypatch.setenv('COACH_SQLITE_BUSY_TIMEOUT_MS', '100')
+
+    assert ConnectionProfile.from_env() == ConnectionProfile(journal_mode='DELETE', busy_timeout_ms=100)
@@ -0,0 +1,228 @@
+import json
+from dataclasses import fields
+from dataclasses import replace
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+
+from coach.builders.utils import get_categorized_volume
+from coach.builders.utils import group_activities_by_week_start
+from coach.domain.activity import ActivitySource
+from coach.domain.activity import BestEffort
+from coach.domain.activity import SportType
+from coach.domain.activity_columns import ActivityColumns
+from coach.domain.sync import SyncState
+from coach.domain.training_summaries import ActivityVolume
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.persistence.sqlite.repositories import SQLiteSyncStateRepository
+from coach.persistence.sqlite.repositories import UpsertResult
+from coach.tests.utils_for_tests import SAMPLE_RIDE
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+class TestSQLiteActivityRepository:
+    def setup_method(self) -> None:
+        self._repo = SQLiteActivityRepository(Database(':memory:'))
+        self._repo.save_many([SAMPLE_RUN, SAMPLE_RIDE])
+
+    def test_list_all(self) -> None:
+        assert self._repo.list_all() == [SAMPLE_RUN, SAMPLE_RIDE]
+
+    def test_list_all_is_chronological_regardless_of_insertion_order(self) -> None:
+        repo = SQLiteActivityRepository(Database(':memory:'))
+        repo.save_many([SAMPLE_RIDE, SAMPLE_RUN])
+
+        assert repo.list_all() == [SAMPLE_RUN, SAMPLE_RIDE]
+
+    def test_start_time_indexes_are_used(self) -> None:
+        conn = self._repo._conn
+        range_plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM activities WHERE start_time_utc >= '2025-01-02' ORDER BY start_time_utc").fetchall()
+        sport_plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM activities WHERE sport_type = 'Run' ORDER BY start_time_utc").fetchall()
+        max_plan = conn.execute('EXPLAIN QUERY PLAN SELECT MAX(start_time_utc) FROM activities').fetchall()
+
+        assert 'idx_activities_start_time_utc' in range_plan[0]['detail']
+        assert 'idx_activities_sport_type_start_time_utc' in sport_plan[0]['detail']
+        assert 'idx_activities_start_time_utc' in max_plan[0]['detail']
+
+    def test_list_all_date_range(self) -> None:
+        assert self._repo.list_all(start_date='2025-01-02') == [SAMPLE_RIDE]
+        assert self._repo.list_all(end_date='2025-01-02') == [SAMPLE_RUN]
+        assert self._repo.list_all(start_date='2025-01-03') == []
+
+    def test_list_activity_columns(self) -> None:
+        columns = self._repo.list_activity_columns()
+        expected_columns = ActivityColumns.from_activities([SAMPLE_RUN, SAMPLE_RIDE])
+
+        for field in fields(ActivityColumns):
+            np.testing.assert_array_equal(getattr(columns, field.name), getattr(expected_columns, field.name))
+        assert self._repo.list_activity_columns(start_date='2025-01-02').activity_ids.tolist() == [SAMPLE_RIDE.activity_id]
+        assert len(self._repo.list_activity_columns(start_date='2026-01-01')) == 0
+
+    def test_list_best_efforts_per_distance(self) -> None:
+        faster_run = replace(
+            SAMPLE_RUN,
+            activity_id=3,
+            source_activity_id=3,
+            start_time_utc=datetime.fromisoformat('2025-02-01T01:00:00+00:00'),
+            pbs=[BestEffort(name='1K', moving_time_seconds=110), BestEffort(name='5K', moving_time_seconds=1_200)],
+        )
+        self._repo.save(faster_run)
+
+        assert sorted(self._repo.list_best_efforts_per_distance(sport_type='Run'), key=lambda pair: pair[0].name) == [
+            (BestEffort(name='1K', moving_time_seconds=110), date(2025, 2, 1)),
+            (BestEffort(name='5K', moving_time_seconds=1_200), date(2025, 2, 1)),
+        ]
+        assert self._repo.list_best_efforts_per_distance(sport_type='Ride') == []
+
+    def test_best_effort_ties_go_to_the_most_recent_activity(self) -> None:
+        later_runs = [
+            replace(SAMPLE_RUN, activity_id=activity_id, source_activity_id=activity_id, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(days=days))
+            for activity_id, days in ((3, 30), (4, 10))
+        ]
+        self._repo.save_many(later_runs)
+
+        assert [day for _, day in self._repo.list_best_efforts_per_distance(sport_type='Run')] == [date(2025, 1, 31)] * len(SAMPLE_RUN.pbs)
+
+    def test_best_efforts_are_deleted_with_their_activity(self) -> None:
+        db = Database(':memory:')
+        SQLiteActivityRepository(db).save(SAMPLE_RUN)
+        conn = db.connection()
+        conn.execute('DELETE FROM activities WHERE activity_id = ?', (SAMPLE_RUN.activity_id,))
+
+        assert conn.execute('SELECT COUNT(*) FROM best_efforts').fetchone()[0] == 0
+
+    def test_best_efforts_are_backfilled_from_pbs_column(self) -> None:
+        db = Database(':memory:')
+        repo = SQLiteActivityRepository(db)
+        repo.save(SAMPLE_RUN)
+        conn = db.connection()
+        conn.execute('DROP TABLE best_efforts')
+        conn.execute('UPDATE activities SET pbs = ?', (json.dumps([{'name': '5K', 'moving_time_seconds': 1_300}]),))
+
+        backfilled_repo = SQLiteActivityRepository(db)
+
+        assert backfilled_repo.list_best_efforts_per_distance() == [(BestEffort(name='5K', moving_time_seconds=1_300), date(2025, 1, 1))]
+
+    def test_missing_source_activity_ids(self) -> None:
+        assert self._repo.missing_source_activity_ids('Strava', [3, 1, 4, 2]) == [3, 4]
+        assert self._repo.missing_source_activity_ids('Strava', []) == []
+
+    def test_missing_source_activity_ids_beyond_the_query_parameter_limit(self) -> None:
+        source_activity_ids = list(range(2_500, 0, -1))
+
+        assert self._repo.missing_source_activity_ids('Strava', source_activity_ids) == source_activity_ids[:-2]
+
+    def test_reset_table_clears_best_efforts(self) -> None:
+        self._repo.reset_table()
+
+        assert self._repo.count() == 0
+        assert self._repo.list_best_efforts_per_distance() == []
+        assert self._repo.list_weekly_volumes() == {}
+
+    def test_weekly_volumes_are_updated_on_save(self) -> None:
+        second_run = replace(SAMPLE_RUN, activity_id=3, source_activity_id=3, distance_meters=None, moving_time_seconds=None)
+        self._repo.save(second_run)
+        self._repo.save(SAMPLE_RUN)  # Already stored, must not be counted twice
+
+        assert self._repo.list_weekly_volumes() == {
+            date(2024, 12, 30): {
+                SportType.RUN: ActivityVolume(distance_meters=10_000.0, duration_seconds=7_100, num_activities=2),
+                SportType.RIDE: ActivityVolume(distance_meters=20_000.0, duration_seconds=3_500, num_activities=1),
+            },
+        }
+        assert self._repo.list_weekly_volumes(start_date='2024-12-31') == {}
+
+    def test_weekly_volumes_match_categorized_volume(self) -> None:
+        repo = SQLiteActivityRepository(Database(':memory:'))
+        activities = [
+            replace(template, activity_id=i, source_activity_id=i, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(days=i, hours=i % 23), distance_meters=float(1_000 * i))
+            for i, template in enumerate([SAMPLE_RUN, SAMPLE_RIDE] * 30)
+        ]
+        repo.save_many(activities)
+
+        assert repo.list_weekly_volumes() == {
+            week_start: get_categorized_volume(week_activities) for week_start, week_activities in group_activities_by_week_start(activities).items()
+        }
+
+    def test_rebuild_weekly_volumes(self) -> None:
+        expected_weekly_volumes = self._repo.list_weekly_volumes()
+        self._repo._conn.execute('DELETE FROM weekly_volumes')
+
+        self._repo.rebuild_weekly_volumes()
+
+        assert self._repo.list_weekly_volumes() == expected_weekly_volumes
+
+    def test_weekly_volumes_are_updated_on_delete(self) -> None:
+        self._repo._conn.execute('DELETE FROM activities WHERE activity_id = ?', (SAMPLE_RIDE.activity_id,))
+
+        assert self._repo.list_weekly_volumes() == {
+            date(2024, 12, 30): {SportType.RUN: ActivityVolume(distance_meters=10_000.0, duration_seconds=3_500, num_activities=1)},
+        }
+
+    def test_upsert_many_rewrites_only_changed_activities(self) -> None:
+        edited_run = replace(SAMPLE_RUN, notes='Edited notes', is_race=True, pbs=[BestEffort(name='5K', moving_time_seconds=1_250)])
+        new_run = replace(SAMPLE_RUN, activity_id=3, source_activity_id=3)
+
+        result = self._repo.upsert_many([edited_run, SAMPLE_RIDE, new_run])
+
+        assert result == UpsertResult(num_inserted=1, num_updated=1, num_unchanged=1)
+        assert self._repo.list_all() == [edited_run, new_run, SAMPLE_RIDE]
+        assert sorted(self._repo.list_best_efforts_per_distance(), key=lambda pair: pair[0].name) == [
+            (BestEffort(name='1K', moving_time_seconds=120), date(2025, 1, 1)),
+            (BestEffort(name='5K', moving_time_seconds=1_250), date(2025, 1, 1)),
+        ]
+        assert self._repo.upsert_many([edited_run, SAMPLE_RIDE, new_run]) == UpsertResult(num_inserted=0, num_updated=0, num_unchanged=3)
+
+    def test_upsert_many_keeps_weekly_volumes_in_sync(self) -> None:
+        moved_run = replace(SAMPLE_RUN, start_time_utc=SAMPLE_RUN.start_time_utc + timedelta(weeks=1), distance_meters=12_000.0)
+
+        self._repo.upsert_many([moved_run])
+
+        assert self._repo.list_weekly_volumes() == {
+            date(2024, 12, 30): {SportType.RIDE: ActivityVolume(distance_meters=20_000.0, duration_seconds=3_500, num_activities=1)},
+            date(2025, 1, 6): {SportType.RUN: ActivityVolume(distance_meters=12_000.0, duration_seconds=3_500, num_activities=1)},
+        }
+
+    def test_rows_without_content_hash_are_rewritten(self) -> None:
+        self._repo._conn.execute('UPDATE activities SET content_hash = NULL')
+
+        assert self._repo.upsert_many([SAMPLE_RUN, SAMPLE_RIDE]) == UpsertResult(num_inserted=0, num_updated=2, num_unchanged=0)
+        assert self._repo.upsert_many([SAMPLE_RUN, SAMPLE_RIDE]) == UpsertResult(num_inserted=0, num_updated=0, num_unchanged=2)
+
+    def test_content_hash_column_is_added_to_existing_table(self) -> None:
+        db = Database(':memory:')
+        repo = SQLiteActivityRepository(db)
+        repo.save(SAMPLE_RUN)
+        conn = db.connection()
+        conn.execute('ALTER TABLE activities DROP COLUMN content_hash')
+
+        migrated_repo = SQLiteActivityRepository(db)
+
+        assert migrated_repo.list_all() == [SAMPLE_RUN]
+        assert migrated_repo.upsert_many([SAMPLE_RUN]) == UpsertResult(num_inserted=0, num_updated=1, num_unchanged=0)
+
+
+class TestSQLiteSyncStateRepository:
+    def setup_method(self) -> None:
+        self._repo = SQLiteSyncStateRepository(Database(':memory:'))
+
+    def test_save_and_get(self) -> None:
+        state = SyncState(source=ActivitySource.STRAVA, after=1_700_000_000, last_completed_page=3, pending_activity_ids=(7, 8))
+
+        assert self._repo.get(ActivitySource.STRAVA) is None
+
+        self._repo.save(state)
+        assert self._repo.get(ActivitySource.STRAVA) == state
+
+        completed_state = replace(state, pending_activity_ids=(), is_completed=True)
+        self._repo.save(completed_state)
+        assert self._repo.get(ActivitySource.STRAVA) == completed_state
+
+    def test_reset_table(self) -> None:
+        self._repo.save(SyncState(source=ActivitySource.STRAVA, after=0))
+        self._repo.reset_table()
+
+        assert self._repo.get(ActivitySource.STRAVA) is None
@@ -1,5 +1,6 @@
 from coach.persistence.serialization import deserialize_activity
 from coach.persistence.serialization import serialize_activity
+from coach.persistence.serialization import serialize_best_efforts
 from coach.tests.utils_for_tests import SAMPLE_RUN
 
 
@@ -63,3 +64,7 @@ def test_deserialize_activity() -> None:
     )
 
     assert deserialized == SAMPLE_RUN
+
+
+def test_serialize_best_efforts() -> None:
+    assert serialize_best_efforts(SAMPLE_RUN) == [{'activity_id': SAMPLE_RUN.activity_id, 'name': '1K', 'moving_time_seconds': 120}]
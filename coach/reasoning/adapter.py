@@ -1,30 +1,108 @@
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Optional
 
 from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.domain.training_load import TrainingLoadSummary
 from coach.domain.training_summaries import RecentTrainingHistory
+from coach.reasoning.cache import load_parsed_system_prompt
+from coach.reasoning.context import render_parsed_system_prompt
 from coach.reasoning.context import render_recent_training_history
 from coach.reasoning.context import render_running_pbs
-from coach.reasoning.context import render_system_prompt
+from coach.reasoning.context import render_training_load
 from coach.reasoning.interface import CoachReasoner
 from coach.reasoning.interface import LLMClient
-from coach.reasoning.prompts import build_coach_prompt
-from coach.utils import parse_file
+from coach.reasoning.prompts import build_coach_prompt_prefix
+from coach.reasoning.prompts import build_coach_prompt_suffix
 
 
 class LLMCoachReasoner(CoachReasoner):
-    def __init__(self, llm_client: LLMClient, user_system_prompt_path: Path = Path('coach/config/coach.md')) -> None:
+    def __init__(self, llm_client: LLMClient, user_system_prompt_path: Path = Path('coach/config/coach.md'), system_prompt_cache_path: Optional[Path] = None) -> None:
         self._llm_client = llm_client
-        self._rendered_system_prompt = render_system_prompt(parse_file(user_system_prompt_path))
-
-    def chat(self, *, running_pbs: RunningPersonalBestsSummary, recent_training_history: RecentTrainingHistory, user_prompt: str, chat_history: Optional[str] = None) -> str:
-        rendered_pbs = render_running_pbs(running_pbs)
-        rendered_history = render_recent_training_history(recent_training_history)
-        prompt = build_coach_prompt(
-            running_pbs=rendered_pbs,
-            rendered_recent_training_history=rendered_history,
+        self._user_system_prompt_path = user_system_prompt_path
+        self._system_prompt_cache_path = system_prompt_cache_path
+        self._prompt_prefix: Optional[str] = None
+        self._prompt_prefix_context: tuple[object, ...] = ()
+        self._prompt_prefix_system_prompt_signature: Optional[tuple[int, int]] = None
+
+    def _system_prompt_signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self._user_system_prompt_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _render_system_prompt(self) -> Optional[str]:
+        parsed_system_prompt = load_parsed_system_prompt(self._user_system_prompt_path, cache_path=self._system_prompt_cache_path)
+        return render_parsed_system_prompt(parsed_system_prompt) if parsed_system_prompt is not None else None
+
+    def _get_prompt_prefix(self, running_pbs: RunningPersonalBestsSummary, recent_training_history: RecentTrainingHistory, training_load: Optional[TrainingLoadSummary]) -> str:
+        # The prefix is rendered once per session context and then reused byte for byte, so the provider can serve it from its prompt cache.
+        # Re-rendering every turn could change it, e.g. the "N days ago" of the PBs after midnight.
+        # A new context (e.g. the daily refresh of `coach serve`) or an edited coach.md re-renders the system prompt along with it,
+        # so the goal countdowns stay in step with the training context.
+        context = (running_pbs, recent_training_history, training_load)
+        system_prompt_signature = self._system_prompt_signature()
+        if (
+            self._prompt_prefix is None
+            or any(new is not old for new, old in zip(context, self._prompt_prefix_context, strict=True))
+            or system_prompt_signature != self._prompt_prefix_system_prompt_signature
+        ):
+            self._prompt_prefix = build_coach_prompt_prefix(
+                running_pbs=render_running_pbs(running_pbs),
+                rendered_recent_training_history=render_recent_training_history(recent_training_history),
+                rendered_training_load=render_training_load(training_load) if training_load is not None else None,
+                rendered_system_prompt=self._render_system_prompt(),
+            )
+            self._prompt_prefix_context = context
+            self._prompt_prefix_system_prompt_signature = system_prompt_signature
+        return self._prompt_prefix
+
+    def build_prompt(
+        self,
+        *,
+        running_pbs: RunningPersonalBestsSummary,
+        recent_training_history: RecentTrainingHistory,
+        user_prompt: str,
+        chat_history: Optional[str],
+        training_load: Optional[TrainingLoadSummary],
+    ) -> str:
+        """Full prompt of a chat turn, also usable to send turns through other clients, e.g. a batch of questions through an AsyncLLMClient."""
+        prompt_prefix = self._get_prompt_prefix(running_pbs, recent_training_history, training_load)
+        return prompt_prefix + '\n' + build_coach_prompt_suffix(user_prompt=user_prompt, chat_history=chat_history)
+
+    def chat(
+        self,
+        *,
+        running_pbs: RunningPersonalBestsSummary,
+        recent_training_history: RecentTrainingHistory,
+        user_prompt: str,
+        chat_history: Optional[str] = None,
+        training_load: Optional[TrainingLoadSummary] = None,
+    ) -> str:
+        prompt = self.build_prompt(
+            running_pbs=running_pbs,
+            recent_training_history=recent_training_history,
             user_prompt=user_prompt,
-            rendered_system_prompt=self._rendered_system_prompt,
             chat_history=chat_history,
+            training_load=training_load,
         )
         return self._llm_client.complete(prompt)
+
+    def chat_stream(
+        self,
+        *,
+        running_pbs: RunningPersonalBestsSummary,
+        recent_training_history: RecentTrainingHistory,
+        user_prompt: str,
+        chat_history: Optional[str] = None,
+        training_load: Optional[TrainingLoadSummary] = None,
+    ) -> Iterator[str]:
+        prompt = self.build_prompt(
+            running_pbs=running_pbs,
+            recent_training_history=recent_training_history,
+            user_prompt=user_prompt,
+            chat_history=chat_history,
+            training_load=training_load,
+        )
+        yield from self._llm_client.stream(prompt)
@@ -0,0 +1,220 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from coach.domain.activity import SportType
+from coach.domain.goals import DistanceActivityTrainingGoal
+from coach.domain.goals import ParsedSystemPrompt
+from coach.domain.goals import TrainingGoal
+from coach.reasoning.context import parse_system_prompt
+from coach.reasoning.interface import LLMClient
+from coach.utils import parse_file
+
+logger = logging.getLogger(__name__)
+
+
+class CachedLLMClient(LLMClient):
+    """
+    Content-addressed on-disk cache in front of an LLM client, one file per (namespace, prompt).
+
+    Identical prompts, e.g. the same question asked again on the same training data, are answered from disk.
+    Entries expire after `ttl_seconds`, and once there are more than `max_entries` the least recently used ones are evicted.
+    Recency is tracked with the file modification time, which is bumped on every hit. The directory is only listed again once the
+    number of entries counted since the last listing exceeds `max_entries`, not on every write.
+    """
+
+    def __init__(self, llm_client: LLMClient, directory: Path, *, namespace: str = '', ttl_seconds: int = 7 * 24 * 60 * 60, max_entries: int = 1_000) -> None:
+        self._llm_client = llm_client
+        self._directory = directory
+        self._namespace = namespace
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._num_entries: Optional[int] = None  # Counted on the first write, other processes sharing the directory are caught up by each listing
+
+    def key(self, prompt: str) -> str:
+        # The namespace (e.g. the model name) keeps answers of different models apart
+        return hashlib.sha256(f'{self._namespace}\0{prompt}'.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f'{key}.json'
+
+    def complete(self, prompt: str) -> str:
+        key = self.key(prompt)
+        cached_response = self.get(key)
+        if cached_response is not None:
+            self.last_usage = None
+            return cached_response
+
+        response = self._llm_client.complete(prompt)
+        self.last_usage = self._llm_client.last_usage
+        self.put(key, response)
+        return response
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        key = self.key(prompt)
+        cached_response = self.get(key)
+        if cached_response is not None:
+            self.last_usage = None
+            yield cached_response
+            return
+
+        deltas: list[str] = []
+        for delta in self._llm_client.stream(prompt):
+            deltas.append(delta)
+            yield delta
+        # Only fully streamed responses are stored, an abandoned stream leaves no truncated entry behind
+        self.last_usage = self._llm_client.last_usage
+        self.put(key, ''.join(deltas))
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+            stored_at, response = float(entry['stored_at']), str(entry['response'])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            logger.warning('Dropping unreadable LLM cache entry %s.', path)
+            path.unlink(missing_ok=True)
+            return None
+
+        now = time.time()
+        if now - stored_at > self._ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        # Evicted by a concurrent writer since it was read, the response itself is still valid
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path, (now, now))
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        path = self._path(key)
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        tmp_path.write_text(json.dumps({'stored_at': now, 'response': response}), encoding='utf-8')
+        os.utime(tmp_path, (now, now))
+        is_new_entry = not path.exists()
+        tmp_path.replace(path)
+
+        with self._lock:
+            if self._num_entries is not None:
+                self._num_entries += is_new_entry
+            if self._num_entries is None or self._num_entries > self._max_entries:
+                self._evict_least_recently_used()
+
+    def evict_least_recently_used(self) -> int:
+        with self._lock:
+            return self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self) -> int:
+        modified_times: dict[Path, float] = {}
+        for path in self._directory.glob('*.json'):
+            try:
+                modified_times[path] = path.stat().st_mtime
+            except FileNotFoundError:
+                continue  # Removed by another process since the listing
+
+        num_to_evict = max(0, len(modified_times) - self._max_entries)
+        for path in sorted(modified_times, key=modified_times.__getitem__)[:num_to_evict]:
+            path.unlink(missing_ok=True)
+        self._num_entries = len(modified_times) - num_to_evict
+        return num_to_evict
+
+
+_SYSTEM_PROMPT_CACHE_VERSION = 1
+
+
+def _encode_training_goal(goal: TrainingGoal) -> dict[str, Any]:
+    encoded: dict[str, Any] = {
+        'sport_type': goal.sport_type.value,
+        'name': goal.name,
+        'goal_date': goal.goal_date.isoformat() if isinstance(goal.goal_date, date) else None,
+        'goal_date_text': goal.goal_date if isinstance(goal.goal_date, str) else None,
+        'notes': goal.notes,
+    }
+    if isinstance(goal, DistanceActivityTrainingGoal):
+        encoded |= {'goal_distance_meters': goal.goal_distance_meters, 'goal_duration_seconds': goal.goal_duration_seconds, 'goal_pace': goal.goal_pace}
+    return encoded
+
+
+def _decode_training_goal(encoded: dict[str, Any]) -> TrainingGoal:
+    common = {
+        'sport_type': SportType(encoded['sport_type']),
+        'name': encoded['name'],
+        'goal_date': date.fromisoformat(encoded['goal_date']) if encoded['goal_date'] is not None else encoded['goal_date_text'],
+        'notes': encoded['notes'],
+    }
+    if 'goal_pace' in encoded:
+        return DistanceActivityTrainingGoal(
+            **common,
+            goal_distance_meters=encoded['goal_distance_meters'],
+            goal_duration_seconds=encoded['goal_duration_seconds'],
+            goal_pace=encoded['goal_pace'],
+        )
+    return TrainingGoal(**common)
+
+
+def _read_system_prompt_cache_entry(cache_path: Path) -> Optional[dict[str, Any]]:
+    try:
+        entry = json.loads(cache_path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning('Ignoring unreadable system prompt cache %s.', cache_path)
+        return None
+    return entry if isinstance(entry, dict) and entry.get('version') == _SYSTEM_PROMPT_CACHE_VERSION else None
+
+
+def _decode_parsed_system_prompt(entry: dict[str, Any]) -> ParsedSystemPrompt:
+    return ParsedSystemPrompt(instructions=entry['instructions'], goals=tuple(_decode_training_goal(goal) for goal in entry['goals']))
+
+
+def load_parsed_system_prompt(path: Path, *, cache_path: Optional[Path] = None) -> Optional[ParsedSystemPrompt]:
+    """
+    Parse the user system prompt (coach.md), reusing the goals parsed on an earlier start while the file is unchanged.
+
+    An unchanged modification time and size skip reading the file at all, otherwise a matching content hash (e.g. after a touch)
+    still skips the goal parsers. Only the parsed goals are cached, rendering depends on the current date.
+    """
+    if cache_path is None:
+        system_prompt = parse_file(path)
+        return parse_system_prompt(system_prompt) if system_prompt is not None else None
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    entry = _read_system_prompt_cache_entry(cache_path)
+    if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return _decode_parsed_system_prompt(entry)
+
+    system_prompt = path.read_text(encoding='utf-8').strip()
+    digest = hashlib.sha256(system_prompt.encode()).hexdigest()
+    parsed_system_prompt = _decode_parsed_system_prompt(entry) if entry is not None and entry['sha256'] == digest else parse_system_prompt(system_prompt)
+
+    new_entry = {
+        'version': _SYSTEM_PROMPT_CACHE_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+        'instructions': parsed_system_prompt.instructions,
+        'goals': [_encode_training_goal(goal) for goal in parsed_system_prompt.goals],
+    }
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f'.{threading.get_ident()}.tmp')
+    tmp_path.write_text(json.dumps(new_entry), encoding='utf-8')
+    tmp_path.replace(cache_path)
+    return parsed_system_prompt
@@ -1,9 +1,27 @@
+import asyncio
+import random
 import time
+from collections.abc import Iterator
 from typing import Optional
 
+from openai import AsyncOpenAI
 from openai import OpenAI
+from openai.types.responses import ResponseCompletedEvent
+from openai.types.responses import ResponseTextDeltaEvent
+from openai.types.responses import ResponseUsage
 
+from coach.reasoning.interface import AsyncLLMClient
 from coach.reasoning.interface import LLMClient
+from coach.reasoning.interface import LLMUsage
+
+
+def retry_delay_seconds(attempt: int, *, base_seconds: float = 1.0, max_seconds: float = 30.0) -> float:
+    """
+    Exponential backoff with full jitter: a uniform delay up to base_seconds * 2^attempt, capped at max_seconds.
+
+    The jitter spreads retries of concurrent requests failing together (e.g. on a rate limit) instead of retrying them in lockstep.
+    """
+    return random.uniform(0, min(max_seconds, base_seconds * 2**attempt))  # noqa: S311
 
 
 class OpenAILLMClient(LLMClient):
@@ -14,27 +32,114 @@ class OpenAILLMClient(LLMClient):
         model: str = 'gpt-5-nano',
         max_retries: int = 3,
         max_output_tokens: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None,
+        retry_base_seconds: float = 1.0,
     ) -> None:
         self._client = client or OpenAI()
         self._model = model
         self._max_retries = max_retries
+        self._retry_base_seconds = retry_base_seconds
         self._max_output_tokens = max_output_tokens
+        # Requests sharing a key are routed to the same prompt cache, which helps reuse of long shared prefixes
+        self._prompt_cache_key = prompt_cache_key
 
     def complete(self, prompt: str) -> str:
         last_error: Optional[Exception] = None
 
-        for _ in range(self._max_retries):
+        for attempt in range(self._max_retries):
             try:
                 response = self._client.responses.create(
                     model=self._model,
                     input=prompt,
                     max_output_tokens=self._max_output_tokens,
+                    prompt_cache_key=self._prompt_cache_key,
+                )
+                self.last_usage = self._parse_usage(response.usage)
+                return response.output_text
+            except Exception as exc:
+                if isinstance(exc, (KeyboardInterrupt, SystemExit)):
+                    raise
+                last_error = exc
+                if attempt < self._max_retries - 1:
+                    time.sleep(retry_delay_seconds(attempt, base_seconds=self._retry_base_seconds))
+
+        raise RuntimeError('LLM request failed') from last_error
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self._max_retries):
+            has_yielded = False
+            try:
+                events = self._client.responses.create(
+                    model=self._model,
+                    input=prompt,
+                    max_output_tokens=self._max_output_tokens,
+                    prompt_cache_key=self._prompt_cache_key,
+                    stream=True,
+                )
+                self.last_usage = None
+                for event in events:
+                    if isinstance(event, ResponseTextDeltaEvent):
+                        has_yielded = True
+                        yield event.delta
+                    elif isinstance(event, ResponseCompletedEvent):
+                        self.last_usage = self._parse_usage(event.response.usage)
+                return
+            except Exception as exc:
+                # Once text was shown to the user a retry would repeat it, so only failures before the first delta are retried
+                if isinstance(exc, (KeyboardInterrupt, SystemExit)) or has_yielded:
+                    raise
+                last_error = exc
+                if attempt < self._max_retries - 1:
+                    time.sleep(retry_delay_seconds(attempt, base_seconds=self._retry_base_seconds))
+
+        raise RuntimeError('LLM request failed') from last_error
+
+    @staticmethod
+    def _parse_usage(usage: Optional[ResponseUsage]) -> Optional[LLMUsage]:
+        if usage is None:
+            return None
+        return LLMUsage(input_tokens=usage.input_tokens, cached_input_tokens=usage.input_tokens_details.cached_tokens, output_tokens=usage.output_tokens)
+
+
+class AsyncOpenAILLMClient(AsyncLLMClient):
+    """Non-blocking OpenAI client for batches, e.g. complete_many over the questions of an evaluation suite."""
+
+    def __init__(
+        self,
+        *,
+        client: Optional[AsyncOpenAI] = None,
+        model: str = 'gpt-5-nano',
+        max_retries: int = 3,
+        max_output_tokens: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None,
+        retry_base_seconds: float = 1.0,
+    ) -> None:
+        self._client = client or AsyncOpenAI()
+        self._model = model
+        self._max_retries = max_retries
+        self._max_output_tokens = max_output_tokens
+        self._prompt_cache_key = prompt_cache_key
+        self._retry_base_seconds = retry_base_seconds
+
+    async def complete(self, prompt: str) -> str:
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self._max_retries):
+            try:
+                response = await self._client.responses.create(
+                    model=self._model,
+                    input=prompt,
+                    max_output_tokens=self._max_output_tokens,
+                    prompt_cache_key=self._prompt_cache_key,
                 )
                 return response.output_text
             except Exception as exc:
                 if isinstance(exc, (KeyboardInterrupt, SystemExit)):
                     raise
                 last_error = exc
-                time.sleep(1)
+                if attempt < self._max_retries - 1:
+                    await asyncio.sleep(retry_delay_seconds(attempt, base_seconds=self._retry_base_seconds))
 
         raise RuntimeError('LLM request failed') from last_error
@@ -4,8 +4,11 @@ from typing import cast
 
 from coach.builders.training_goal import build_training_goal
 from coach.domain.goals import DistanceActivityTrainingGoal
+from coach.domain.goals import ParsedSystemPrompt
 from coach.domain.goals import TrainingGoal
 from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.domain.training_load import TrainingLoadPoint
+from coach.domain.training_load import TrainingLoadSummary
 from coach.domain.training_summaries import ActivitySummary
 from coach.domain.training_summaries import ActivityVolume
 from coach.domain.training_summaries import RecentTrainingHistory
@@ -107,6 +110,22 @@ def render_recent_training_history(recent_training_history: RecentTrainingHistor
     return '\n'.join(lines)
 
 
+def render_training_load_point(point: TrainingLoadPoint) -> str:
+    ratio = 'n/a' if point.acute_chronic_workload_ratio is None else f'{point.acute_chronic_workload_ratio:.2f}'
+    return f'ATL {point.acute_load:.1f}, CTL {point.chronic_load:.1f}, TSB {point.training_stress_balance:+.1f}, ACWR {ratio} (daily load {point.daily_load:.0f})'
+
+
+def render_training_load(training_load: TrainingLoadSummary) -> str:
+    lines: list[str] = ['-' * 40]
+    lines.append('Training load (ATL = 7-day fatigue, CTL = 42-day fitness, TSB = CTL - ATL form, ACWR = ATL / CTL):')
+    lines.append(f'- Today ({training_load.current.day}): {render_training_load_point(training_load.current)}')
+    for point in training_load.previous_points:
+        num_days_ago = (training_load.current.day - point.day).days
+        lines.append(f'- {num_days_ago} day{"" if num_days_ago == 1 else "s"} ago ({point.day}): {render_training_load_point(point)}')
+    lines.append('-' * 40)
+    return '\n'.join(lines)
+
+
 def render_training_goal(training_goal: TrainingGoal) -> str:
     lines: list[str] = []
     lines.append(f'- {training_goal.name}')
@@ -126,13 +145,18 @@ def render_training_goal(training_goal: TrainingGoal) -> str:
     return '\n'.join(lines)
 
 
+def parse_system_prompt(system_prompt: str) -> ParsedSystemPrompt:
+    parts = system_prompt.split('### Goals:')
+    return ParsedSystemPrompt(instructions=parts[0], goals=tuple(build_training_goal(goal) for goal in parts[1].split('\n\n')))
+
+
+def render_parsed_system_prompt(parsed_system_prompt: ParsedSystemPrompt) -> str:
+    # Rendered on every start rather than cached, the time until each goal changes daily
+    rendered_goals = '\n'.join([render_training_goal(goal) for goal in parsed_system_prompt.goals])
+    return parsed_system_prompt.instructions + '### Goals:\n' + rendered_goals
+
+
 def render_system_prompt(system_prompt: Optional[str]) -> Optional[str]:
     if system_prompt is None:
         return None
-
-    parts = system_prompt.split('### Goals:')
-    text_lines = parts[0]
-    goals = [build_training_goal(goal) for goal in parts[1].split('\n\n')]
-    rendered_goals = '\n'.join([render_training_goal(goal) for goal in goals])
-
-    return text_lines + '### Goals:\n' + rendered_goals
+    return render_parsed_system_prompt(parse_system_prompt(system_prompt))
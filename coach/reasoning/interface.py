@@ -1,18 +1,97 @@
+import asyncio
+import threading
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Iterator
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Optional
 
 from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.domain.training_load import TrainingLoadSummary
 from coach.domain.training_summaries import RecentTrainingHistory
 
 
 class CoachReasoner(ABC):
     @abstractmethod
-    def chat(self, *, running_pbs: RunningPersonalBestsSummary, recent_training_history: RecentTrainingHistory, user_prompt: str, chat_history: Optional[str] = None) -> str:
+    def chat(
+        self,
+        *,
+        running_pbs: RunningPersonalBestsSummary,
+        recent_training_history: RecentTrainingHistory,
+        user_prompt: str,
+        chat_history: Optional[str] = None,
+        training_load: Optional[TrainingLoadSummary] = None,
+    ) -> str:
         ...
 
+    def chat_stream(
+        self,
+        *,
+        running_pbs: RunningPersonalBestsSummary,
+        recent_training_history: RecentTrainingHistory,
+        user_prompt: str,
+        chat_history: Optional[str] = None,
+        training_load: Optional[TrainingLoadSummary] = None,
+    ) -> Iterator[str]:
+        """Yield the answer in pieces as they become available, joined they equal the answer of chat."""
+        yield self.chat(
+            running_pbs=running_pbs,
+            recent_training_history=recent_training_history,
+            user_prompt=user_prompt,
+            chat_history=chat_history,
+            training_load=training_load,
+        )
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class LLMUsage:
+    input_tokens: int
+    cached_input_tokens: int  # Input tokens served from the provider's prompt cache
+    output_tokens: int
+
 
 class LLMClient(ABC):
+    @property
+    def last_usage(self) -> Optional[LLMUsage]:
+        """
+        Token usage of the latest completion made by the calling thread, None when the client does not report it (or did not call the API).
+
+        It is kept per thread, so concurrent requests sharing a client (e.g. in `coach serve`) do not read each other's usage.
+        """
+        return getattr(self._usage_by_thread(), 'usage', None)
+
+    @last_usage.setter
+    def last_usage(self, usage: Optional[LLMUsage]) -> None:
+        self._usage_by_thread().usage = usage
+
+    def _usage_by_thread(self) -> threading.local:
+        # Created lazily, so subclasses need not call super().__init__(); dict.setdefault is atomic
+        usage_by_thread: threading.local = self.__dict__.setdefault('_last_usage_by_thread', threading.local())
+        return usage_by_thread
+
     @abstractmethod
     def complete(self, prompt: str) -> str:
         ...
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the completion as text deltas. Clients without streaming support yield the whole completion at once."""
+        yield self.complete(prompt)
+
+
+class AsyncLLMClient(ABC):
+    @abstractmethod
+    async def complete(self, prompt: str) -> str:
+        ...
+
+    async def complete_many(self, prompts: Sequence[str], *, max_concurrency: int = 4) -> list[str]:
+        """Complete all prompts concurrently, with at most max_concurrency requests in flight, and return the completions in prompt order."""
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, got {max_concurrency}')
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def complete_one(prompt: str) -> str:
+            async with semaphore:
+                return await self.complete(prompt)
+
+        return list(await asyncio.gather(*(complete_one(prompt) for prompt in prompts)))
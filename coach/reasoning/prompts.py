@@ -32,21 +32,27 @@ def _extend_parts(parts: list[str], part_title: str, prompt: Optional[str]) -> N
         )
 
 
-def build_coach_prompt(
+def build_coach_prompt_prefix(
         *,
         running_pbs: str,
         rendered_recent_training_history: str,
-        user_prompt: Optional[str] = None,
+        rendered_training_load: Optional[str] = None,
         rendered_system_prompt: Optional[str] = None,
-        chat_history: Optional[str] = None,
 ) -> str:
+    """Static part of the prompt: identical on every turn of a session, so it can be served from the provider's prompt cache."""
     parts: list[str] = []
     parts.append(SYSTEM_PROMPT.strip())
     _extend_parts(parts, 'User instructions and goals:', rendered_system_prompt)
     _extend_parts(parts, 'Training context:', rendered_recent_training_history)
+    _extend_parts(parts, 'Training load:', rendered_training_load)
     _extend_parts(parts, 'Running PBs:', running_pbs)
+    return '\n'.join(parts)
+
+
+def build_coach_prompt_suffix(*, user_prompt: Optional[str] = None, chat_history: Optional[str] = None) -> str:
+    """Part of the prompt that changes on every turn, always placed after the static prefix."""
+    parts: list[str] = []
     _extend_parts(parts, 'Conversation so far:', chat_history)
     _extend_parts(parts, 'User question:', user_prompt)
     parts.append('Your answer: <response>')
-
     return '\n'.join(parts)
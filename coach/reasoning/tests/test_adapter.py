@@ -0,0 +1,120 @@
+from datetime import UTC
+from datetime import date
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from coach.builders.recent_training_history import build_recent_training_history
+from coach.domain.personal_bests import RunningPersonalBest
+from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.reasoning.adapter import LLMCoachReasoner
+from coach.reasoning.interface import LLMClient
+from coach.reasoning.prompts import build_coach_prompt_suffix
+from coach.tests.utils_for_tests import SAMPLE_RUN
+from coach.tests.utils_for_tests import FakeStreamingLLMClient
+
+_SYSTEM_PROMPT = """# Training Instructions
+
+### Goals:
+- Sub20 5K
+    - Sport: Run
+    - Goal date: 2099-06-30
+    - Distance: 5 km
+    - Total duration: 00:20:00
+"""
+
+
+class _RecordingLLMClient(LLMClient):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return 'Keep going.'
+
+
+class TestLLMCoachReasoner:
+    def setup_method(self) -> None:
+        self._llm_client = _RecordingLLMClient()
+        self._reasoner = LLMCoachReasoner(self._llm_client, user_system_prompt_path=Path('does-not-exist.md'))
+        self._pbs = RunningPersonalBestsSummary(
+            PB_1K=RunningPersonalBest(DATE=date(2025, 1, 1), PACE_STR='3:30/km'),
+            PB_5K=None,
+            PB_10K=None,
+            PB_15K=None,
+            PB_HALF_MARATHON=None,
+            PB_MARATHON=None,
+        )
+        self._history = build_recent_training_history([SAMPLE_RUN], generated_at=datetime(2025, 1, 2, tzinfo=UTC), num_history_weeks=1)
+
+    def test_chat_sends_the_built_prompt(self) -> None:
+        prompt = self._reasoner.build_prompt(
+            running_pbs=self._pbs,
+            recent_training_history=self._history,
+            user_prompt='How was my week?',
+            chat_history='You: Hi',
+            training_load=None,
+        )
+        self._reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='How was my week?', chat_history='You: Hi')
+
+        assert self._llm_client.prompts == [prompt]
+        prefix, suffix = prompt.split('\nConversation so far:')
+        assert 'Running PBs:' in prefix
+        assert 'Conversation so far:' + suffix == build_coach_prompt_suffix(user_prompt='How was my week?', chat_history='You: Hi')
+
+    def test_prefix_is_rendered_once_and_stays_byte_stable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self._reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='First question')
+        # A re-render would now produce a different prefix, the frozen one must be reused instead
+        monkeypatch.setattr('coach.reasoning.adapter.render_running_pbs', lambda _: 'changed')
+        self._reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='Second question', chat_history='You: First question')
+
+        first_prompt, second_prompt = self._llm_client.prompts
+        prefix = first_prompt.split('\nUser question:')[0]
+        assert second_prompt.startswith(prefix + '\nConversation so far:')
+        assert 'changed' not in second_prompt
+
+    def test_prefix_is_rebuilt_for_new_context(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self._reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='First question')
+        monkeypatch.setattr('coach.reasoning.adapter.render_running_pbs', lambda _: 'changed')
+        new_history = build_recent_training_history([SAMPLE_RUN], generated_at=datetime(2025, 1, 9, tzinfo=UTC), num_history_weeks=1)
+        self._reasoner.chat(running_pbs=self._pbs, recent_training_history=new_history, user_prompt='Second question')
+
+        assert 'changed' in self._llm_client.prompts[1]
+
+    def test_system_prompt_is_rendered_again_for_a_new_context(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        system_prompt_path = tmp_path / 'coach.md'
+        system_prompt_path.write_text(_SYSTEM_PROMPT, encoding='utf-8')
+        reasoner = LLMCoachReasoner(self._llm_client, user_system_prompt_path=system_prompt_path)
+        reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='First question')
+
+        # As after midnight: the countdown to the goal changed, but only a refreshed context may change the prefix
+        monkeypatch.setattr('coach.reasoning.context.weeks_and_days_until', lambda _: 'one day less')
+        reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='Second question')
+        new_history = build_recent_training_history([SAMPLE_RUN], generated_at=datetime(2025, 1, 3, tzinfo=UTC), num_history_weeks=1)
+        reasoner.chat(running_pbs=self._pbs, recent_training_history=new_history, user_prompt='Third question')
+
+        assert 'one day less' not in self._llm_client.prompts[1]
+        assert 'Goal date: 2099-06-30 (in one day less)' in self._llm_client.prompts[2]
+
+    def test_edited_system_prompt_is_picked_up(self, tmp_path: Path) -> None:
+        system_prompt_path = tmp_path / 'coach.md'
+        system_prompt_path.write_text(_SYSTEM_PROMPT, encoding='utf-8')
+        reasoner = LLMCoachReasoner(self._llm_client, user_system_prompt_path=system_prompt_path, system_prompt_cache_path=tmp_path / 'system_prompt.json')
+        reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='First question')
+
+        system_prompt_path.write_text(_SYSTEM_PROMPT.replace('Sub20 5K', 'Sub19 5K race'), encoding='utf-8')
+        reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='Second question')
+
+        assert '- Sub20 5K' in self._llm_client.prompts[0]
+        assert '- Sub19 5K race' in self._llm_client.prompts[1]
+
+    def test_chat_stream_yields_deltas_of_the_same_prompt(self) -> None:
+        llm_client = FakeStreamingLLMClient('Keep the easy runs easy.')
+        reasoner = LLMCoachReasoner(llm_client, user_system_prompt_path=Path('does-not-exist.md'))
+
+        deltas = list(reasoner.chat_stream(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='First question'))
+        reasoner.chat(running_pbs=self._pbs, recent_training_history=self._history, user_prompt='First question')
+
+        assert deltas == ['Keep ', 'the ', 'easy ', 'runs ', 'easy.']
+        assert llm_client.prompts[0] == llm_client.prompts[1]
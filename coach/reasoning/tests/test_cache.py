@@ -0,0 +1,167 @@
+import os
+import threading
+from collections.abc import Generator
+from pathlib import Path
+from typing import Optional
+from typing import cast
+
+import pytest
+
+from coach.reasoning.cache import CachedLLMClient
+from coach.reasoning.cache import load_parsed_system_prompt
+from coach.reasoning.context import parse_system_prompt
+from coach.reasoning.interface import LLMClient
+from coach.reasoning.interface import LLMUsage
+from coach.tests.utils_for_tests import FakeStreamingLLMClient
+
+
+class _CountingLLMClient(LLMClient):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return f'Answer to: {prompt}'
+
+
+class TestCachedLLMClient:
+    def test_repeated_prompt_is_answered_from_cache(self, tmp_path: Path) -> None:
+        llm_client = _CountingLLMClient()
+        cached_client = CachedLLMClient(llm_client, tmp_path)
+
+        assert cached_client.complete('How was my week?') == 'Answer to: How was my week?'
+        assert CachedLLMClient(llm_client, tmp_path).complete('How was my week?') == 'Answer to: How was my week?'
+        assert cached_client.complete('And my month?') == 'Answer to: And my month?'
+        assert llm_client.prompts == ['How was my week?', 'And my month?']
+
+    def test_streamed_response_is_cached_once_complete(self, tmp_path: Path) -> None:
+        llm_client = FakeStreamingLLMClient('Keep the easy runs easy.')
+        cached_client = CachedLLMClient(llm_client, tmp_path)
+
+        abandoned_stream = cast(Generator[str], cached_client.stream('How was my week?'))
+        assert next(abandoned_stream) == 'Keep '
+        abandoned_stream.close()
+        assert list(tmp_path.glob('*.json')) == []
+
+        assert list(cached_client.stream('How was my week?')) == ['Keep ', 'the ', 'easy ', 'runs ', 'easy.']
+        assert list(cached_client.stream('How was my week?')) == ['Keep the easy runs easy.']
+        assert cached_client.complete('How was my week?') == 'Keep the easy runs easy.'
+        assert len(llm_client.prompts) == 2
+
+    def test_namespaces_are_kept_apart(self, tmp_path: Path) -> None:
+        assert CachedLLMClient(_CountingLLMClient(), tmp_path, namespace='gpt-a').key('prompt') != CachedLLMClient(_CountingLLMClient(), tmp_path, namespace='gpt-b').key('prompt')
+
+    def test_expired_entries_are_not_used(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 1_000_000.0
+        monkeypatch.setattr('coach.reasoning.cache.time.time', lambda: now)
+        llm_client = _CountingLLMClient()
+        cached_client = CachedLLMClient(llm_client, tmp_path, ttl_seconds=60)
+
+        cached_client.complete('prompt')
+        now += 61
+        cached_client.complete('prompt')
+
+        assert llm_client.prompts == ['prompt', 'prompt']
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = 1_000_000.0
+        monkeypatch.setattr('coach.reasoning.cache.time.time', lambda: now)
+        llm_client = _CountingLLMClient()
+        cached_client = CachedLLMClient(llm_client, tmp_path, max_entries=2)
+
+        for prompt in ['first', 'second', 'first', 'third']:
+            cached_client.complete(prompt)
+            now += 1
+
+        assert len(list(tmp_path.glob('*.json'))) == 2
+        assert cached_client.get(cached_client.key('first')) is not None
+        assert cached_client.get(cached_client.key('second')) is None
+
+    def test_directory_is_listed_only_when_the_entry_count_exceeds_the_maximum(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cached_client = CachedLLMClient(_CountingLLMClient(), tmp_path, max_entries=3)
+        num_listings = 0
+        evict = cached_client._evict_least_recently_used
+
+        def counting_evict() -> int:
+            nonlocal num_listings
+            num_listings += 1
+            return evict()
+
+        monkeypatch.setattr(cached_client, '_evict_least_recently_used', counting_evict)
+        for prompt in ['first', 'second', 'first', 'third', 'fourth']:
+            cached_client.complete(prompt)
+
+        assert num_listings == 2  # Counting the entries on the first write, evicting on the fourth entry
+        assert len(list(tmp_path.glob('*.json'))) == 3
+
+    def test_entry_evicted_after_it_was_read_is_still_returned(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        cached_client = CachedLLMClient(_CountingLLMClient(), tmp_path)
+        cached_client.put(cached_client.key('prompt'), 'answer')
+
+        def utime_after_eviction(path: Path, times: tuple[float, float]) -> None:
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr('coach.reasoning.cache.os.utime', utime_after_eviction)
+        assert cached_client.get(cached_client.key('prompt')) == 'answer'
+
+    def test_last_usage_is_kept_per_thread(self, tmp_path: Path) -> None:
+        cached_client = CachedLLMClient(_CountingLLMClient(), tmp_path)
+        cached_client.last_usage = LLMUsage(input_tokens=1, cached_input_tokens=0, output_tokens=1)
+
+        other_thread_usages: list[Optional[LLMUsage]] = []
+        thread = threading.Thread(target=lambda: other_thread_usages.append(cached_client.last_usage))
+        thread.start()
+        thread.join()
+
+        assert other_thread_usages == [None]
+        assert cached_client.last_usage == LLMUsage(input_tokens=1, cached_input_tokens=0, output_tokens=1)
+
+    def test_unreadable_entry_is_dropped(self, tmp_path: Path) -> None:
+        llm_client = _CountingLLMClient()
+        cached_client = CachedLLMClient(llm_client, tmp_path)
+        (tmp_path / f'{cached_client.key("prompt")}.json').write_text('not json', encoding='utf-8')
+
+        assert cached_client.complete('prompt') == 'Answer to: prompt'
+        assert llm_client.prompts == ['prompt']
+
+
+class TestLoadParsedSystemPrompt:
+    def setup_method(self) -> None:
+        self._system_prompt = Path('coach/config/coach.md.example').read_text(encoding='utf-8')
+
+    def test_goals_are_parsed_once_while_the_file_is_unchanged(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        path, cache_path = tmp_path / 'coach.md', tmp_path / 'cache' / 'system_prompt.json'
+        path.write_text(self._system_prompt, encoding='utf-8')
+        expected = parse_system_prompt(self._system_prompt.strip())
+
+        assert load_parsed_system_prompt(path, cache_path=cache_path) == expected
+
+        def fail_to_parse(_: str) -> None:
+            raise AssertionError('The goals should have been loaded from the cache')
+
+        monkeypatch.setattr('coach.reasoning.cache.parse_system_prompt', fail_to_parse)
+        assert load_parsed_system_prompt(path, cache_path=cache_path) == expected
+        # Same content with a new modification time is recognized by its hash
+        os.utime(path, ns=(path.stat().st_mtime_ns + 1_000_000_000, path.stat().st_mtime_ns + 1_000_000_000))
+        assert load_parsed_system_prompt(path, cache_path=cache_path) == expected
+
+    def test_edited_file_is_parsed_again(self, tmp_path: Path) -> None:
+        path, cache_path = tmp_path / 'coach.md', tmp_path / 'system_prompt.json'
+        path.write_text(self._system_prompt, encoding='utf-8')
+        load_parsed_system_prompt(path, cache_path=cache_path)
+
+        edited_system_prompt = self._system_prompt.replace('Sub20 5K', 'Sub19 5K').replace('00:20:00', '00:19:00')
+        path.write_text(edited_system_prompt, encoding='utf-8')
+        parsed_system_prompt = load_parsed_system_prompt(path, cache_path=cache_path)
+
+        assert parsed_system_prompt == parse_system_prompt(edited_system_prompt.strip())
+        assert parsed_system_prompt is not None
+        assert parsed_system_prompt.goals[0].name == 'Sub19 5K'
+
+    def test_missing_file_and_unreadable_cache(self, tmp_path: Path) -> None:
+        path, cache_path = tmp_path / 'coach.md', tmp_path / 'system_prompt.json'
+        assert load_parsed_system_prompt(path, cache_path=cache_path) is None
+
+        path.write_text(self._system_prompt, encoding='utf-8')
+        cache_path.write_text('{not json', encoding='utf-8')
+        assert load_parsed_system_prompt(path, cache_path=cache_path) == parse_system_prompt(self._system_prompt.strip())
@@ -0,0 +1,136 @@
+import asyncio
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+from typing import cast
+
+import pytest
+from openai import AsyncOpenAI
+from openai import OpenAI
+from openai.types.responses import Response
+from openai.types.responses import ResponseCompletedEvent
+from openai.types.responses import ResponseTextDeltaEvent
+from openai.types.responses import ResponseUsage
+
+from coach.reasoning.clients import AsyncOpenAILLMClient
+from coach.reasoning.clients import OpenAILLMClient
+from coach.reasoning.clients import retry_delay_seconds
+from coach.reasoning.interface import LLMUsage
+
+
+class _FakeResponses:
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+
+    def create(self, **kwargs: Any) -> object:
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(input_tokens=1_500, input_tokens_details=SimpleNamespace(cached_tokens=1_280), output_tokens=200)
+        if kwargs.get('stream'):
+            return iter([
+                ResponseTextDeltaEvent.model_construct(type='response.output_text.delta', delta='Keep '),
+                ResponseTextDeltaEvent.model_construct(type='response.output_text.delta', delta='going.'),
+                ResponseCompletedEvent.model_construct(type='response.completed', response=Response.model_construct(usage=cast(ResponseUsage, usage))),
+            ])
+        return SimpleNamespace(output_text='Keep going.', usage=usage)
+
+
+def test_complete_reports_cached_input_tokens() -> None:
+    responses = _FakeResponses()
+    llm_client = OpenAILLMClient(client=cast(OpenAI, SimpleNamespace(responses=responses)), model='test-model', prompt_cache_key='coach-chat')
+
+    assert llm_client.last_usage is None
+    assert llm_client.complete('prompt') == 'Keep going.'
+    assert llm_client.last_usage == LLMUsage(input_tokens=1_500, cached_input_tokens=1_280, output_tokens=200)
+    assert responses.requests[0]['prompt_cache_key'] == 'coach-chat'
+
+
+def test_stream_yields_text_deltas_and_reports_usage() -> None:
+    responses = _FakeResponses()
+    llm_client = OpenAILLMClient(client=cast(OpenAI, SimpleNamespace(responses=responses)), model='test-model')
+
+    assert list(llm_client.stream('prompt')) == ['Keep ', 'going.']
+    assert llm_client.last_usage == LLMUsage(input_tokens=1_500, cached_input_tokens=1_280, output_tokens=200)
+    assert responses.requests[0]['stream'] is True
+
+
+class _FailingStreamResponses:
+    """Streams whose first num_failures attempts break after num_deltas_before_failure deltas."""
+
+    def __init__(self, *, num_failures: int, num_deltas_before_failure: int) -> None:
+        self._num_failures = num_failures
+        self._num_deltas_before_failure = num_deltas_before_failure
+        self.num_requests = 0
+
+    def create(self, **kwargs: Any) -> Iterator[ResponseTextDeltaEvent]:
+        self.num_requests += 1
+        fails = self.num_requests <= self._num_failures
+        return self._events(fails=fails)
+
+    def _events(self, *, fails: bool) -> Iterator[ResponseTextDeltaEvent]:
+        for index, delta in enumerate(['Keep ', 'going.']):
+            if fails and index == self._num_deltas_before_failure:
+                raise ConnectionError('Connection reset')
+            yield ResponseTextDeltaEvent.model_construct(type='response.output_text.delta', delta=delta)
+
+
+class TestOpenAILLMClientStream:
+    def test_failure_before_the_first_delta_is_retried(self) -> None:
+        responses = _FailingStreamResponses(num_failures=1, num_deltas_before_failure=0)
+        llm_client = OpenAILLMClient(client=cast(OpenAI, SimpleNamespace(responses=responses)), retry_base_seconds=0.001)
+
+        assert list(llm_client.stream('prompt')) == ['Keep ', 'going.']
+        assert responses.num_requests == 2
+
+    def test_failure_after_the_first_delta_is_not_retried(self) -> None:
+        responses = _FailingStreamResponses(num_failures=1, num_deltas_before_failure=1)
+        llm_client = OpenAILLMClient(client=cast(OpenAI, SimpleNamespace(responses=responses)), retry_base_seconds=0.001)
+        deltas: list[str] = []
+
+        with pytest.raises(ConnectionError, match='Connection reset'):
+            deltas.extend(llm_client.stream('prompt'))
+
+        # A retry would show the already printed text a second time
+        assert deltas == ['Keep ']
+        assert responses.num_requests == 1
+
+    def test_gives_up_after_max_retries(self) -> None:
+        responses = _FailingStreamResponses(num_failures=3, num_deltas_before_failure=0)
+        llm_client = OpenAILLMClient(client=cast(OpenAI, SimpleNamespace(responses=responses)), max_retries=3, retry_base_seconds=0.001)
+
+        with pytest.raises(RuntimeError, match='LLM request failed'):
+            list(llm_client.stream('prompt'))
+        assert responses.num_requests == 3
+
+
+class _FlakyAsyncResponses:
+    def __init__(self, *, num_failures: int) -> None:
+        self._num_failures = num_failures
+        self.num_requests = 0
+
+    async def create(self, **kwargs: Any) -> SimpleNamespace:
+        self.num_requests += 1
+        if self.num_requests <= self._num_failures:
+            raise ConnectionError('Rate limited')
+        return SimpleNamespace(output_text=f'Answer to: {kwargs["input"]}')
+
+
+class TestAsyncOpenAILLMClient:
+    def test_retries_until_success(self) -> None:
+        responses = _FlakyAsyncResponses(num_failures=2)
+        llm_client = AsyncOpenAILLMClient(client=cast(AsyncOpenAI, SimpleNamespace(responses=responses)), max_retries=3, retry_base_seconds=0.001)
+
+        assert asyncio.run(llm_client.complete('prompt')) == 'Answer to: prompt'
+        assert responses.num_requests == 3
+
+    def test_gives_up_after_max_retries(self) -> None:
+        responses = _FlakyAsyncResponses(num_failures=3)
+        llm_client = AsyncOpenAILLMClient(client=cast(AsyncOpenAI, SimpleNamespace(responses=responses)), max_retries=3, retry_base_seconds=0.001)
+
+        with pytest.raises(RuntimeError, match='LLM request failed'):
+            asyncio.run(llm_client.complete('prompt'))
+
+
+def test_retry_delays_grow_exponentially_up_to_the_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr('coach.reasoning.clients.random.uniform', lambda low, high: high)
+
+    assert [retry_delay_seconds(attempt, base_seconds=1.0, max_seconds=10.0) for attempt in range(5)] == [1.0, 2.0, 4.0, 8.0, 10.0]
@@ -8,6 +8,8 @@ from coach.domain.goals import DistanceActivityTrainingGoal
 from coach.domain.goals import TrainingGoal
 from coach.domain.personal_bests import RunningPersonalBest
 from coach.domain.personal_bests import RunningPersonalBestsSummary
+from coach.domain.training_load import TrainingLoadPoint
+from coach.domain.training_load import TrainingLoadSummary
 from coach.domain.training_summaries import ActivitySummary
 from coach.domain.training_summaries import ActivityVolume
 from coach.domain.training_summaries import RecentTrainingHistory
@@ -19,6 +21,7 @@ from coach.reasoning.context import render_recent_training_history
 from coach.reasoning.context import render_running_pbs
 from coach.reasoning.context import render_system_prompt
 from coach.reasoning.context import render_training_goal
+from coach.reasoning.context import render_training_load
 from coach.reasoning.context import render_weekly_activities
 from coach.reasoning.context import render_weekly_summary
 
@@ -325,6 +328,28 @@ Ride: Ride 1
     assert result == expected_result.lstrip()
 
 
+def test_render_training_load() -> None:
+    training_load = TrainingLoadSummary(
+        current=TrainingLoadPoint(day=date(2025, 1, 15), daily_load=85.4, acute_load=62.25, chronic_load=48.0, training_stress_balance=-14.25, acute_chronic_workload_ratio=1.296),
+        previous_points=(
+            TrainingLoadPoint(day=date(2025, 1, 14), daily_load=0.0, acute_load=58.0, chronic_load=47.5, training_stress_balance=-10.5, acute_chronic_workload_ratio=1.221),
+            TrainingLoadPoint(day=date(2024, 12, 18), daily_load=0.0, acute_load=0.0, chronic_load=0.0, training_stress_balance=0.0, acute_chronic_workload_ratio=None),
+        ),
+    )
+
+    result = render_training_load(training_load)
+    expected_result = """
+----------------------------------------
+Training load (ATL = 7-day fatigue, CTL = 42-day fitness, TSB = CTL - ATL form, ACWR = ATL / CTL):
+- Today (2025-01-15): ATL 62.2, CTL 48.0, TSB -14.2, ACWR 1.30 (daily load 85)
+- 1 day ago (2025-01-14): ATL 58.0, CTL 47.5, TSB -10.5, ACWR 1.22 (daily load 0)
+- 28 days ago (2024-12-18): ATL 0.0, CTL 0.0, TSB +0.0, ACWR n/a (daily load 0)
+----------------------------------------
+"""
+
+    assert result == expected_result.strip()
+
+
 def test_render_training_goal_distance_activity() -> None:
     today = datetime.now(tz=UTC).date()
     goal_date = today + timedelta(days=10)
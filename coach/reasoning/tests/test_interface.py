@@ -0,0 +1,20 @@
+import asyncio
+
+import pytest
+
+from coach.tests.utils_for_tests import FakeAsyncLLMClient
+
+
+class TestCompleteMany:
+    def test_completions_keep_prompt_order_within_concurrency_limit(self) -> None:
+        llm_client = FakeAsyncLLMClient()
+        prompts = [f'Question {index}' for index in range(10)]
+
+        completions = asyncio.run(llm_client.complete_many(prompts, max_concurrency=3))
+
+        assert completions == [f'Answer to: Question {index}' for index in range(10)]
+        assert llm_client.max_in_flight == 3
+
+    def test_rejects_non_positive_concurrency(self) -> None:
+        with pytest.raises(ValueError, match='max_concurrency'):
+            asyncio.run(FakeAsyncLLMClient().complete_many(['Question'], max_concurrency=0))
@@ -0,0 +1,10 @@
+from coach.reasoning.prompts import build_coach_prompt_prefix
+from coach.reasoning.prompts import build_coach_prompt_suffix
+
+
+def test_prefix_holds_the_static_parts_and_suffix_the_turn() -> None:
+    prefix = build_coach_prompt_prefix(running_pbs='PBs', rendered_recent_training_history='History', rendered_training_load='Load', rendered_system_prompt='Goals')
+    suffix = build_coach_prompt_suffix(user_prompt='How was my week?', chat_history='You: Hi')
+
+    assert prefix.endswith('User instructions and goals:\nGoals\nTraining context:\nHistory\nTraining load:\nLoad\nRunning PBs:\nPBs')
+    assert suffix == 'Conversation so far:\nYou: Hi\nUser question:\nHow was my week?\nYour answer: <response>'
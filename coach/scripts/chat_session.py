@@ -0,0 +1,118 @@
+"""Interactive and batch coaching sessions, kept apart from the CLI definitions so that only `coach chat` loads openai and numpy."""
+import asyncio
+from collections.abc import Iterator
+from collections.abc import Sequence
+from datetime import UTC
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from coach.builders.coach_context import load_coach_context
+from coach.domain.chat import ChatHistory
+from coach.domain.chat import ChatTurn
+from coach.persistence.sqlite.database import ConnectionProfile
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.reasoning.adapter import LLMCoachReasoner
+from coach.reasoning.cache import CachedLLMClient
+from coach.reasoning.clients import AsyncOpenAILLMClient
+from coach.reasoning.clients import OpenAILLMClient
+from coach.reasoning.interface import LLMClient
+
+
+class Coach:
+    def __init__(self, model: str, num_history_weeks: int, use_llm_cache: bool = True, show_usage: bool = False, history_max_tokens: int = 1_500) -> None:
+        self._model = model
+        self._show_usage = show_usage
+
+        self._db = Database('coach.db', profile=ConnectionProfile.from_env())
+        self._activity_repo = SQLiteActivityRepository(self._db)
+
+        context = load_coach_context(self._activity_repo, num_history_weeks=num_history_weeks, generated_at=datetime.now(tz=UTC))
+        self._recent_training_history = context.recent_training_history
+        self._training_load = context.training_load
+        self._pbs = context.running_pbs
+
+        self._llm_client: LLMClient = OpenAILLMClient(model=self._model, prompt_cache_key='coach-chat')
+        self._response_cache: Optional[CachedLLMClient] = None
+        if use_llm_cache:
+            self._response_cache = CachedLLMClient(self._llm_client, Path('.llm_cache'), namespace=self._model)
+            self._llm_client = self._response_cache
+        self._reasoner = LLMCoachReasoner(self._llm_client, system_prompt_cache_path=Path('.coach_cache/system_prompt.json'))
+        self._history = ChatHistory(max_turns=6, max_tokens=history_max_tokens, max_summary_tokens=history_max_tokens // 5)
+
+    def run_chat_loop(self) -> None:
+        typer.echo('Coach ready. Type your questions (Ctrl+C to exit).\n')
+
+        while True:
+            user_input = self._get_user_input()
+            if user_input is None:
+                break
+
+            typer.echo('\nCoach:\n')
+            for delta in self._stream_coach_response(user_input):
+                typer.echo(delta, nl=False)
+            typer.echo('\n')
+            if self._show_usage:
+                self._echo_usage()
+
+    def _echo_usage(self) -> None:
+        usage = self._llm_client.last_usage
+        if usage is None:
+            typer.echo('[no token usage reported, e.g. answered from the local response cache]\n')
+        else:
+            typer.echo(f'[{usage.input_tokens} input tokens ({usage.cached_input_tokens} cached), {usage.output_tokens} output tokens]\n')
+
+    def _get_user_input(self) -> Optional[str]:
+        try:
+            user_input = typer.prompt('You')
+            self._history.add(ChatTurn(role='user', content=user_input))
+            return user_input
+        except (EOFError, KeyboardInterrupt):
+            typer.echo('\nGoodbye.')
+            return None
+
+    def _stream_coach_response(self, user_input: str) -> Iterator[str]:
+        """Yield the answer as it is generated, the full answer is recorded in the chat history once it is complete."""
+        chat_history = None if self._history.has_no_coach_response() else self._history.render()
+        deltas: list[str] = []
+        for delta in self._reasoner.chat_stream(
+            running_pbs=self._pbs,
+            recent_training_history=self._recent_training_history,
+            user_prompt=user_input,
+            chat_history=chat_history,
+            training_load=self._training_load,
+        ):
+            deltas.append(delta)
+            yield delta
+        self._history.add(ChatTurn(role='coach', content=''.join(deltas)))
+
+    def answer_many(self, questions: Sequence[str], *, max_concurrency: int) -> list[str]:
+        """
+        Answer independent questions (no chat history) concurrently. The prompts share their prefix, so the provider can serve it from its prompt cache.
+
+        With the response cache, questions answered before are read from it and only the others are sent, their answers are stored in it.
+        """
+        prompts = [
+            self._reasoner.build_prompt(
+                running_pbs=self._pbs,
+                recent_training_history=self._recent_training_history,
+                user_prompt=question,
+                chat_history=None,
+                training_load=self._training_load,
+            )
+            for question in questions
+        ]
+        cache = self._response_cache
+        answers = [None if cache is None else cache.get(cache.key(prompt)) for prompt in prompts]
+        missing_indices = [index for index, answer in enumerate(answers) if answer is None]
+        if missing_indices:
+            llm_client = AsyncOpenAILLMClient(model=self._model, prompt_cache_key='coach-chat')
+            new_answers = asyncio.run(llm_client.complete_many([prompts[index] for index in missing_indices], max_concurrency=max_concurrency))
+            for index, answer in zip(missing_indices, new_answers, strict=True):
+                answers[index] = answer
+                if cache is not None:
+                    cache.put(cache.key(prompts[index]), answer)
+        return [answer for answer in answers if answer is not None]
@@ -1,71 +1,16 @@
-from datetime import UTC
-from datetime import datetime
-from typing import Optional
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 
-from coach.builders.personal_bests import build_running_personal_bests_summary
-from coach.builders.recent_training_history import build_recent_training_history
-from coach.domain.chat import ChatHistory
-from coach.domain.chat import ChatTurn
-from coach.persistence.sqlite.database import Database
-from coach.persistence.sqlite.repositories import SQLiteActivityRepository
-from coach.reasoning.adapter import LLMCoachReasoner
-from coach.reasoning.clients import OpenAILLMClient
+if TYPE_CHECKING:
+    from coach.scripts.chat_session import Coach
 
 coach_app = typer.Typer(help='Coach reasoning commands')
 
 
-class Coach:
-    def __init__(self, model: str, num_history_weeks: int) -> None:
-        self._model = model
-
-        self._db = Database('coach.db')
-        self._activity_repo = SQLiteActivityRepository(self._db)
-
-        all_activities = self._activity_repo.list_all()
-
-        self._recent_training_history = build_recent_training_history(
-            activities=all_activities,
-            generated_at=datetime.now(tz=UTC),
-            num_history_weeks=num_history_weeks,
-        )
-
-        self._pbs = build_running_personal_bests_summary(activities=all_activities)
-
-        self._llm_client = OpenAILLMClient(model=self._model)
-        self._reasoner = LLMCoachReasoner(self._llm_client)
-        self._history = ChatHistory(max_turns=6)
-
-    def run_chat_loop(self) -> None:
-        typer.echo('Coach ready. Type your questions (Ctrl+C to exit).\n')
-
-        while True:
-            user_input = self._get_user_input()
-            if user_input is None:
-                break
-            coach_response = self._get_coach_response(user_input)
-
-            typer.echo('\nCoach:\n')
-            typer.echo(coach_response)
-            typer.echo('')
-
-    def _get_user_input(self) -> Optional[str]:
-        try:
-            user_input = typer.prompt('You')
-            self._history.add(ChatTurn(role='user', content=user_input))
-            return user_input
-        except (EOFError, KeyboardInterrupt):
-            typer.echo('\nGoodbye.')
-            return None
-
-    def _get_coach_response(self, user_input: str) -> str:
-        chat_history = None if self._history.has_no_coach_response() else self._history.render()
-        coach_response = self._reasoner.chat(running_pbs=self._pbs, recent_training_history=self._recent_training_history, user_prompt=user_input, chat_history=chat_history)
-        self._history.add(ChatTurn(role='coach', content=coach_response))
-        return coach_response
-
-
 @coach_app.callback(invoke_without_command=True)
 def chat_callback(
         ctx: typer.Context,
@@ -74,9 +19,34 @@ def chat_callback(
             default=2,
             help='Number of weeks used to build a summary of the current training state. Weeks are indexed from monday and the current week is always included.',
         ),
+        llm_cache: bool = typer.Option(True, help='Answer prompts identical to earlier ones from the local response cache instead of calling the API, in the chat and in batch'),
+        show_usage: bool = typer.Option(False, help='Print the input (and provider-cached input) and output tokens of every answer'),
+        history_max_tokens: int = typer.Option(1_500, min=100, help='Approximate token budget of the conversation history in the prompt, older turns are folded into a short summary'),
 ) -> None:
-    coach = Coach(model=model, num_history_weeks=num_history_weeks)
-    ctx.obj = coach
+    # Imported here, so that other subcommands do not load openai and numpy
+    from coach.scripts.chat_session import Coach
 
+    create_coach = partial(Coach, model=model, num_history_weeks=num_history_weeks, use_llm_cache=llm_cache, show_usage=show_usage, history_max_tokens=history_max_tokens)
     if ctx.invoked_subcommand is None:
-        coach.run_chat_loop()
+        create_coach().run_chat_loop()
+    else:
+        # Subcommands build the coach themselves once their own options are validated, loading the context is not free
+        ctx.obj = create_coach
+
+
+@coach_app.command('batch')
+def batch_command(
+        ctx: typer.Context,
+        questions_file: str = typer.Option(..., help='Text file with one question per line'),
+        max_concurrency: int = typer.Option(4, min=1, help='Maximum number of requests in flight at once'),
+) -> None:
+    """Answer every question of a file independently and in parallel, e.g. nightly reports for several goals or an evaluation suite."""
+    questions_path = Path(questions_file)
+    if not questions_path.is_file():
+        raise typer.BadParameter(f'{questions_file} is not a file', param_hint='--questions-file')
+    questions = [line.strip() for line in questions_path.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+    create_coach: Callable[[], Coach] = ctx.obj
+    coach = create_coach()
+    for question, answer in zip(questions, coach.answer_many(questions, max_concurrency=max_concurrency), strict=True):
+        typer.echo(f'You: {question}\n\nCoach:\n{answer}\n')
@@ -1,20 +1,21 @@
 import typer
 
-from coach.builders.personal_bests import build_running_personal_bests_summary
-from coach.persistence.sqlite.database import Database
-from coach.persistence.sqlite.repositories import SQLiteActivityRepository
-from coach.reasoning.context import render_running_pbs
-
 info_app = typer.Typer(help='Activity history information')
 
 
 @info_app.callback(invoke_without_command=True)
 def info_callback(pbs: bool = typer.Option(False, help='Summarize running personal bests within the stored data')) -> None:
-    db = Database('coach.db')
-    activity_repo = SQLiteActivityRepository(db)
+    # Imported here rather than at module level, so that loading the CLI stays cheap for every other subcommand
+    from coach.builders.personal_bests import build_running_personal_bests_summary_from_best_efforts
+    from coach.domain.activity import SportType
+    from coach.persistence.sqlite.database import ConnectionProfile
+    from coach.persistence.sqlite.database import Database
+    from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+    from coach.reasoning.context import render_running_pbs
 
-    all_activities = activity_repo.list_all()
+    db = Database('coach.db', profile=ConnectionProfile.from_env())
+    activity_repo = SQLiteActivityRepository(db)
 
     if pbs:
-        pbs_summary = build_running_personal_bests_summary(activities=all_activities)
+        pbs_summary = build_running_personal_bests_summary_from_best_efforts(activity_repo.list_best_efforts_per_distance(sport_type=SportType.RUN.value))
         typer.echo(render_running_pbs(pbs_summary))
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import typer
+
+serve_app = typer.Typer(help='Long-running coach server')
+
+
+@serve_app.callback(invoke_without_command=True)
+def serve_callback(
+        host: str = typer.Option('127.0.0.1', help='Address to listen on, keep it on localhost unless the network is trusted'),
+        port: int = typer.Option(8765, help='Port to listen on'),
+        model: str = typer.Option(default='gpt-5-nano', help='Open AI model'),
+        num_history_weeks: int = typer.Option(default=2, help='Number of weeks used to build a summary of the current training state'),
+        llm_cache: bool = typer.Option(True, help='Answer prompts identical to earlier ones from the local response cache instead of calling the API'),
+        history_max_tokens: int = typer.Option(1_500, min=100, help='Approximate token budget of the conversation history of each session'),
+) -> None:
+    """Keep the training context warm in memory and answer chat and info requests over localhost HTTP."""
+    # Imported here rather than at module level, so that loading the CLI stays cheap for every other subcommand
+    from coach.persistence.sqlite.database import ConnectionProfile
+    from coach.persistence.sqlite.database import Database
+    from coach.reasoning.adapter import LLMCoachReasoner
+    from coach.reasoning.cache import CachedLLMClient
+    from coach.reasoning.clients import OpenAILLMClient
+    from coach.reasoning.interface import LLMClient
+    from coach.server.api import create_server
+    from coach.server.context import WarmCoachContext
+    from coach.server.service import CoachService
+
+    # Request threads share the connection, WarmCoachContext serializes its use
+    database = Database('coach.db', profile=ConnectionProfile.from_env(), check_same_thread=False)
+    context = WarmCoachContext(database, num_history_weeks=num_history_weeks)
+    context.get()
+
+    llm_client: LLMClient = OpenAILLMClient(model=model, prompt_cache_key='coach-chat')
+    if llm_cache:
+        llm_client = CachedLLMClient(llm_client, Path('.llm_cache'), namespace=model)
+    reasoner = LLMCoachReasoner(llm_client, system_prompt_cache_path=Path('.coach_cache/system_prompt.json'))
+    service = CoachService(context, reasoner, llm_client, history_max_tokens=history_max_tokens)
+
+    server = create_server(service, host=host, port=port)
+    typer.echo(f'Coach serving on http://{host}:{server.server_address[1]} (Ctrl+C to stop).')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo('\nStopping.')
+    finally:
+        server.server_close()
@@ -1,34 +1,113 @@
+from __future__ import annotations
+
 from datetime import UTC
 from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Optional
 
 import typer
 
-from coach.ingestion.strava.client import StravaClient
-from coach.ingestion.strava.mapper import StravaMapper
-from coach.persistence.sqlite.database import Database
-from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.ingestion.pipeline import DEFAULT_BATCH_SIZE
+from coach.utils import parse_time_window
+
+if TYPE_CHECKING:
+    from coach.ingestion.strava.sync import StravaSync
 
 sync_app = typer.Typer(help='Data ingestion commands')
 
 
 @sync_app.command('strava')
-def sync_strava(fresh: bool = typer.Option(False, help='Force a fresh sync')) -> None:
-    client = StravaClient()
+def sync_strava(
+        fresh: bool = typer.Option(False, help='Force a fresh sync'),
+        resume: bool = typer.Option(False, help='Continue an interrupted sync from its last saved page'),
+        batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, help='Number of activities committed to the database at once'),
+        refresh_window: Optional[str] = typer.Option(
+            None,
+            help="Instead of fetching new activities, re-fetch activities started within this window (e.g. '14d') and update the ones edited on Strava",
+        ),
+        wait_for_daily_reset: bool = typer.Option(False, help='Once the daily Strava rate limit is reached, wait for the next UTC day instead of stopping (the sync can be resumed with --resume)'),
+) -> None:
+    if refresh_window is not None and (fresh or resume):
+        raise typer.BadParameter('--refresh-window cannot be combined with --fresh or --resume')
+    try:
+        refresh_window_delta = None if refresh_window is None else parse_time_window(refresh_window)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint='--refresh-window') from e
+
+    # Imported here rather than at module level, so that only syncing loads requests and the Strava client
+    from coach.ingestion.strava.cache import HttpResponseCache
+    from coach.ingestion.strava.client import StravaClient
+    from coach.ingestion.strava.mapper import StravaMapper
+    from coach.ingestion.strava.rate_limit import StravaRateLimiter
+    from coach.ingestion.strava.rate_limit import StravaRateLimitError
+    from coach.ingestion.strava.sync import StravaSync
+    from coach.persistence.sqlite.database import ConnectionProfile
+    from coach.persistence.sqlite.database import Database
+    from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+    from coach.persistence.sqlite.repositories import SQLiteSyncStateRepository
+
+    client = StravaClient(
+        rate_limiter=StravaRateLimiter(state_path=Path('strava_rate_limit.json'), wait_for_daily_reset=wait_for_daily_reset),
+        cache=HttpResponseCache(Path('.strava_cache')),
+    )
     mapper = StravaMapper()
 
-    db = Database('coach.db')
+    db = Database('coach.db', profile=ConnectionProfile.from_env())
     activity_repo = SQLiteActivityRepository(db)
+    sync_state_repo = SQLiteSyncStateRepository(db)
     if fresh:
         typer.echo('Dropping activities table...')
         activity_repo.reset_table()
-    last_synced_activity_ts = activity_repo.last_activity_timestamp() or 0
-    last_synced_date = datetime.fromtimestamp(last_synced_activity_ts, tz=UTC).date()
+        sync_state_repo.reset_table()
+
+    strava_sync = StravaSync(client=client, mapper=mapper, activity_repo=activity_repo, sync_state_repo=sync_state_repo, batch_size=batch_size)
+
+    if refresh_window_delta is not None:
+        typer.echo(f'Refreshing Strava activities started within the last {refresh_window}...')
+        _refresh_strava(strava_sync, refresh_window_delta)
+        return
+
+    unfinished_state = strava_sync.unfinished_state()
+    if resume and unfinished_state is None:
+        typer.echo('No interrupted sync to resume, running a regular sync.')
+    elif not resume and unfinished_state is not None:
+        typer.echo('Previous sync was interrupted, restarting it from its first page (use --resume to skip already synced pages).')
 
-    typer.echo(f'Fetching activities from Strava from {last_synced_date} (last synced date) onwards...')
-    raw_unsynced_activities = list(client.list_activities(detailed=True, after=last_synced_activity_ts))
-    unsynced_activities = mapper.map_activities(raw_unsynced_activities)
+    initial_state = strava_sync.initial_state(resume=resume)
+    last_synced_date = datetime.fromtimestamp(initial_state.after, tz=UTC).date()
+    typer.echo(f'Fetching activities from Strava from {last_synced_date} (last synced date) onwards, starting after page {initial_state.last_completed_page}...')
 
-    typer.echo(f'Saving {len(unsynced_activities)} new activities to database...')
-    activity_repo.save_many(unsynced_activities)
+    num_saved = 0
+    try:
+        for batch in strava_sync.run(resume=resume):
+            num_saved += len(batch)
+            typer.echo(f'Saved {num_saved} new activities (up to {batch[-1].start_time_utc.date()}).')
+    except StravaRateLimitError as e:
+        typer.echo(f'{e} Stopped after saving {num_saved} new activities, continue with --resume once the limit resets.')
+        raise typer.Exit(code=1) from e
 
     typer.echo(f'{activity_repo.count()} total activities stored in the database.')
+
+
+def _refresh_strava(strava_sync: StravaSync, refresh_window: timedelta) -> None:
+    num_inserted, num_updated, num_unchanged = 0, 0, 0
+    for result in strava_sync.refresh(window=refresh_window):
+        num_inserted += result.num_inserted
+        num_updated += result.num_updated
+        num_unchanged += result.num_unchanged
+
+    typer.echo(f'Updated {num_updated} edited activities, added {num_inserted} new ones, {num_unchanged} were unchanged.')
+
+
+@sync_app.command('rebuild-aggregates')
+def rebuild_aggregates() -> None:
+    """Recompute the pre-aggregated weekly volumes from the stored activities."""
+    from coach.persistence.sqlite.database import ConnectionProfile
+    from coach.persistence.sqlite.database import Database
+    from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+
+    activity_repo = SQLiteActivityRepository(Database('coach.db', profile=ConnectionProfile.from_env()))
+    activity_repo.rebuild_weekly_volumes()
+    typer.echo(f'Rebuilt weekly volumes for {len(activity_repo.list_weekly_volumes())} weeks.')
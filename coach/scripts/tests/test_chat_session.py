@@ -0,0 +1,50 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from coach.scripts.chat_session import Coach
+from coach.tests.utils_for_tests import FakeStreamingLLMClient
+
+
+class _RecordingStreamingLLMClient(FakeStreamingLLMClient):
+    """Records every generated delta in a log shared with the terminal output, to tell when each delta was echoed."""
+
+    def __init__(self, log: list[str]) -> None:
+        super().__init__('Keep the easy runs easy.')
+        self._log = log
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for delta in super().stream(prompt):
+            self._log.append(f'generated {delta!r}')
+            yield delta
+
+
+def test_chat_loop_echoes_deltas_as_they_arrive_and_records_the_answer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    log: list[str] = []
+    llm_client = _RecordingStreamingLLMClient(log)
+    monkeypatch.setattr('coach.scripts.chat_session.OpenAILLMClient', lambda **_: llm_client)
+
+    questions = iter(['How was my week?', 'And tomorrow?'])
+
+    def prompt(*_: Any) -> str:
+        question = next(questions, None)
+        if question is None:
+            raise EOFError
+        return question
+
+    def echo(message: str = '', nl: bool = True) -> None:
+        if not nl:
+            log.append(f'echoed {message!r}')
+
+    monkeypatch.setattr('coach.scripts.chat_session.typer.prompt', prompt)
+    monkeypatch.setattr('coach.scripts.chat_session.typer.echo', echo)
+
+    Coach(model='test-model', num_history_weeks=1, use_llm_cache=False).run_chat_loop()
+
+    # Each delta reaches the terminal before the next one is generated
+    deltas = ['Keep ', 'the ', 'easy ', 'runs ', 'easy.']
+    assert log[:10] == [entry for delta in deltas for entry in (f'generated {delta!r}', f'echoed {delta!r}')]
+    assert llm_client.prompts[1].split('\nConversation so far:\n')[1].startswith('User: How was my week?\nCoach: Keep the easy runs easy.\nUser: And tomorrow?')
@@ -0,0 +1,91 @@
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import ClassVar
+
+from coach.server.service import CoachService
+
+logger = logging.getLogger(__name__)
+
+_MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class CoachRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of `coach serve`.
+
+    GET  /health    -> {"status": "ok"}
+    GET  /info/pbs  -> {"running_pbs": "<rendered PBs>"}
+    POST /chat      {"question": "...", "session_id": "..." (optional)} -> {"answer": "..."}
+    """
+
+    service: ClassVar[CoachService]
+
+    def do_GET(self) -> None:  # noqa: N802
+        match self.path:
+            case '/health':
+                self._send_json(HTTPStatus.OK, {'status': 'ok'})
+            case '/info/pbs':
+                self._send_json(HTTPStatus.OK, {'running_pbs': self.service.running_pbs()})
+            case _:
+                self._send_json(HTTPStatus.NOT_FOUND, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path != '/chat':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f'Unknown path {self.path}'})
+            return
+
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'Content-Length must be a non-negative integer'})
+            return
+        if content_length > _MAX_REQUEST_BYTES:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'Request body is too large'})
+            return
+        try:
+            body = json.loads(self.rfile.read(content_length))
+        except ValueError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'Request body is not valid JSON'})
+            return
+
+        question, session_id = (body.get('question'), body.get('session_id')) if isinstance(body, dict) else (None, None)
+        if not isinstance(question, str) or not question.strip() or not isinstance(session_id, (str, type(None))):
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'Expected {"question": str, "session_id": str (optional)}'})
+            return
+
+        try:
+            answer = self.service.chat(question.strip(), session_id=session_id)
+        except RuntimeError as e:
+            # The LLM client raises RuntimeError once its retries are used up
+            logger.exception('Chat request failed')
+            self._send_json(HTTPStatus.BAD_GATEWAY, {'error': str(e)})
+            return
+        except Exception:
+            # Anything else (e.g. an OSError of the response cache) must still answer, not drop the connection
+            logger.exception('Chat request failed unexpectedly')
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal server error'})
+            return
+        self._send_json(HTTPStatus.OK, {'answer': answer})
+
+    def _send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.info('%s - %s', self.address_string(), format % args)
+
+
+def create_server(service: CoachService, *, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server answering requests from service, each in its own thread. Port 0 picks a free port (see server.server_address)."""
+    handler = type('BoundCoachRequestHandler', (CoachRequestHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,42 @@
+import threading
+from collections.abc import Callable
+from datetime import UTC
+from datetime import datetime
+from typing import Optional
+
+from coach.builders.coach_context import CoachContext
+from coach.builders.coach_context import load_coach_context
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+
+
+def _now_utc() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+class WarmCoachContext:
+    """
+    CoachContext kept in memory by a long-running process, rebuilt only when it is stale.
+
+    It is stale after another connection committed to the database (e.g. `coach sync` in another process), detected with one
+    PRAGMA data_version query per access, or once the day changed, since weeks and "days ago" are relative to the current date.
+    The same context object is returned until then, so the prompt prefix rendered from it stays warm as well.
+    """
+
+    def __init__(self, database: Database, *, num_history_weeks: int, clock: Callable[[], datetime] = _now_utc) -> None:
+        self._database = database
+        self._activity_repo = SQLiteActivityRepository(database)
+        self._num_history_weeks = num_history_weeks
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._context: Optional[CoachContext] = None
+        self._data_version: Optional[int] = None
+
+    def get(self) -> CoachContext:
+        with self._lock:
+            now = self._clock()
+            data_version = self._database.data_version()
+            if self._context is None or data_version != self._data_version or now.date() != self._context.generated_at.date():
+                self._context = load_coach_context(self._activity_repo, num_history_weeks=self._num_history_weeks, generated_at=now)
+                self._data_version = data_version
+            return self._context
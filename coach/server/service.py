@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from coach.domain.chat import ChatHistory
+from coach.domain.chat import ChatTurn
+from coach.reasoning.adapter import LLMCoachReasoner
+from coach.reasoning.context import render_running_pbs
+from coach.reasoning.interface import LLMClient
+from coach.server.context import WarmCoachContext
+
+
+class CoachService:
+    """
+    Chat and info requests answered from a warm context, with one chat history per session id.
+
+    Prompts are built under a lock, the reasoner memoizes the prompt prefix, while the LLM calls themselves run concurrently.
+    Requests without a session id are answered without any chat history.
+    """
+
+    def __init__(
+        self,
+        context: WarmCoachContext,
+        reasoner: LLMCoachReasoner,
+        llm_client: LLMClient,
+        *,
+        history_max_tokens: int = 1_500,
+        max_sessions: int = 100,
+    ) -> None:
+        self._context = context
+        self._reasoner = reasoner
+        self._llm_client = llm_client
+        self._history_max_tokens = history_max_tokens
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[str, ChatHistory] = OrderedDict()
+
+    def _get_history(self, session_id: Optional[str]) -> ChatHistory:
+        history = self._sessions.get(session_id) if session_id is not None else None
+        if history is None:
+            history = ChatHistory(max_turns=6, max_tokens=self._history_max_tokens, max_summary_tokens=self._history_max_tokens // 5)
+        if session_id is not None:
+            self._sessions[session_id] = history
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        return history
+
+    def chat(self, question: str, *, session_id: Optional[str] = None) -> str:
+        context = self._context.get()
+
+        with self._lock:
+            history = self._get_history(session_id)
+            user_turn = ChatTurn(role='user', content=question)
+            history.add(user_turn)
+            prompt = self._reasoner.build_prompt(
+                running_pbs=context.running_pbs,
+                recent_training_history=context.recent_training_history,
+                user_prompt=question,
+                chat_history=None if history.has_no_coach_response() else history.render(),
+                training_load=context.training_load,
+            )
+
+        try:
+            answer = self._llm_client.complete(prompt)
+        except Exception:
+            # A retried question must not find itself unanswered in the history
+            with self._lock:
+                history.discard(user_turn)
+            raise
+        with self._lock:
+            history.add(ChatTurn(role='coach', content=answer))
+        return answer
+
+    def running_pbs(self) -> str:
+        return render_running_pbs(self._context.get().running_pbs)
+
+    @property
+    def num_sessions(self) -> int:
+        return len(self._sessions)
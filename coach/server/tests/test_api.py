@@ -0,0 +1,83 @@
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Generator
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from coach.server.api import create_server
+from coach.server.tests.test_service import create_service
+from coach.tests.utils_for_tests import FakeStreamingLLMClient
+
+
+class _BrokenCacheLLMClient(FakeStreamingLLMClient):
+    def complete(self, prompt: str) -> str:
+        raise OSError('No space left on device')
+
+
+@contextmanager
+def _serve(tmp_path: Path, llm_client: FakeStreamingLLMClient) -> Generator[str]:
+    server = create_server(create_service(tmp_path, llm_client), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(tmp_path: Path) -> Iterator[str]:
+    with _serve(tmp_path, FakeStreamingLLMClient('Keep the easy runs easy.')) as url:
+        yield url
+
+
+def _request(url: str, payload: Any = None) -> tuple[int, dict[str, Any]]:
+    data = None if payload is None else (payload if isinstance(payload, bytes) else json.dumps(payload).encode())
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=5) as response:  # noqa: S310
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_health_and_info(base_url: str) -> None:
+    assert _request(f'{base_url}/health') == (200, {'status': 'ok'})
+
+    status, body = _request(f'{base_url}/info/pbs')
+    assert status == 200
+    assert 'Running personal bests:' in body['running_pbs']
+
+
+def test_chat(base_url: str) -> None:
+    assert _request(f'{base_url}/chat', {'question': 'How was my week?', 'session_id': 'a'}) == (200, {'answer': 'Keep the easy runs easy.'})
+
+
+def test_invalid_requests(base_url: str) -> None:
+    assert _request(f'{base_url}/chat', b'{not json')[0] == 400
+    assert _request(f'{base_url}/chat', {'question': ''})[0] == 400
+    assert _request(f'{base_url}/chat', {'question': 'Hi', 'session_id': 1})[0] == 400
+    assert _request(f'{base_url}/unknown')[0] == 404
+
+
+@pytest.mark.parametrize('content_length', ['abc', '-1'])
+def test_invalid_content_length(base_url: str, content_length: str) -> None:
+    connection = http.client.HTTPConnection(base_url.removeprefix('http://'), timeout=5)
+    connection.putrequest('POST', '/chat')
+    connection.putheader('Content-Length', content_length)
+    connection.endheaders()
+    response = connection.getresponse()
+
+    assert response.status == 400
+    assert json.loads(response.read()) == {'error': 'Content-Length must be a non-negative integer'}
+    connection.close()
+
+
+def test_unexpected_error_is_answered_with_500(tmp_path: Path) -> None:
+    with _serve(tmp_path, _BrokenCacheLLMClient()) as base_url:
+        assert _request(f'{base_url}/chat', {'question': 'How was my week?'}) == (500, {'error': 'Internal server error'})
@@ -0,0 +1,43 @@
+from dataclasses import replace
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.server.context import WarmCoachContext
+from coach.tests.utils_for_tests import SAMPLE_RUN
+
+
+class TestWarmCoachContext:
+    def setup_method(self) -> None:
+        self._now = datetime(2025, 1, 2, 12, tzinfo=UTC)
+
+    def _clock(self) -> datetime:
+        return self._now
+
+    def test_context_is_reused_until_another_connection_commits(self, tmp_path: Path) -> None:
+        writer = SQLiteActivityRepository(Database(tmp_path / 'coach.db'))
+        writer.save_many([SAMPLE_RUN])
+        warm_context = WarmCoachContext(Database(tmp_path / 'coach.db'), num_history_weeks=1, clock=self._clock)
+
+        context = warm_context.get()
+        assert warm_context.get() is context
+        assert context.recent_training_history.current_week_summary.volume_by_sport[SAMPLE_RUN.sport_type].num_activities == 1
+
+        writer.save_many([replace(SAMPLE_RUN, activity_id=2, source_activity_id=2)])
+        refreshed_context = warm_context.get()
+
+        assert refreshed_context is not context
+        assert refreshed_context.recent_training_history.current_week_summary.volume_by_sport[SAMPLE_RUN.sport_type].num_activities == 2
+        assert warm_context.get() is refreshed_context
+
+    def test_context_is_rebuilt_on_a_new_day(self, tmp_path: Path) -> None:
+        warm_context = WarmCoachContext(Database(tmp_path / 'coach.db'), num_history_weeks=1, clock=self._clock)
+        context = warm_context.get()
+
+        self._now += timedelta(hours=6)
+        assert warm_context.get() is context
+        self._now += timedelta(hours=6)
+        assert warm_context.get().generated_at == self._now
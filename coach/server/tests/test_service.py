@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from coach.persistence.sqlite.database import Database
+from coach.persistence.sqlite.repositories import SQLiteActivityRepository
+from coach.reasoning.adapter import LLMCoachReasoner
+from coach.server.context import WarmCoachContext
+from coach.server.service import CoachService
+from coach.tests.utils_for_tests import SAMPLE_RUN
+from coach.tests.utils_for_tests import FakeStreamingLLMClient
+
+
+def create_service(tmp_path: Path, llm_client: FakeStreamingLLMClient, *, max_sessions: int = 100) -> CoachService:
+    database = Database(tmp_path / 'coach.db', check_same_thread=False)
+    SQLiteActivityRepository(database).save_many([SAMPLE_RUN])
+    reasoner = LLMCoachReasoner(llm_client, user_system_prompt_path=tmp_path / 'coach.md')
+    return CoachService(WarmCoachContext(database, num_history_weeks=1), reasoner, llm_client, max_sessions=max_sessions)
+
+
+class _FailingLLMClient(FakeStreamingLLMClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail_next = False
+
+    def complete(self, prompt: str) -> str:
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError('LLM request failed')
+        return super().complete(prompt)
+
+
+class TestCoachService:
+    def test_sessions_keep_their_own_history_and_share_the_prompt_prefix(self, tmp_path: Path) -> None:
+        llm_client = FakeStreamingLLMClient('Keep the easy runs easy.')
+        service = create_service(tmp_path, llm_client)
+
+        assert service.chat('How was my week?', session_id='a') == 'Keep the easy runs easy.'
+        service.chat('And tomorrow?', session_id='a')
+        service.chat('Should I race?', session_id='b')
+
+        first_prompt, follow_up_prompt, other_session_prompt = llm_client.prompts
+        prefix = first_prompt.split('\nUser question:')[0]
+        assert follow_up_prompt.startswith(prefix + '\nConversation so far:\nUser: How was my week?\nCoach: Keep the easy runs easy.\nUser: And tomorrow?')
+        assert other_session_prompt == prefix + '\nUser question:\nShould I race?\nYour answer: <response>'
+
+    def test_failed_question_is_removed_from_the_history(self, tmp_path: Path) -> None:
+        llm_client = _FailingLLMClient()
+        service = create_service(tmp_path, llm_client)
+        service.chat('How was my week?', session_id='a')
+        llm_client.fail_next = True
+
+        with pytest.raises(RuntimeError, match='LLM request failed'):
+            service.chat('And tomorrow?', session_id='a')
+        service.chat('And tomorrow?', session_id='a')
+
+        assert llm_client.prompts[-1].count('User: And tomorrow?') == 1
+
+    def test_requests_without_session_have_no_history(self, tmp_path: Path) -> None:
+        llm_client = FakeStreamingLLMClient()
+        service = create_service(tmp_path, llm_client)
+
+        service.chat('How was my week?')
+        service.chat('How was my week?')
+
+        assert llm_client.prompts[0] == llm_client.prompts[1]
+        assert service.num_sessions == 0
+
+    def test_least_recently_used_sessions_are_dropped(self, tmp_path: Path) -> None:
+        service = create_service(tmp_path, FakeStreamingLLMClient(), max_sessions=2)
+        for session_id in ('a', 'b', 'a', 'c'):
+            service.chat('Hi', session_id=session_id)
+
+        assert service.num_sessions == 2
+
+    def test_running_pbs(self, tmp_path: Path) -> None:
+        assert 'Running personal bests:' in create_service(tmp_path, FakeStreamingLLMClient()).running_pbs()
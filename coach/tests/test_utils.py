@@ -4,12 +4,15 @@ from datetime import timedelta
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+import pytest
+
 from coach.utils import build_sqlite_where_clause
 from coach.utils import days_ago
 from coach.utils import format_total_seconds
 from coach.utils import parse_distance_km
 from coach.utils import parse_file
 from coach.utils import parse_private_notes_activity_summary
+from coach.utils import parse_time_window
 from coach.utils import parse_utc_datetime
 from coach.utils import weeks_and_days_until
 
@@ -26,6 +29,17 @@ def test_parse_duration() -> None:
     assert format_total_seconds(total_seconds=65) == '00:01:05'
 
 
+def test_parse_time_window() -> None:
+    assert parse_time_window('14d') == timedelta(days=14)
+    assert parse_time_window(' 2W ') == timedelta(weeks=2)
+    assert parse_time_window('12 h') == timedelta(hours=12)
+
+    with pytest.raises(ValueError, match='Invalid time window'):
+        parse_time_window('14')
+    with pytest.raises(ValueError, match='Invalid time window'):
+        parse_time_window('2 months')
+
+
 def test_parse_distance_km() -> None:
     assert parse_distance_km(meters=None, decimals=0) is None
     assert parse_distance_km(meters=500, decimals=2) == '0.50 km'
@@ -1,3 +1,5 @@
+import asyncio
+from collections.abc import Iterator
 from datetime import UTC
 from datetime import datetime
 
@@ -5,6 +7,8 @@ from coach.domain.activity import Activity
 from coach.domain.activity import ActivitySource
 from coach.domain.activity import BestEffort
 from coach.domain.activity import SportType
+from coach.reasoning.interface import AsyncLLMClient
+from coach.reasoning.interface import LLMClient
 
 SAMPLE_RUN = Activity(
     activity_id=1,
@@ -57,3 +61,38 @@ SAMPLE_RIDE = Activity(
     is_manual=False,
     is_race=False,
 )
+
+
+class FakeStreamingLLMClient(LLMClient):
+    """Answers every prompt with the same response, streamed word by word."""
+
+    def __init__(self, response: str = 'Keep the easy runs easy.') -> None:
+        self._response = response
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        return ''.join(self.stream(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        self.prompts.append(prompt)
+        words = self._response.split(' ')
+        for index, word in enumerate(words):
+            yield word if index == len(words) - 1 else f'{word} '
+
+
+class FakeAsyncLLMClient(AsyncLLMClient):
+    """Echoes prompts after a short delay, recording the highest number of concurrent requests."""
+
+    def __init__(self, *, delay_seconds: float = 0.01) -> None:
+        self._delay_seconds = delay_seconds
+        self.num_in_flight = 0
+        self.max_in_flight = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.num_in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.num_in_flight)
+        try:
+            await asyncio.sleep(self._delay_seconds)
+            return f'Answer to: {prompt}'
+        finally:
+            self.num_in_flight -= 1
@@ -1,10 +1,14 @@
+import re
 from datetime import UTC
 from datetime import date
 from datetime import datetime
+from datetime import timedelta
 from pathlib import Path
 from typing import Any
 from typing import Optional
 
+_TIME_WINDOW_PATTERN = re.compile(r'(\d+)\s*([hdw])')
+
 
 def parse_utc_datetime(value: str) -> datetime:
     dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
@@ -47,6 +51,16 @@ def weeks_and_days_until(future_date: date) -> str:
     return ' and '.join(full_response)
 
 
+def parse_time_window(text: str) -> timedelta:
+    """Parse a time window such as '14d', '2w' or '12h'."""
+    match = _TIME_WINDOW_PATTERN.fullmatch(text.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid time window: {text!r}, expected a number followed by 'h', 'd' or 'w' (e.g. '14d')")
+
+    value, unit = int(match.group(1)), match.group(2)
+    return {'h': timedelta(hours=value), 'd': timedelta(days=value), 'w': timedelta(weeks=value)}[unit]
+
+
 def parse_file(path: Path) -> Optional[str]:
     if not path.exists():
         return None